@@ -26,5 +26,5 @@ class ProxyProperty(Proxy, Generic[P, T]):
 
 
 def proxy_property(func: Callable[P, T]) -> cached_property[ProxyProperty[P, T]]:
-    """Proxy a property so it behaves like a method and property simultaneously. When invoked as a property, results are cached and invalidated using uncache_all"""
+    """Proxy a property so it behaves like a method and property simultaneously. When invoked as a property, results are cached and invalidated by the cache registry of its codebase"""
     return cached_property(lambda obj: ProxyProperty(functools.partial(func, obj)))
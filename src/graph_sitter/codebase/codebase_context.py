@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import time
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from enum import IntEnum, auto, unique
 from functools import cached_property, lru_cache
@@ -16,29 +18,37 @@ from graph_sitter.codebase.config_parser import ConfigParser, get_config_parser_
 from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
 from graph_sitter.codebase.flagging.flags import Flags
 from graph_sitter.codebase.io.file_io import FileIO
+from graph_sitter.codebase.metrics import GraphMetrics, recorded
 from graph_sitter.codebase.progress.stub_progress import StubProgress
+from graph_sitter.codebase.search_index import TrigramIndex
+from graph_sitter.codebase.snapshot import create_snapshot, get_snapshot_diffs, get_snapshot_path, load_snapshot, restore_snapshot, save_snapshot
 from graph_sitter.codebase.transaction_manager import TransactionManager
+from graph_sitter.codebase.traversal import GraphTraversal
 from graph_sitter.codebase.validation import get_edges, post_reset_validation
 from graph_sitter.compiled.sort import sort_editables
-from graph_sitter.compiled.utils import uncache_all
+from graph_sitter.compiled.utils import CacheRegistry, clear_lru_caches
 from graph_sitter.configs.models.codebase import CodebaseConfig, PinkMode
 from graph_sitter.configs.models.secrets import SecretsConfig
 from graph_sitter.core.autocommit import AutoCommit, commiter
 from graph_sitter.core.directory import Directory
 from graph_sitter.core.external.dependency_manager import DependencyManager, get_dependency_manager
 from graph_sitter.core.external.language_engine import LanguageEngine, get_language_engine
-from graph_sitter.enums import Edge, EdgeType, NodeType
+from graph_sitter.enums import Edge, EdgeType, NodeType, SymbolType
+from graph_sitter.git.utils.file_utils import is_ignored
 from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
 from graph_sitter.shared.exceptions.control_flow import StopCodemodException
 from graph_sitter.shared.logging.get_logger import get_logger
 from graph_sitter.shared.performance.stopwatch_utils import stopwatch
+from graph_sitter.tree_sitter_parser import parse_tree
 from graph_sitter.typescript.external.ts_declassify.ts_declassify import TSDeclassify
+from graph_sitter.utils import is_minified_js
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Mapping, Sequence
+    from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
 
     from codeowners import CodeOwners as CodeOwnersParser
     from git import Commit as GitCommit
+    from tree_sitter import Tree
 
     from graph_sitter.codebase.io.io import IO
     from graph_sitter.codebase.node_classes.node_classes import NodeClasses
@@ -50,7 +60,9 @@ if TYPE_CHECKING:
     from graph_sitter.core.interfaces.importable import Importable
     from graph_sitter.core.node_id_factory import NodeId
     from graph_sitter.core.parser import Parser
+    from graph_sitter.core.symbol import Symbol
     from graph_sitter.git.repo_operator.repo_operator import RepoOperator
+    from graph_sitter.python.module_index import PyModuleIndex
 
 logger = get_logger(__name__)
 
@@ -79,6 +91,23 @@ class SyncType(IntEnum):
     ADD = auto()
 
 
+def get_changed_files(diff_list: Iterable[DiffLite]) -> dict[Path, SyncType]:
+    """Returns how each file changed by the diffs was changed, including the files that are not parsed."""
+    changed_files = {}
+    for diff in diff_list:
+        filepath = Path(diff.path)
+        if diff.change_type == ChangeType.Added:
+            changed_files[filepath] = SyncType.ADD
+        elif diff.change_type == ChangeType.Modified:
+            changed_files.setdefault(filepath, SyncType.REPARSE)
+        elif diff.change_type == ChangeType.Renamed:
+            changed_files[diff.rename_from] = SyncType.DELETE
+            changed_files[diff.rename_to] = SyncType.ADD
+        elif diff.change_type == ChangeType.Removed:
+            changed_files[filepath] = SyncType.DELETE
+    return changed_files
+
+
 def get_node_classes(programming_language: ProgrammingLanguage) -> NodeClasses:
     if programming_language == ProgrammingLanguage.PYTHON:
         from graph_sitter.codebase.node_classes.py_node_classes import PyNodeClasses
@@ -108,6 +137,10 @@ class CodebaseContext:
 
     # =====[ computed attributes ]=====
     transaction_manager: TransactionManager
+    search_index: TrigramIndex  # Full-text index of the parsed files, see `get_search_index`
+    py_module_index: PyModuleIndex  # Python files by module path, for import resolution
+    traversal: GraphTraversal  # Cached walks over the symbol usage graph
+    metrics: GraphMetrics  # Timings and counters of the builds and syncs of the graph
     pending_syncs: list[DiffLite]  # Diffs that have been applied to disk, but not the graph (to be used for sync graph)
     all_syncs: list[DiffLite]  # All diffs that have been applied to the graph (to be used for graph reset)
     _autocommit: AutoCommit
@@ -115,6 +148,7 @@ class CodebaseContext:
     parser: Parser[Expression]
     synced_commit: GitCommit | None
     directories: dict[Path, Directory]
+    _directories_lower: dict[str, Directory]  # Lowercase absolute path -> directory, for case insensitive lookups
     base_url: str | None
     extensions: list[str]
     config_parser: ConfigParser | None
@@ -124,6 +158,15 @@ class CodebaseContext:
     _graph: PyDiGraph[Importable, Edge]
     filepath_idx: dict[str, NodeId]
     _ext_module_idx: dict[str, NodeId]
+    # Node ids partitioned by node type, see `get_nodes`
+    _node_type_idx: dict[NodeType, set[NodeId]]
+    # Symbol indices, see `get_symbol_nodes`
+    _symbol_name_idx: dict[str, set[NodeId]]
+    _symbol_type_idx: dict[SymbolType, set[NodeId]]
+    _top_level_symbols: set[NodeId]
+    _indexed_symbols: dict[NodeId, tuple[str | None, SymbolType]]
+    # Symbols added to the graph but not indexed yet. Their names are only known once they are parsed
+    _unindexed_symbols: set[NodeId]
     flags: Flags
     session_options: SessionOptions = SessionOptions()
     projects: list[ProjectConfig]
@@ -141,13 +184,25 @@ class CodebaseContext:
     ) -> None:
         """Initializes codebase graph and TransactionManager"""
         from graph_sitter.core.parser import Parser
+        from graph_sitter.python.module_index import PyModuleIndex
 
         self.progress = progress or StubProgress()
         self.__graph = PyDiGraph()
         self.__graph_ready = False
         self.filepath_idx = {}
         self._ext_module_idx = {}
+        self._node_type_idx = defaultdict(set)
+        self._symbol_name_idx = defaultdict(set)
+        self._symbol_type_idx = defaultdict(set)
+        self._top_level_symbols = set()
+        self._indexed_symbols = {}
+        self._unindexed_symbols = set()
         self.generation = 0
+        self.cache_registry = CacheRegistry()
+        self.search_index = TrigramIndex()
+        self.py_module_index = PyModuleIndex(self)
+        self.traversal = GraphTraversal(self)
+        self.metrics = GraphMetrics(self)
 
         # NOTE: The differences between base_path, repo_name, and repo_path
         # /home/codegen/projects/my-project/src
@@ -179,6 +234,7 @@ class CodebaseContext:
         self.init_nodes = None
         self.init_edges = None
         self.directories = dict()
+        self._directories_lower = dict()
         self.parser = Parser.from_node_classes(self.node_classes, log_parse_warnings=self.config.debug)
         self.extensions = self.node_classes.file_cls.get_extensions()
         # ORDER IS IMPORTANT HERE!
@@ -222,22 +278,33 @@ class CodebaseContext:
             self.build_graph(self.projects[0].repo_operator)
         return self.__graph
 
-    @stopwatch
+    @recorded("build")
     @commiter
     def build_graph(self, repo_operator: RepoOperator) -> None:
         """Builds a codebase graph based on the current file state of the given repo operator"""
         self.__graph_ready = True
         self.__graph.clear()
+        self._node_type_idx.clear()
+        self.search_index.invalidate()
+        self._clear_symbol_index()
 
         # =====[ Add all files to the graph in parallel ]=====
         syncs = defaultdict(lambda: [])
         if self.config.disable_file_parse:
             logger.warning("WARNING: File parsing is disabled!")
         else:
-            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST):
-                syncs[SyncType.ADD].append(self.to_absolute(filepath))
-        logger.info(f"> Parsing {len(syncs[SyncType.ADD])} files in {self.projects[0].subdirectories or 'ALL'} subdirectories with {self.extensions} extensions")
-        self._process_diff_files(syncs, incremental=False)
+            # Only enumerate the files here, they are read once by the parse stage
+            with self.metrics.phase("enumerate"):
+                for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True):
+                    syncs[SyncType.ADD].append(self.to_absolute(filepath))
+        snapshot_path = get_snapshot_path(self, repo_operator)
+        if snapshot_path is None or not self._restore_snapshot(snapshot_path, syncs[SyncType.ADD]):
+            logger.info(f"> Parsing {len(syncs[SyncType.ADD])} files in {self.projects[0].subdirectories or 'ALL'} subdirectories with {self.extensions} extensions")
+            filepaths = list(syncs[SyncType.ADD])
+            self._process_diff_files(syncs, incremental=False)
+            if snapshot_path is not None:
+                with self.metrics.phase("snapshot_save"):
+                    save_snapshot(create_snapshot(self, snapshot_path.stem, filepaths), snapshot_path)
         files: list[SourceFile] = self.get_nodes(NodeType.FILE)
         logger.info(f"> Found {len(files)} files")
         logger.info(f"> Found {len(self.nodes)} nodes and {len(self.edges)} edges")
@@ -245,6 +312,49 @@ class CodebaseContext:
             self.old_graph = self._graph.copy()
 
     @stopwatch
+    def _restore_snapshot(self, snapshot_path: Path, filepaths: list[Path]) -> bool:
+        """Restores the graph from a snapshot, then syncs any working tree changes made since it was taken.
+
+        Returns False if the snapshot does not exist or could not be restored, in which case the graph is left empty.
+        """
+        snapshot = load_snapshot(snapshot_path)
+        if snapshot is None:
+            return False
+        logger.info(f"> Restoring graph from snapshot {snapshot_path}")
+        try:
+            self._start_external_processes()
+            with self.metrics.phase("snapshot_restore"):
+                restore_snapshot(self, snapshot)
+        except Exception:
+            logger.exception(f"Failed to restore graph snapshot {snapshot_path}. Rebuilding the graph instead")
+            self.__graph.clear()
+            self.filepath_idx.clear()
+            self._ext_module_idx.clear()
+            self._node_type_idx.clear()
+            self._clear_symbol_index()
+            return False
+        # ====== [ Sync the working tree changes made since the snapshot ] ======
+        diffs = get_snapshot_diffs(self, snapshot, filepaths)
+        if not diffs:
+            with self.metrics.phase("directory_tree"):
+                self.build_directory_tree()
+            if self.config_parser is not None:
+                with self.metrics.phase("config_parse"):
+                    self.config_parser.parse_configs()
+        else:
+            logger.info(f"> Syncing {len(diffs)} files changed since the snapshot")
+            by_sync_type = defaultdict(lambda: [])
+            for diff in diffs:
+                if diff.change_type == ChangeType.Removed:
+                    by_sync_type[SyncType.DELETE].append(diff.path)
+                elif self.get_file(diff.path) is None:
+                    by_sync_type[SyncType.ADD].append(diff.path)
+                else:
+                    by_sync_type[SyncType.REPARSE].append(diff.path)
+            self._process_diff_files(by_sync_type)
+        return True
+
+    @recorded("sync")
     @commiter
     def apply_diffs(self, diff_list: list[DiffLite]) -> None:
         """Applies the given set of diffs to the graph in order to match the current file system content"""
@@ -292,30 +402,50 @@ class CodebaseContext:
 
                 by_sync_type[sync_type].append(filepath)
         self.generation += 1
-        self._process_diff_files(by_sync_type)
+        self._process_diff_files(by_sync_type, changed_files=get_changed_files(diff_list))
 
-    def _reset_files(self, syncs: list[DiffLite]) -> None:
-        files_to_write = []
-        files_to_remove = []
-        modified_files = set()
+    def sync_unparsed_files(self, changed_files: Mapping[Path, SyncType]) -> None:
+        """Updates the directory tree and the config files for changes to files that are not part of the graph, which
+        are not synced by `apply_diffs`.
+        """
+        if self.update_directory_tree(changed_files):
+            # Directories outlive syncs, drop the values cached on them
+            self.invalidate_caches(())
+        if self.config_parser is not None:
+            self.config_parser.parse_configs(changed_files)
+
+    def get_original_contents(self, syncs: list[DiffLite] | None = None) -> dict[Path, bytes | None]:
+        """Returns the content the files changed by `syncs` had before the first of them, or None for files that did not
+        exist. Files whose previous content was not captured are left out.
+
+        Args:
+            syncs: The changes to undo, defaults to every change made since the graph was synced to its commit
+        """
+        if syncs is None:
+            syncs = self.all_syncs + self.pending_syncs + self.unapplied_diffs
+        original_contents = {}
+        seen = set()
         for sync in syncs:
-            if sync.path in modified_files:
-                continue
-            if sync.change_type == ChangeType.Removed:
-                files_to_write.append((sync.path, sync.old_content))
-                modified_files.add(sync.path)
-                logger.info(f"Removing {sync.path} from disk")
-            elif sync.change_type == ChangeType.Modified:
-                files_to_write.append((sync.path, sync.old_content))
-                modified_files.add(sync.path)
+            if sync.change_type == ChangeType.Added:
+                before = [(sync.path, None, True)]
             elif sync.change_type == ChangeType.Renamed:
-                files_to_write.append((sync.rename_from, sync.old_content))
-                files_to_remove.append(sync.rename_to)
-                modified_files.add(sync.rename_from)
-                modified_files.add(sync.rename_to)
-            elif sync.change_type == ChangeType.Added:
-                files_to_remove.append(sync.path)
-                modified_files.add(sync.path)
+                before = [(sync.rename_from, sync.old_content, sync.old_content is not None), (sync.rename_to, None, True)]
+            elif sync.change_type in (ChangeType.Modified, ChangeType.Removed):
+                before = [(sync.path, sync.old_content, sync.old_content is not None)]
+            else:
+                continue
+            for path, content, captured in before:
+                if path in seen:
+                    continue
+                seen.add(path)
+                if captured:
+                    original_contents[path] = content
+        return original_contents
+
+    def _reset_files(self, syncs: list[DiffLite]) -> None:
+        original_contents = self.get_original_contents(syncs)
+        files_to_write = [(path, content) for path, content in original_contents.items() if content is not None]
+        files_to_remove = [path for path, content in original_contents.items() if content is None]
         logger.info(f"Writing {len(files_to_write)} files to disk and removing {len(files_to_remove)} files")
         for file in files_to_remove:
             self.io.delete_file(file)
@@ -375,6 +505,7 @@ class CodebaseContext:
         """Builds the directory tree for the codebase"""
         # Reset and rebuild the directory tree
         self.directories = dict()
+        self._directories_lower = dict()
 
         for file_path, _ in self.projects[0].repo_operator.iter_files(
             subdirs=self.projects[0].subdirectories,
@@ -385,6 +516,56 @@ class CodebaseContext:
             directory = self.get_directory(file_path.parent, create_on_missing=True)
             directory._add_file(file_path.name)
 
+    def update_directory_tree(self, changed_files: Mapping[Path, SyncType]) -> bool:
+        """Adds and removes the given files from the directory tree, instead of listing all the files of the repository
+        again like `build_directory_tree`. Directories left without files are removed, modified files are ignored.
+
+        Returns:
+            Whether the tree changed
+        """
+        subdirectories = self.projects[0].subdirectories
+        changed = False
+        added = []
+        for file_path, sync_type in changed_files.items():
+            if sync_type is SyncType.REPARSE:
+                continue
+            absolute_path = self.to_absolute(file_path)
+            if not self.is_subdir(absolute_path):
+                continue
+            # Same filters as `build_directory_tree`
+            relative_path = str(self.to_relative(absolute_path))
+            if subdirectories and not any(relative_path.startswith(subdir) for subdir in subdirectories):
+                continue
+            if is_ignored(relative_path, GLOBAL_FILE_IGNORE_LIST):
+                continue
+            if sync_type is SyncType.ADD:
+                if absolute_path.is_file():
+                    added.append(relative_path)
+            elif (directory := self.get_directory(absolute_path.parent)) is not None:
+                directory._remove_file(absolute_path.name)
+                # Prune the directories left empty
+                while len(directory) == 0:
+                    self._remove_from_directory_tree(directory)
+                    if not directory.dirpath:
+                        break
+                    parent = self.get_directory(directory.path.parent)
+                    parent._remove_subdirectory(directory.name)
+                    directory = parent
+                changed = True
+        # `build_directory_tree` only lists the files that are not gitignored
+        ignored = self.projects[0].repo_operator.get_ignored_filepaths(added)
+        for relative_path in added:
+            if relative_path not in ignored:
+                absolute_path = self.to_absolute(relative_path)
+                self.get_directory(absolute_path.parent, create_on_missing=True)._add_file(absolute_path.name)
+                changed = True
+        return changed
+
+    def _remove_from_directory_tree(self, directory: Directory) -> None:
+        self.directories.pop(directory.path, None)
+        if self._directories_lower.get(str(directory.path).lower(), None) is directory:
+            del self._directories_lower[str(directory.path).lower()]
+
     def get_directory(self, directory_path: PathLike, create_on_missing: bool = False, ignore_case: bool = False) -> Directory | None:
         """Returns the directory object for the given path, or None if the directory does not exist.
 
@@ -400,9 +581,8 @@ class CodebaseContext:
         if dir := self.directories.get(absolute_path, None):
             return dir
         if ignore_case:
-            for path, directory in self.directories.items():
-                if str(absolute_path).lower() == str(path).lower():
-                    return directory
+            if dir := self._directories_lower.get(str(absolute_path).lower(), None):
+                return dir
 
         # If the directory does not exist, create it
         if create_on_missing:
@@ -413,6 +593,7 @@ class CodebaseContext:
             if str(absolute_path) == str(self.repo_path) or str(absolute_path) == str(parent_path):
                 root_directory = Directory(ctx=self, path=absolute_path, dirpath="")
                 self.directories[absolute_path] = root_directory
+                self._directories_lower.setdefault(str(absolute_path).lower(), root_directory)
                 return root_directory
 
             # Recursively create the parent directory
@@ -423,39 +604,25 @@ class CodebaseContext:
             parent._add_subdirectory(directory.name)
             # Add the directory to the tree
             self.directories[absolute_path] = directory
+            self._directories_lower.setdefault(str(absolute_path).lower(), directory)
             return directory
         return None
 
-    def _process_diff_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool = True) -> None:
+    def _process_diff_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool = True, changed_files: Mapping[Path, SyncType] | None = None) -> None:
         # If all the files are empty, don't uncache
         assert self._computing is False
+        self.search_index.invalidate([self.to_absolute(file_path) for file_paths in files_to_sync.values() for file_path in file_paths] if incremental else None)
         skip_uncache = incremental and ((len(files_to_sync[SyncType.DELETE]) + len(files_to_sync[SyncType.REPARSE])) == 0)
+        # Files whose cached values may be stale, computed before the graph changes. None means all files
+        affected: set[NodeId] | None = None
         if not skip_uncache:
-            uncache_all()
-        # Step 0: Start the dependency manager and language engine if they exist
-        # Start the dependency manager. This may or may not run asynchronously, depending on the implementation
-        if self.dependency_manager is not None:
-            # Check if its inital start or a reparse
-            if not self.dependency_manager.ready() and not self.dependency_manager.error():
-                # TODO: We do not reparse dependencies during syncs as it is expensive. We should probably add a flag for this
-                logger.info("> Starting dependency manager")
-                self.dependency_manager.start(async_start=False)
-
-        # Start the language engine. This may or may not run asynchronously, depending on the implementation
-        if self.language_engine is not None:
-            # Check if its inital start or a reparse
-            if not self.language_engine.ready() and not self.language_engine.error():
-                logger.info("> Starting language engine")
-                self.language_engine.start(async_start=False)
-            else:
-                logger.info("> Reparsing language engine")
-                self.language_engine.reparse(async_start=False)
-
-        # Step 1: Wait for dependency manager and language engines to finish before graph construction
-        if self.dependency_manager is not None:
-            self.dependency_manager.wait_until_ready(ignore_error=self.config.ignore_process_errors)
-        if self.language_engine is not None:
-            self.language_engine.wait_until_ready(ignore_error=self.config.ignore_process_errors)
+            with self.metrics.phase("invalidation"):
+                if incremental:
+                    changed = (self.get_file(file_path) for file_path in files_to_sync[SyncType.DELETE] + files_to_sync[SyncType.REPARSE])
+                    affected = self._dependent_files(file.node_id for file in changed if file is not None)
+                self.invalidate_caches(affected)
+        with self.metrics.phase("external_processes"):
+            self._start_external_processes()
 
         # ====== [ Refresh the graph] ========
         # Step 2: For any files that no longer exist, remove them during the sync
@@ -479,42 +646,47 @@ class CodebaseContext:
                     logger.warning(f"SYNC: SourceFile {file_path} does not exist and also not found on graph!")
 
         # Step 3: Remove files to delete from graph
+        self.metrics.count("files_removed", len(files_to_sync[SyncType.DELETE]))
+        self.metrics.count("files_reparsed", len(files_to_sync[SyncType.REPARSE]))
         to_resolve = []
-        for file_path in files_to_sync[SyncType.DELETE]:
-            file = self.get_file(file_path)
-            file.remove_internal_edges()
-            to_resolve.extend(file.unparse())
-        to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
-        for file_path in files_to_sync[SyncType.REPARSE]:
-            file = self.get_file(file_path)
-            file.remove_internal_edges()
+        with self.metrics.phase("remove"):
+            for file_path in files_to_sync[SyncType.DELETE]:
+                file = self.get_file(file_path)
+                file.remove_internal_edges()
+                to_resolve.extend(file.unparse())
+            to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
+            for file_path in files_to_sync[SyncType.REPARSE]:
+                file = self.get_file(file_path)
+                file.remove_internal_edges()
         files_to_resolve = []
         if len(files_to_sync[SyncType.REPARSE]) > 0:
             task = self.progress.begin("Reparsing updated files", count=len(files_to_sync[SyncType.REPARSE]))
             # Step 4: Reparse updated files
-            for idx, file_path in enumerate(files_to_sync[SyncType.REPARSE]):
-                task.update(f"Reparsing {self.to_relative(file_path)}", count=idx)
-                file = self.get_file(file_path)
-                to_resolve.extend(file.unparse(reparse=True))
-                to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
-                file.sync_with_file_content()
-                files_to_resolve.append(file)
+            with self.metrics.phase("reparse"):
+                for idx, file_path in enumerate(files_to_sync[SyncType.REPARSE]):
+                    if task.should_update():
+                        task.update(f"Reparsing {self.to_relative(file_path)}", count=idx)
+                    file = self.get_file(file_path)
+                    to_resolve.extend(file.unparse(reparse=True))
+                    to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
+                    file.sync_with_file_content()
+                    files_to_resolve.append(file)
             task.end()
         # Step 5: Add new files as nodes to graph (does not yet add edges)
         task = self.progress.begin("Parsing new files", count=len(files_to_sync[SyncType.ADD]))
-        for idx, filepath in enumerate(files_to_sync[SyncType.ADD]):
-            task.update(f"Parsing {self.to_relative(filepath)}", count=idx)
-            try:
-                content = self.io.read_text(filepath)
-            except UnicodeDecodeError as e:
-                logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
-                continue
-            # TODO: this is wrong with context changes
-            if filepath.suffix in self.extensions:
+        with self.metrics.phase("parse"):
+            for idx, (filepath, parsed) in enumerate(self._parse_files(files_to_sync[SyncType.ADD])):
+                if task.should_update():
+                    task.update(f"Parsing {self.to_relative(filepath)}", count=idx)
+                if parsed is None:
+                    continue
+                content, tree = parsed
+                # TODO: this is wrong with context changes
                 file_cls = self.node_classes.file_cls
-                new_file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False)
+                new_file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False, tree=tree)
                 if new_file is not None:
                     files_to_resolve.append(new_file)
+                    self.metrics.count("files_added")
         task.end()
         for file in files_to_resolve:
             to_resolve.append(file)
@@ -524,16 +696,28 @@ class CodebaseContext:
         counter = Counter(node.node_type for node in to_resolve)
 
         # Step 6: Build directory tree
-        logger.info("> Building directory tree")
-        self.build_directory_tree()
+        with self.metrics.phase("directory_tree"):
+            if changed_files is None:
+                logger.info("> Building directory tree")
+                self.build_directory_tree()
+            elif self.update_directory_tree(changed_files) and skip_uncache:
+                # Directories outlive syncs, drop the values cached on them
+                self.invalidate_caches(())
 
         # Step 7: Build configs
         if self.config_parser is not None:
-            self.config_parser.parse_configs()
+            with self.metrics.phase("config_parse"):
+                self.config_parser.parse_configs(changed_files)
+        if self.programming_language == ProgrammingLanguage.PYTHON:
+            # Renames can leave the number of files unchanged, which the index would not notice on its own
+            self.py_module_index.refresh()
 
         # Step 8: Add internal import resolution edges for new and updated files
+        if affected is not None:
+            affected.update(file.node_id for file in files_to_resolve)
         if not skip_uncache:
-            uncache_all()
+            with self.metrics.phase("invalidation"):
+                self.invalidate_caches(affected)
 
         if self.config.disable_graph:
             logger.warning("Graph generation is disabled. Skipping import and symbol resolution")
@@ -543,41 +727,179 @@ class CodebaseContext:
             try:
                 logger.info(f"> Computing import resolution edges for {counter[NodeType.IMPORT]} imports")
                 task = self.progress.begin("Resolving imports", count=counter[NodeType.IMPORT])
-                for node in to_resolve:
-                    if node.node_type == NodeType.IMPORT:
-                        task.update(f"Resolving imports in {node.filepath}", count=idx)
-                        node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
-                        node.add_symbol_resolution_edge()
-                        to_resolve.extend(node.symbol_usages)
+                with self.metrics.phase("import_resolution"):
+                    idx = 0
+                    for node in to_resolve:
+                        if node.node_type == NodeType.IMPORT:
+                            if task.should_update():
+                                task.update(f"Resolving imports in {node.filepath}", count=idx)
+                            idx += 1
+                            node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
+                            node.add_symbol_resolution_edge()
+                            to_resolve.extend(node.symbol_usages)
                 task.end()
                 if counter[NodeType.EXPORT] > 0:
                     logger.info(f"> Computing export dependencies for {counter[NodeType.EXPORT]} exports")
                     task = self.progress.begin("Computing export dependencies", count=counter[NodeType.EXPORT])
-                    for node in to_resolve:
-                        if node.node_type == NodeType.EXPORT:
-                            task.update(f"Computing export dependencies for {node.filepath}", count=idx)
-                            node._remove_internal_edges(EdgeType.EXPORT)
-                            node.compute_export_dependencies()
-                            to_resolve.extend(node.symbol_usages)
+                    with self.metrics.phase("export_dependencies"):
+                        idx = 0
+                        for node in to_resolve:
+                            if node.node_type == NodeType.EXPORT:
+                                if task.should_update():
+                                    task.update(f"Computing export dependencies for {node.filepath}", count=idx)
+                                idx += 1
+                                node._remove_internal_edges(EdgeType.EXPORT)
+                                node.compute_export_dependencies()
+                                to_resolve.extend(node.symbol_usages)
                     task.end()
                 if counter[NodeType.SYMBOL] > 0:
                     from graph_sitter.core.interfaces.inherits import Inherits
 
                     logger.info("> Computing superclass dependencies")
                     task = self.progress.begin("Computing superclass dependencies", count=counter[NodeType.SYMBOL])
-                    for symbol in to_resolve:
-                        if isinstance(symbol, Inherits):
-                            task.update(f"Computing superclass dependencies for {symbol.filepath}", count=idx)
-                            symbol._remove_internal_edges(EdgeType.SUBCLASS)
-                            symbol.compute_superclass_dependencies()
+                    with self.metrics.phase("superclass_dependencies"):
+                        idx = 0
+                        for symbol in to_resolve:
+                            if isinstance(symbol, Inherits):
+                                if task.should_update():
+                                    task.update(f"Computing superclass dependencies for {symbol.filepath}", count=idx)
+                                idx += 1
+                                symbol._remove_internal_edges(EdgeType.SUBCLASS)
+                                symbol.compute_superclass_dependencies()
                     task.end()
                 if not skip_uncache:
-                    uncache_all()
-                self._compute_dependencies(to_resolve, incremental)
+                    with self.metrics.phase("invalidation"):
+                        self.invalidate_caches(affected)
+                with self.metrics.phase("dependencies"):
+                    recomputed = self._compute_dependencies(to_resolve, incremental)
+                if incremental:
+                    # Values cached elsewhere may have read the edges that were just added or removed
+                    with self.metrics.phase("invalidation"):
+                        self.invalidate_caches(self._dependent_files(recomputed))
             finally:
                 self._computing = False
 
-    def _compute_dependencies(self, to_update: list[Importable], incremental: bool):
+    def invalidate_caches(self, file_ids: Iterable[NodeId] | None = None) -> None:
+        """Drops the values cached for the given files (all files if None), along with the values that are not tied to
+        a file.
+        """
+        self.cache_registry.invalidate(file_ids)
+        clear_lru_caches()
+
+    def _dependent_files(self, file_ids: Iterable[NodeId]) -> set[NodeId]:
+        """Returns the given files, the files they have edges to, and every file that transitively depends on either.
+
+        Cached values are computed by following the edges out of a node, or by reading the edges into it (e.g.
+        usages), so these are all the files whose cached values can change when the given files change.
+        """
+        seeds = set()
+        for file_id in file_ids:
+            if not self.has_node(file_id):
+                continue
+            seeds.add(file_id)
+            for node_id in self._file_node_ids(file_id):
+                seeds.update(getattr(self._graph[succ], "file_node_id", None) for succ in self._graph.successor_indices(node_id))
+        seeds = {file_id for file_id in seeds if file_id is not None and self.has_node(file_id)}
+        affected = set(seeds)
+        stack = list(seeds)
+        while stack:
+            for node_id in self._file_node_ids(stack.pop()):
+                for pred in self._graph.predecessor_indices(node_id):
+                    file_id = getattr(self._graph[pred], "file_node_id", None)
+                    if file_id is not None and file_id not in affected:
+                        affected.add(file_id)
+                        stack.append(file_id)
+        return affected
+
+    def get_search_index(self) -> TrigramIndex:
+        """Returns the full-text search index of the parsed files, indexing the files changed since it was last used."""
+
+        def read(filepath: Path) -> bytes | None:
+            file = self.get_file(filepath)
+            return file.ts_node.text if file is not None and file.ts_node is not None else None
+
+        self.search_index.refresh(lambda: [file.path for file in self.get_nodes(NodeType.FILE)], read)
+        return self.search_index
+
+    def _file_node_ids(self, file_id: NodeId) -> Iterator[NodeId]:
+        """Yields the id of the file and of every node in it."""
+        yield file_id
+        file = self.get_node(file_id)
+        if hasattr(file, "get_nodes"):
+            yield from (node.node_id for node in file.get_nodes(sort=False) if self.has_node(node.node_id))
+
+    def _start_external_processes(self) -> None:
+        # Step 0: Start the dependency manager and language engine if they exist
+        # Start the dependency manager. This may or may not run asynchronously, depending on the implementation
+        if self.dependency_manager is not None:
+            # Check if its inital start or a reparse
+            if not self.dependency_manager.ready() and not self.dependency_manager.error():
+                # TODO: We do not reparse dependencies during syncs as it is expensive. We should probably add a flag for this
+                logger.info("> Starting dependency manager")
+                self.dependency_manager.start(async_start=False)
+
+        # Start the language engine. This may or may not run asynchronously, depending on the implementation
+        if self.language_engine is not None:
+            # Check if its inital start or a reparse
+            if not self.language_engine.ready() and not self.language_engine.error():
+                logger.info("> Starting language engine")
+                self.language_engine.start(async_start=False)
+            else:
+                logger.info("> Reparsing language engine")
+                self.language_engine.reparse(async_start=False)
+
+        # Step 1: Wait for dependency manager and language engines to finish before graph construction
+        if self.dependency_manager is not None:
+            self.dependency_manager.wait_until_ready(ignore_error=self.config.ignore_process_errors)
+        if self.language_engine is not None:
+            self.language_engine.wait_until_ready(ignore_error=self.config.ignore_process_errors)
+
+    def _read_and_parse_file(self, filepath: Path, content_bytes: bytes | None = None) -> tuple[str, Tree] | None:
+        """Reads and parses a single file. Safe to call from parse worker threads.
+
+        The file is read once and tree-sitter parses the raw bytes directly. If `content_bytes` is provided it is
+        parsed instead of reading the file. Returns None if the file should be ignored.
+        """
+        if filepath.suffix not in self.extensions:
+            return None
+        if content_bytes is None:
+            start = time.perf_counter()
+            content_bytes = self.io.read_bytes(filepath)
+            self.metrics.add_time("read", time.perf_counter() - start)
+        try:
+            content = content_bytes.decode("utf-8")
+        except UnicodeDecodeError:
+            logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
+            return None
+        # Sanity check to ensure file is not a minified file
+        if is_minified_js(content):
+            logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
+            return None
+        start = time.perf_counter()
+        tree = parse_tree(filepath, content_bytes, thread_local=True)
+        self.metrics.add_time("tree_sitter", time.perf_counter() - start)
+        return content, tree
+
+    def _parse_files(self, filepaths: list[Path], contents: Mapping[Path, bytes] | None = None) -> Iterator[tuple[Path, tuple[str, Tree] | None]]:
+        """Reads and parses the given files, using a pool of `parse_workers` threads if configured.
+
+        tree-sitter releases the GIL while parsing, so reading and parsing scales with the number of workers.
+        Results are yielded in the order of `filepaths` so node ids stay deterministic.
+        If `contents` is provided, files are parsed from it instead of being read.
+        """
+        file_contents = [contents.get(filepath) for filepath in filepaths] if contents is not None else [None] * len(filepaths)
+        if self.config.parse_workers <= 1 or len(filepaths) <= 1:
+            yield from zip(filepaths, map(self._read_and_parse_file, filepaths, file_contents))
+            return
+        with ThreadPoolExecutor(max_workers=self.config.parse_workers, thread_name_prefix="graph_sitter_parse") as executor:
+            yield from zip(filepaths, executor.map(self._read_and_parse_file, filepaths, file_contents))
+
+    def _compute_dependencies(self, to_update: list[Importable], incremental: bool) -> set[NodeId]:
+        """Recomputes the dependencies of the given nodes, and of the nodes that depend on them.
+
+        Returns:
+            The ids of the files of every recomputed node.
+        """
         seen = set()
         while to_update:
             task = self.progress.begin("Computing dependencies", count=len(to_update))
@@ -585,7 +907,8 @@ class CodebaseContext:
             to_update.clear()
             logger.info(f"> Incrementally computing dependencies for {len(step)} nodes")
             for idx, current in enumerate(step):
-                task.update(f"Computing dependencies for {current.filepath}", count=idx)
+                if task.should_update():
+                    task.update(f"Computing dependencies for {current.filepath}", count=idx)
                 if current not in seen:
                     seen.add(current)
                     to_update.extend(current.recompute(incremental))
@@ -594,14 +917,14 @@ class CodebaseContext:
                     if node not in seen:
                         to_update.append(node)
             task.end()
+        recomputed = {node.file_node_id for node in seen}
+        self.metrics.count("nodes_computed", len(seen))
         seen.clear()
+        return recomputed
 
     def build_subgraph(self, nodes: list[NodeId]) -> PyDiGraph[Importable, Edge]:
         """Builds a subgraph from the given set of nodes"""
-        subgraph = PyDiGraph()
-        subgraph.add_nodes_from(self._graph.nodes())
-        subgraph.add_edges_from(self._graph.weighted_edge_list())
-        return subgraph.subgraph(nodes)
+        return self._graph.subgraph(nodes)
 
     def get_node(self, node_id: int) -> Any:
         return self._graph.get_node_data(node_id)
@@ -610,11 +933,13 @@ class CodebaseContext:
         if node_type is not None and exclude_type is not None:
             msg = "node_type and exclude_type cannot both be specified"
             raise ValueError(msg)
+        graph = self._graph
         if node_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type == node_type)]
+            return [graph.get_node_data(node_id) for node_id in sorted(self._node_type_idx.get(node_type, ()))]
         if exclude_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type != node_type)]
-        return self._graph.nodes()
+            excluded = self._node_type_idx.get(exclude_type, ())
+            return [graph.get_node_data(node_id) for node_id in graph.node_indices() if node_id not in excluded]
+        return graph.nodes()
 
     def get_edges(self) -> list[tuple[NodeId, NodeId, EdgeType, Usage | None]]:
         return [(x[0], x[1], x[2].type, x[2].usage) for x in self._graph.weighted_edge_list()]
@@ -637,10 +962,9 @@ class CodebaseContext:
             return self.get_node(node_id)
         if ignore_case:
             # Using `get_directory` so that the case insensitive lookup works
-            parent = self.get_directory(self.to_absolute(file_path).parent, ignore_case=ignore_case).path
-            for file in parent.iterdir():
-                if str(file_path).lower() == str(self.to_relative(file)).lower():
-                    return self.get_file(file, ignore_case=False)
+            parent = self.get_directory(absolute_path.parent, ignore_case=ignore_case)
+            if parent is not None and (file_name := parent._get_file_name(absolute_path.name, ignore_case=ignore_case)) is not None:
+                return self.get_file(parent.path / file_name, ignore_case=False)
 
     def _get_raw_file_from_path(self, path: Path) -> File | None:
         from graph_sitter.core.file import File
@@ -656,6 +980,52 @@ class CodebaseContext:
         if node_id is not None:
             return self.get_node(node_id)
 
+    def get_symbol_nodes(self, name: str | None = None, symbol_type: SymbolType | None = None, top_level: bool = False) -> list[Symbol]:
+        """Returns the symbols matching all the given filters, in node id order.
+
+        Served from indices that are kept in sync as nodes are added and removed, rather than filtering the whole graph.
+        """
+        self._index_symbols()
+        candidates = []
+        if name is not None:
+            candidates.append(self._symbol_name_idx.get(name, set()))
+        if symbol_type is not None:
+            candidates.append(self._symbol_type_idx.get(symbol_type, set()))
+        if top_level:
+            candidates.append(self._top_level_symbols)
+        if not candidates:
+            node_ids = self._indexed_symbols.keys()
+        else:
+            node_ids = min(candidates, key=len).intersection(*candidates)
+        return [self.get_node(node_id) for node_id in sorted(node_ids)]
+
+    def _index_symbols(self) -> None:
+        """Indexes the symbols added to the graph since the last lookup"""
+        graph = self._graph
+        for node_id in self._unindexed_symbols:
+            symbol = graph.get_node_data(node_id)
+            self._indexed_symbols[node_id] = (symbol.name, symbol.symbol_type)
+            self._symbol_name_idx[symbol.name].add(node_id)
+            self._symbol_type_idx[symbol.symbol_type].add(node_id)
+            if symbol.is_top_level:
+                self._top_level_symbols.add(node_id)
+        self._unindexed_symbols.clear()
+
+    def _unindex_symbol(self, node_id: NodeId) -> None:
+        self._unindexed_symbols.discard(node_id)
+        if (indexed := self._indexed_symbols.pop(node_id, None)) is not None:
+            name, symbol_type = indexed
+            self._symbol_name_idx[name].discard(node_id)
+            self._symbol_type_idx[symbol_type].discard(node_id)
+            self._top_level_symbols.discard(node_id)
+
+    def _clear_symbol_index(self) -> None:
+        self._symbol_name_idx.clear()
+        self._symbol_type_idx.clear()
+        self._top_level_symbols.clear()
+        self._indexed_symbols.clear()
+        self._unindexed_symbols.clear()
+
     def add_node(self, node: Importable) -> int:
         if self.config.debug:
             if self._graph.find_node_by_weight(node.__eq__):
@@ -663,7 +1033,11 @@ class CodebaseContext:
                 raise Exception(msg)
         if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_node(node)
+        node_id = self._graph.add_node(node)
+        self._node_type_idx[node.node_type].add(node_id)
+        if node.node_type == NodeType.SYMBOL:
+            self._unindexed_symbols.add(node_id)
+        return node_id
 
     def add_child(self, parent: NodeId, node: Importable, type: EdgeType, usage: Usage | None = None) -> int:
         if self.config.debug:
@@ -672,7 +1046,11 @@ class CodebaseContext:
                 raise Exception(msg)
         if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_child(parent, node, Edge(type, usage))
+        node_id = self._graph.add_child(parent, node, Edge(type, usage))
+        self._node_type_idx[node.node_type].add(node_id)
+        if node.node_type == NodeType.SYMBOL:
+            self._unindexed_symbols.add(node_id)
+        return node_id
 
     def has_node(self, node_id: NodeId):
         return isinstance(node_id, int) and self._graph.has_node(node_id)
@@ -731,6 +1109,9 @@ class CodebaseContext:
         return self._graph.out_edges(n)
 
     def remove_node(self, n: NodeId):
+        if self._graph.has_node(n):
+            self._node_type_idx[self._graph.get_node_data(n).node_type].discard(n)
+        self._unindex_symbol(n)
         return self._graph.remove_node(n)
 
     def remove_edge(self, u: NodeId, v: NodeId, *, edge_type: EdgeType | None = None):
@@ -772,9 +1153,11 @@ class CodebaseContext:
         # Commit transactions for all contexts
         files_to_lock = self.transaction_manager.to_commit(files)
         diffs = self.transaction_manager.commit(files_to_lock)
+        unparsed_diffs = []
         for diff in diffs:
             if self.get_file(diff.path) is None:
                 self.unapplied_diffs.append(diff)
+                unparsed_diffs.append(diff)
             else:
                 self.pending_syncs.append(diff)
 
@@ -787,6 +1170,8 @@ class CodebaseContext:
             self.apply_diffs(self.pending_syncs)
             self.all_syncs.extend(self.pending_syncs)
             self.pending_syncs.clear()
+        if sync_graph and len(unparsed_diffs) > 0:
+            self.sync_unparsed_files(get_changed_files(unparsed_diffs))
 
     @commiter
     def add_single_file(self, filepath: PathLike) -> None:
@@ -824,12 +1209,11 @@ class CodebaseContext:
             raise ValueError(msg)
 
         # Remove the directory from the tree
-        if str(directory_path) in self.directories:
-            del self.directories[str(directory_path)]
+        self._remove_from_directory_tree(directory)
 
         # Remove the directory from the parent
         if directory.parent is not None:
-            directory.parent.remove_subdirectory(directory)
+            directory.parent._remove_subdirectory(directory.name)
             # Cleanup
             if cleanup and len(directory.parent.items) == 0:
                 self.remove_directory(directory.parent.path, cleanup=cleanup)
@@ -4,7 +4,10 @@ from typing import TYPE_CHECKING
 from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
 
 if TYPE_CHECKING:
-    from graph_sitter.codebase.codebase_context import CodebaseContext
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from graph_sitter.codebase.codebase_context import CodebaseContext, SyncType
 
 
 class ConfigParser(ABC):
@@ -12,7 +15,8 @@ class ConfigParser(ABC):
         pass
 
     @abstractmethod
-    def parse_configs(self, codebase_context: "CodebaseContext"): ...
+    def parse_configs(self, changed_files: "Mapping[Path, SyncType] | None" = None):
+        """Parses the config files of the codebase. `changed_files` are the files changed since the last call, if known."""
 
 
 def get_config_parser_for_language(language: ProgrammingLanguage, codebase_context: "CodebaseContext") -> ConfigParser | None:
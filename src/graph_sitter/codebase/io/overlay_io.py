@@ -0,0 +1,61 @@
+from pathlib import Path
+
+from graph_sitter.codebase.io.io import IO, BadWriteError
+from graph_sitter.shared.logging.get_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class OverlayIO(IO):
+    """IO implementation that keeps saved files in memory on top of another IO, leaving the files on disk untouched.
+
+    Lets a copy of a codebase (e.g. in a forked worker) be edited and committed without affecting the working tree it
+    shares with other copies.
+    """
+
+    base_io: IO
+    # Files written but not saved yet
+    files: dict[Path, bytes]
+    # Content of the saved files, None if the file was deleted
+    saved: dict[Path, bytes | None]
+
+    def __init__(self, base_io: IO) -> None:
+        self.base_io = base_io
+        self.files = {}
+        self.saved = {}
+
+    def write_bytes(self, path: Path, content: bytes) -> None:
+        self.files[path] = content
+
+    def read_bytes(self, path: Path) -> bytes:
+        if path in self.files:
+            return self.files[path]
+        if path in self.saved:
+            content = self.saved[path]
+            if content is None:
+                msg = f"File {path} has been deleted"
+                raise FileNotFoundError(msg)
+            return content
+        return self.base_io.read_bytes(path)
+
+    def save_files(self, files: set[Path] | None = None) -> None:
+        to_save = [path for path in self.files if files is None or path in files]
+        for path in to_save:
+            self.saved[path] = self.files.pop(path)
+
+    def check_changes(self) -> None:
+        if self.files:
+            logger.error(BadWriteError("Directly called file write without calling commit_transactions"))
+        self.files.clear()
+
+    def delete_file(self, path: Path) -> None:
+        self.files.pop(path, None)
+        self.saved[path] = None
+
+    def untrack_file(self, path: Path) -> None:
+        self.files.pop(path, None)
+
+    def file_exists(self, path: Path) -> bool:
+        if path in self.saved:
+            return self.saved[path] is not None
+        return self.base_io.file_exists(path)
@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from graph_sitter.shared.logging.get_logger import get_logger
+from graph_sitter.shared.performance.memory_utils import get_memory_stats
+from graph_sitter.shared.performance.time_utils import humanize_duration
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+
+logger = get_logger(__name__)
+
+# Number of reports kept in memory
+MAX_REPORTS = 100
+
+
+@dataclass
+class SyncReport:
+    """Timings and counters of a single graph build or sync."""
+
+    # "build" or "sync"
+    kind: str
+    # Unix time the build or sync started at
+    started_at: float
+    duration: float = 0.0
+    # Seconds spent in each phase, in the order the phases first ran. "read" and "tree_sitter" are summed over the parse
+    # workers, so they can add up to more than the wall time of "parse"
+    phases: dict[str, float] = field(default_factory=dict)
+    # Files and nodes processed, and the size of the graph afterwards
+    counts: dict[str, int] = field(default_factory=dict)
+    # Number of edges of each type afterwards, only counted when the report is written to `metrics_path`
+    edges_by_type: dict[str, int] | None = None
+    memory: dict[str, float] = field(default_factory=dict)
+    # Counters of the cache registry afterwards, see `CacheRegistry.stats`
+    cache: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self, indent: int | None = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+
+class GraphMetrics:
+    """Records a `SyncReport` for each build and sync of a codebase context.
+
+    Phases are timed with `phase` and counters incremented with `count` while a report is being recorded, and are no-ops
+    otherwise. Once a build or sync is done, its report is available as `last` and, if the `metrics_path` config is set,
+    appended to that file as a line of JSON.
+    """
+
+    ctx: "CodebaseContext"
+    reports: deque[SyncReport]
+    current: SyncReport | None
+
+    def __init__(self, ctx: "CodebaseContext") -> None:
+        self.ctx = ctx
+        self.reports = deque(maxlen=MAX_REPORTS)
+        self.current = None
+        # Guards the current report, phases can be timed from parse worker threads
+        self._lock = threading.Lock()
+
+    @property
+    def last(self) -> SyncReport | None:
+        """The report of the last finished build or sync."""
+        return self.reports[-1] if self.reports else None
+
+    @contextmanager
+    def record(self, kind: str) -> Iterator[SyncReport]:
+        """Records a report for the duration of the block. Nested blocks add to the outer report."""
+        if self.current is not None:
+            yield self.current
+            return
+        report = self.current = SyncReport(kind=kind, started_at=time.time())
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            report.duration = time.perf_counter() - start
+            self.current = None
+            self._finish(report)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Adds the time spent in the block to the given phase of the current report."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        if (report := self.current) is not None:
+            with self._lock:
+                report.phases[name] = report.phases.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        if (report := self.current) is not None:
+            with self._lock:
+                report.counts[name] = report.counts.get(name, 0) + value
+
+    def _finish(self, report: SyncReport) -> None:
+        from graph_sitter.enums import NodeType
+
+        graph = self.ctx._graph
+        report.counts["files"] = len(self.ctx._node_type_idx[NodeType.FILE])
+        report.counts["nodes"] = graph.num_nodes()
+        report.counts["edges"] = graph.num_edges()
+        memory = get_memory_stats()
+        report.memory = {"rss_gb": memory.memory_rss_gb, "peak_rss_gb": memory.memory_peak_rss_gb}
+        report.cache = self.ctx.cache_registry.stats()
+        self.reports.append(report)
+        phases = ", ".join(f"{name} {humanize_duration(seconds)}" for name, seconds in report.phases.items())
+        logger.info(f"Graph {report.kind} took {humanize_duration(report.duration)} ({phases})")
+        if metrics_path := self.ctx.config.metrics_path:
+            # Counting edges by type walks every edge, so it is only done when the reports are being collected
+            report.edges_by_type = dict(Counter(edge.type.name for edge in graph.edges()))
+            try:
+                with Path(metrics_path).expanduser().open("a") as f:
+                    f.write(report.to_json() + "\n")
+            except OSError:
+                logger.exception(f"Failed to write graph metrics to {metrics_path}")
+
+
+def recorded(kind: str):
+    """Records a report of each call to the decorated `CodebaseContext` method."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(ctx: "CodebaseContext", *args, **kwargs):
+            with ctx.metrics.record(kind):
+                return func(ctx, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from graph_sitter.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+    from graph_sitter.core.file import SourceFile
+
+logger = get_logger(__name__)
+
+TFile = TypeVar("TFile", bound="SourceFile")
+
+
+class ModuleIndex(ABC, Generic[TFile]):
+    """Base class of the indexes of the files of a codebase used to resolve imports.
+
+    The index follows the files of the graph: `refresh` hands the files added and removed since the last refresh to
+    `_add` and `_remove`, and lookups refresh it first if the number of files changed.
+    """
+
+    ctx: "CodebaseContext"
+    # Files currently indexed, by relative path
+    _files: set[str]
+
+    def __init__(self, ctx: "CodebaseContext") -> None:
+        self.ctx = ctx
+        self._files = set()
+
+    def refresh(self) -> None:
+        """Indexes the files added to the graph and drops the removed ones since the last refresh."""
+        files = self.ctx.filepath_idx.keys()
+        if len(files) == len(self._files) and files == self._files:
+            return
+        removed = self._files - files
+        added = files - self._files
+        for filepath in removed:
+            self._remove(filepath)
+        for filepath in added:
+            self._add(filepath)
+        self._files.difference_update(removed)
+        self._files.update(added)
+        logger.debug(f"{type(self).__name__}: {len(added)} files added, {len(removed)} files removed")
+
+    @abstractmethod
+    def _add(self, filepath: str) -> None:
+        """Indexes a file added to the graph."""
+
+    @abstractmethod
+    def _remove(self, filepath: str) -> None:
+        """Drops a file removed from the graph."""
+
+    def _check_files(self) -> None:
+        if len(self.ctx.filepath_idx) != len(self._files):
+            # Files were created or removed since the last refresh
+            self.refresh()
+
+    def _get_file(self, filepath: str | None) -> TFile | None:
+        """Returns the file at a relative path, if it is still part of the graph."""
+        if filepath is None:
+            return None
+        node_id = self.ctx.filepath_idx.get(filepath, None)
+        if node_id is None:
+            return None
+        return self.ctx.get_node(node_id)
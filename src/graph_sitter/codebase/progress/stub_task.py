@@ -7,3 +7,6 @@ class StubTask(Task):
 
     def end(self) -> None:
         pass
+
+    def should_update(self) -> bool:
+        return False
@@ -1,7 +1,12 @@
+import time
 from abc import ABC, abstractmethod
 
 
 class Task(ABC):
+    # Minimum seconds between two updates that `should_update` lets through
+    min_update_interval: float = 0.1
+    _last_update: float = 0.0
+
     @abstractmethod
     def update(self, message: str, count: int | None = None) -> None:
         pass
@@ -9,3 +14,15 @@ class Task(ABC):
     @abstractmethod
     def end(self) -> None:
         pass
+
+    def should_update(self) -> bool:
+        """Whether enough time has passed since the last update to report another one.
+
+        Loops over many items should check this before building the message of an update, so reporting progress on
+        large graphs costs a clock read per item rather than a formatted message.
+        """
+        now = time.monotonic()
+        if now - self._last_update < self.min_update_interval:
+            return False
+        self._last_update = now
+        return True
@@ -1,6 +1,9 @@
 import itertools
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from collections.abc import Iterator
 from functools import cached_property
+from typing import NamedTuple
 
 from tree_sitter import Range
 
@@ -8,6 +11,21 @@ from graph_sitter.compiled.sort import sort_editables
 from graph_sitter.core.interfaces.editable import Editable
 
 
+class _SortedRanges(NamedTuple):
+    """The indexed ranges sorted by start byte, then by descending end byte.
+
+    `previous[i]` is the index of the closest range before `i` ending at or after `ends[i]` (or -1). Every range in
+    between ends before `ends[i]`, so searching backwards for a range ending at or after some offset can skip them.
+    `order[i]` is the position the range was first indexed at.
+    """
+
+    ranges: list[Range]
+    starts: list[int]
+    ends: list[int]
+    previous: list[int]
+    order: list[int]
+
+
 class RangeIndex:
     _ranges: defaultdict[Range, list[Editable]]
     _canonical_range: defaultdict[Range, dict[int, Editable]]
@@ -18,6 +36,7 @@ class RangeIndex:
 
     def add_to_range(self, editable: Editable) -> None:
         self._ranges[editable.range].append(editable)
+        self._invalidate()
 
     def mark_as_canonical(self, editable: Editable) -> None:
         self._canonical_range[editable.range][editable.ts_node.kind_id] = editable
@@ -29,11 +48,76 @@ class RangeIndex:
         if mapping := self._canonical_range.get(range, None):
             return mapping.get(kind_id, None)
 
+    def get_smallest_containing(self, start_byte: int, end_byte: int | None = None) -> Editable | None:
+        """Returns the narrowest node containing the byte range, both ends inclusive.
+
+        If `end_byte` is None, returns the narrowest node containing `start_byte`. Ties go to the node indexed first.
+        """
+        if end_byte is None:
+            end_byte = start_byte
+        sorted_ranges = self._sorted_ranges
+        starts, ends, order = sorted_ranges.starts, sorted_ranges.ends, sorted_ranges.order
+        best = None
+        for idx in self._iter_reaching(bisect_right(starts, start_byte) - 1, end_byte, inclusive=True):
+            if best is None or (ends[idx] - starts[idx], order[idx]) < (ends[best] - starts[best], order[best]):
+                best = idx
+        if best is None:
+            return None
+        return self._ranges[sorted_ranges.ranges[best]][0]
+
+    def get_overlapping(self, start_byte: int, end_byte: int) -> list[Editable]:
+        """Returns all nodes overlapping the half-open byte range [start_byte, end_byte), ordered by start byte."""
+        sorted_ranges = self._sorted_ranges
+        ranges, starts, ends = sorted_ranges.ranges, sorted_ranges.starts, sorted_ranges.ends
+        lo = bisect_left(starts, start_byte)
+        hi = bisect_left(starts, end_byte)
+        # Ranges starting before start_byte overlap if they end after it
+        before = list(self._iter_reaching(lo - 1, start_byte, inclusive=False))
+        overlapping = itertools.chain(reversed(before), (idx for idx in range(lo, hi) if ends[idx] > start_byte))
+        return list(itertools.chain.from_iterable(self._ranges[ranges[idx]] for idx in overlapping))
+
+    def _iter_reaching(self, idx: int, offset: int, inclusive: bool) -> Iterator[int]:
+        """Yields the indices of the sorted ranges up to `idx` ending after `offset` (or at it, if inclusive), in reverse order.
+
+        Runs in time proportional to the number of matches and the nesting depth of the skipped ranges rather than `idx`.
+        """
+        ends, previous = self._sorted_ranges.ends, self._sorted_ranges.previous
+        while idx >= 0:
+            if ends[idx] > offset or (inclusive and ends[idx] == offset):
+                yield idx
+                idx -= 1
+            else:
+                idx = previous[idx]
+
     def clear(self):
-        self._ranges.clear()
+        self.clear_ranges()
         self._canonical_range.clear()
+
+    def clear_ranges(self) -> None:
+        """Drops the full range index, keeping canonical ranges."""
+        self._ranges.clear()
+        self._invalidate()
+
+    def _invalidate(self) -> None:
         self.__dict__.pop("children", None)
         self.__dict__.pop("nodes", None)
+        self.__dict__.pop("_sorted_ranges", None)
+
+    @cached_property
+    def _sorted_ranges(self) -> _SortedRanges:
+        indexed = sorted(((ts_range, idx) for idx, (ts_range, editables) in enumerate(self._ranges.items()) if editables), key=lambda item: (item[0].start_byte, -item[0].end_byte))
+        ranges = [ts_range for ts_range, _ in indexed]
+        order = [idx for _, idx in indexed]
+        starts = [ts_range.start_byte for ts_range in ranges]
+        ends = [ts_range.end_byte for ts_range in ranges]
+        previous = []
+        stack = []
+        for idx, end in enumerate(ends):
+            while stack and ends[stack[-1]] < end:
+                stack.pop()
+            previous.append(stack[-1] if stack else -1)
+            stack.append(idx)
+        return _SortedRanges(ranges, starts, ends, previous, order)
 
     @cached_property
     def nodes(self) -> list[Editable]:
@@ -0,0 +1,251 @@
+"""Trigram index for full-text search over the files of a codebase."""
+
+import re
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+import numpy as np
+
+from graph_sitter.shared.logging.get_logger import get_logger
+
+logger = get_logger(__name__)
+
+_EMPTY_IDS = np.empty(0, dtype=np.int64)
+
+
+def get_trigrams(content: bytes) -> np.ndarray:
+    """Returns the sorted, unique trigrams of `content`, ignoring ASCII case, packed into integers."""
+    data = np.frombuffer(content.lower(), dtype=np.uint8).astype(np.uint32)
+    if len(data) < 3:
+        return np.empty(0, dtype=np.uint32)
+    trigrams = (data[:-2] << 16) | (data[1:-1] << 8) | data[2:]
+    # Sorting and dropping repeats is several times faster than np.unique on these
+    trigrams.sort()
+    keep = np.empty(len(trigrams), dtype=np.bool_)
+    keep[0] = True
+    np.not_equal(trigrams[1:], trigrams[:-1], out=keep[1:])
+    return trigrams[keep]
+
+
+def _literal_trigrams(literals: Iterable[str]) -> np.ndarray:
+    """Returns the trigrams every text containing all of `literals` has."""
+    parts = [get_trigrams(literal.encode("utf-8")) for literal in literals]
+    return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.uint32)
+
+
+def _split_literal(literal: str, ignore_case: bool) -> list[str]:
+    """The index only folds ASCII case, so a case-insensitive literal is split at non-ASCII characters."""
+    return re.split(r"[^\x00-\x7f]+", literal) if ignore_case else [literal]
+
+
+def _required_literals(pattern: str, flags: int) -> list[str] | None:
+    """Returns strings that every match of the regex contains, or None if the regex could not be analyzed.
+
+    Only literals that are always matched are collected: alternations, character classes and optional repeats end
+    the current literal instead of being expanded.
+    """
+    try:
+        from re import _constants, _parser
+    except ImportError:
+        return None
+    repeats = {_constants.MAX_REPEAT, _constants.MIN_REPEAT, getattr(_constants, "POSSESSIVE_REPEAT", None)} - {None}
+    literals = []
+
+    def walk(items, ignore_case: bool) -> None:
+        run = []
+        for op, av in items:
+            if op is _constants.LITERAL:
+                run.append(chr(av))
+                continue
+            literals.extend(_split_literal("".join(run), ignore_case))
+            run = []
+            if op is _constants.SUBPATTERN:
+                _, add_flags, del_flags, sub = av
+                walk(sub, (ignore_case or bool(add_flags & re.IGNORECASE)) and not del_flags & re.IGNORECASE)
+            elif op in repeats:
+                if av[0] >= 1:
+                    walk(av[2], ignore_case)
+            elif op is getattr(_constants, "ATOMIC_GROUP", None):
+                walk(av, ignore_case)
+        literals.extend(_split_literal("".join(run), ignore_case))
+
+    try:
+        parsed = _parser.parse(pattern, flags)
+        walk(parsed, bool(parsed.state.flags & re.IGNORECASE))
+    except Exception:
+        logger.debug(f"Could not analyze regex {pattern!r}, searching all files")
+        return None
+    return [literal for literal in literals if literal]
+
+
+def compile_query(query: str, use_regex: bool = False, case_sensitive: bool = True) -> tuple[re.Pattern[bytes], np.ndarray]:
+    """Compiles a search query.
+
+    Returns:
+        The pattern to match against file contents, and the trigrams a file must contain to have a match (empty if the
+        query does not constrain them)
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    pattern = re.compile((query if use_regex else re.escape(query)).encode("utf-8"), flags)
+    if use_regex:
+        literals = _required_literals(query, flags) or []
+    else:
+        literals = _split_literal(query, not case_sensitive)
+    return pattern, _literal_trigrams(literals)
+
+
+class TrigramIndex:
+    """Posting lists of the files containing each trigram.
+
+    Most posting lists are kept in a compact sorted layout built in bulk with numpy. Files indexed since the last
+    compaction are kept separately with their own trigrams, and files that were removed or re-indexed are tombstoned,
+    so keeping the index up to date with a few changed files never rebuilds it. It is compacted once the files indexed
+    since the last compaction outnumber `COMPACT_RATIO` of the total.
+
+    Files are indexed lazily: `invalidate` only records which files changed, and `refresh` indexes them when the index
+    is next used.
+    """
+
+    # Fraction of recently indexed files that triggers a compaction
+    COMPACT_RATIO = 0.1
+    # Recently indexed files are never compacted below this count
+    MIN_COMPACT_SIZE = 256
+
+    # Path of each file id, ids are never reused until the next compaction
+    _paths: list[Path]
+    _ids: dict[Path, int]
+    _alive: np.ndarray
+    # The files containing trigram `_keys[i]` are `_file_ids[_offsets[i]:_offsets[i + 1]]`
+    _keys: np.ndarray
+    _offsets: np.ndarray
+    _file_ids: np.ndarray
+    # Trigrams of the files indexed since the last compaction, by file id
+    _recent: dict[int, np.ndarray]
+    # Files changed since the last refresh, None if every file has to be indexed again
+    _stale: set[Path] | None
+
+    def __init__(self) -> None:
+        self._paths = []
+        self._ids = {}
+        self._alive = np.zeros(0, dtype=np.bool_)
+        self._keys = np.empty(0, dtype=np.uint32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._file_ids = _EMPTY_IDS
+        self._recent = {}
+        self._stale = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._ids
+
+    @property
+    def paths(self) -> list[Path]:
+        return list(self._ids)
+
+    def invalidate(self, paths: Iterable[Path] | None = None) -> None:
+        """Marks the given files (or all files, if None) as changed."""
+        if paths is None:
+            self._stale = None
+        elif self._stale is not None:
+            self._stale.update(paths)
+
+    def refresh(self, all_paths: Callable[[], Iterable[Path]], read: Callable[[Path], bytes | None]) -> None:
+        """Indexes the files changed since the last refresh.
+
+        Args:
+            all_paths: Returns the paths of every file to index, used when the whole index is stale
+            read: Returns the content of a file, or None if it should not be indexed
+        """
+        if self._stale is None:
+            self.clear()
+            stale = list(all_paths())
+        elif self._stale:
+            stale = sorted(self._stale)
+        else:
+            return
+        self._stale = set()
+        for path in stale:
+            content = read(path)
+            if content is None:
+                self.remove(path)
+            else:
+                self.add(path, content, compact=False)
+        self._maybe_compact()
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def add(self, path: Path, content: bytes, compact: bool = True) -> None:
+        """Indexes a file, replacing its previous content if it was indexed.
+
+        Args:
+            compact: Compact the index if enough files were indexed since the last compaction. Pass False when
+                indexing many files at once and call `compact` afterwards.
+        """
+        self.remove(path)
+        file_id = len(self._paths)
+        self._paths.append(path)
+        self._ids[path] = file_id
+        if file_id >= len(self._alive):
+            alive = np.zeros(max(16, 2 * len(self._alive)), dtype=np.bool_)
+            alive[: len(self._alive)] = self._alive
+            self._alive = alive
+        self._alive[file_id] = True
+        self._recent[file_id] = get_trigrams(content)
+        if compact:
+            self._maybe_compact()
+
+    def remove(self, path: Path) -> None:
+        if (file_id := self._ids.pop(path, None)) is not None:
+            self._alive[file_id] = False
+            self._recent.pop(file_id, None)
+
+    def _maybe_compact(self) -> None:
+        if len(self._recent) > max(self.MIN_COMPACT_SIZE, self.COMPACT_RATIO * len(self._ids)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Merges the recently indexed files into the compact posting lists and drops tombstoned files."""
+        entry_ids = self._file_ids[self._alive[self._file_ids]] if len(self._file_ids) else _EMPTY_IDS
+        entry_keys = np.repeat(self._keys, np.diff(self._offsets))[self._alive[self._file_ids]] if len(self._file_ids) else np.empty(0, dtype=np.uint32)
+        recent_ids = [np.full(len(trigrams), file_id, dtype=np.int64) for file_id, trigrams in self._recent.items()]
+        file_ids = np.concatenate([entry_ids, *recent_ids])
+        keys = np.concatenate([entry_keys, *self._recent.values()])
+        # Renumber the live files in path order
+        paths = sorted(self._ids)
+        renumber = np.zeros(len(self._paths), dtype=np.int64)
+        renumber[[self._ids[path] for path in paths]] = np.arange(len(paths))
+        # Sort the entries by trigram, then by file id, as a single packed integer
+        entries = np.sort((keys.astype(np.uint64) << np.uint64(32)) | renumber[file_ids].astype(np.uint64))
+        keys = (entries >> np.uint64(32)).astype(np.uint32)
+        starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1]))) if len(keys) else _EMPTY_IDS
+        self._keys = keys[starts]
+        self._offsets = np.append(starts, len(keys)).astype(np.int64)
+        self._file_ids = (entries & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        self._paths = paths
+        self._ids = {path: file_id for file_id, path in enumerate(paths)}
+        self._alive = np.ones(len(paths), dtype=np.bool_)
+        self._recent = {}
+
+    def candidates(self, trigrams: np.ndarray) -> list[Path]:
+        """Returns the indexed files containing all of the given trigrams, sorted by path."""
+        if len(trigrams) == 0:
+            return sorted(self._ids)
+        ids = None
+        positions = np.searchsorted(self._keys, trigrams)
+        for trigram, position in zip(trigrams, positions):
+            if position < len(self._keys) and self._keys[position] == trigram:
+                posting = self._file_ids[self._offsets[position] : self._offsets[position + 1]]
+            else:
+                posting = _EMPTY_IDS
+            ids = posting if ids is None else np.intersect1d(ids, posting, assume_unique=True)
+            if len(ids) == 0:
+                break
+        matches = [self._paths[file_id] for file_id in ids[self._alive[ids]]]
+        for file_id, file_trigrams in self._recent.items():
+            positions = np.searchsorted(file_trigrams, trigrams)
+            if np.all(positions < len(file_trigrams)) and np.array_equal(file_trigrams[np.minimum(positions, len(file_trigrams) - 1)], trigrams):
+                matches.append(self._paths[file_id])
+        return sorted(matches)
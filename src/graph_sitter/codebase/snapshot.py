@@ -0,0 +1,266 @@
+"""On-disk snapshots of the parsed codebase graph.
+
+A snapshot stores the content of every parsed file along with every edge in the graph, keyed by the commit and the
+`CodebaseConfig` the graph was built with. Restoring a snapshot re-parses the stored content (tree-sitter trees cannot
+be serialized) but skips import resolution and dependency computation entirely, which is the bulk of graph build time.
+Any difference between the snapshot and the working tree is then synced like a regular diff.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
+from graph_sitter.core.dataclasses.usage import Usage, UsageKind, UsageType
+from graph_sitter.core.external_module import ExternalModule
+from graph_sitter.enums import Edge, EdgeType, NodeType
+from graph_sitter.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+    from graph_sitter.core.interfaces.editable import Editable
+    from graph_sitter.core.interfaces.importable import Importable
+    from graph_sitter.git.repo_operator.repo_operator import RepoOperator
+
+logger = get_logger(__name__)
+
+# Bump this whenever the snapshot layout changes
+SNAPSHOT_VERSION = 1
+
+# Config fields that do not change the contents of the graph
+_IGNORED_CONFIG_FIELDS = {"debug", "verify_graph", "track_graph", "parse_workers", "snapshot_dir", "metrics_path"}
+
+# (class name, filepath, start byte, end byte, tree-sitter kind id)
+NodeKey = tuple[str, str, int, int, int]
+
+
+@dataclass(frozen=True)
+class SnapshotFile:
+    """A file that was enumerated when the graph was built."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    # None if the file was enumerated but not added to the graph (e.g. minified or not valid unicode)
+    content: bytes | None
+
+
+@dataclass(frozen=True)
+class SnapshotUsage:
+    match: NodeKey
+    usage_symbol: int
+    imported_by: int | None
+    usage_type: int
+    kind: int
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """Serializable state of a fully computed graph."""
+
+    version: int
+    key: str
+    files: list[SnapshotFile]
+    nodes: list[NodeKey]
+    # Index of each external module node in `nodes`, and the index of the import it was created from
+    external_modules: list[tuple[int, int]]
+    edges: list[tuple[int, int, EdgeType, SnapshotUsage | None]]
+
+
+def _node_key(node: Editable) -> NodeKey:
+    return type(node).__name__, node.filepath, node.start_byte, node.end_byte, node.ts_node.kind_id
+
+
+def get_snapshot_key(ctx: CodebaseContext, repo_operator: RepoOperator) -> str | None:
+    """Returns the key for a snapshot of the given context, or None if the repo has no commit to key on."""
+    try:
+        commit = repo_operator.head_commit
+    except ValueError:
+        commit = None
+    if commit is None:
+        return None
+    try:
+        version = importlib.metadata.version("graph-sitter")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    project = ctx.projects[0]
+    key = {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "graph_sitter_version": version,
+        "commit": commit.hexsha,
+        "language": str(ctx.programming_language),
+        "base_path": project.base_path,
+        "subdirectories": project.subdirectories,
+        "config": ctx.config.model_dump(mode="json", exclude=_IGNORED_CONFIG_FIELDS),
+    }
+    return f"{commit.hexsha}-{hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]}"
+
+
+def get_snapshot_path(ctx: CodebaseContext, repo_operator: RepoOperator) -> Path | None:
+    """Returns the path of the snapshot for the given context, or None if snapshots are disabled."""
+    if ctx.config.snapshot_dir is None or ctx.config.disable_file_parse:
+        return None
+    key = get_snapshot_key(ctx, repo_operator)
+    if key is None:
+        return None
+    return Path(ctx.config.snapshot_dir).expanduser() / ctx.repo_name / f"{key}.pkl"
+
+
+def create_snapshot(ctx: CodebaseContext, key: str, filepaths: list[Path]) -> GraphSnapshot:
+    """Captures the current state of the graph.
+
+    Args:
+        ctx: The context to snapshot. Should not have any unsynced changes.
+        key: The key of the snapshot, see `get_snapshot_key`
+        filepaths: Absolute paths of all the files enumerated when building the graph
+    """
+    files = []
+    for filepath in filepaths:
+        stat = filepath.stat()
+        content = ctx.io.read_bytes(filepath) if ctx.get_file(filepath) is not None else None
+        files.append(SnapshotFile(str(ctx.to_relative(filepath)), stat.st_size, stat.st_mtime_ns, content))
+
+    node_index: dict[int, int] = {}
+    nodes = []
+    external_modules = []
+    for node in ctx.nodes:
+        node_index[node.node_id] = len(nodes)
+        nodes.append(_node_key(node))
+    for node in ctx.get_nodes(NodeType.EXTERNAL):
+        external_modules.append((node_index[node.node_id], node_index[node._import.node_id]))
+
+    edges = []
+    for u, v, edge in ctx.edges:
+        usage = None
+        if edge.usage is not None:
+            usage = SnapshotUsage(
+                match=_node_key(edge.usage.match),
+                usage_symbol=node_index[edge.usage.usage_symbol.node_id],
+                imported_by=node_index[edge.usage.imported_by.node_id] if edge.usage.imported_by is not None else None,
+                usage_type=int(edge.usage.usage_type),
+                kind=int(edge.usage.kind),
+            )
+        edges.append((node_index[u], node_index[v], edge.type, usage))
+    return GraphSnapshot(version=SNAPSHOT_VERSION, key=key, files=files, nodes=nodes, external_modules=external_modules, edges=edges)
+
+
+def save_snapshot(snapshot: GraphSnapshot, path: Path) -> None:
+    """Atomically writes the snapshot to the given path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    logger.info(f"Saved graph snapshot to {path}")
+
+
+def load_snapshot(path: Path) -> GraphSnapshot | None:
+    """Loads a snapshot from the given path. Returns None if it does not exist or can't be used."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception:
+        logger.exception(f"Failed to load graph snapshot {path}")
+        return None
+    if not isinstance(snapshot, GraphSnapshot) or snapshot.version != SNAPSHOT_VERSION or snapshot.key != path.stem:
+        logger.warning(f"Ignoring incompatible graph snapshot {path}")
+        return None
+    return snapshot
+
+
+def restore_snapshot(ctx: CodebaseContext, snapshot: GraphSnapshot) -> None:
+    """Rebuilds the graph of an empty context from a snapshot.
+
+    Files are re-parsed from the content stored in the snapshot, then the external modules and edges are re-attached
+    without running import resolution or dependency computation.
+    """
+    file_cls = ctx.node_classes.file_cls
+    files = [file for file in snapshot.files if file.content is not None]
+    paths = [ctx.to_absolute(file.path) for file in files]
+    contents = {path: file.content for path, file in zip(paths, files)}
+
+    # Usage matches are expressions that are not nodes in the graph, so we need the range index to find them again
+    config = ctx.config
+    if not config.full_range_index:
+        ctx.config = config.model_copy(update={"full_range_index": True})
+    try:
+        task = ctx.progress.begin("Restoring files from snapshot", count=len(paths))
+        for idx, (path, parsed) in enumerate(ctx._parse_files(paths, contents)):
+            if task.should_update():
+                task.update(f"Restoring {ctx.to_relative(path)}", count=idx)
+            if parsed is not None:
+                _, tree = parsed
+                file_cls(tree.root_node, ctx.to_relative(path), ctx, tree=tree)
+        task.end()
+    finally:
+        ctx.config = config
+
+    # Map the snapshot's nodes onto the re-parsed ones
+    by_key: dict[NodeKey, Importable] = {}
+    for node in ctx.get_nodes():
+        by_key.setdefault(_node_key(node), node)
+    nodes: list[Importable | None] = [by_key.get(key) for key in snapshot.nodes]
+    for ext_idx, imp_idx in snapshot.external_modules:
+        nodes[ext_idx] = ExternalModule.from_import(nodes[imp_idx])
+    missing = [snapshot.nodes[idx] for idx, node in enumerate(nodes) if node is None]
+    if missing:
+        msg = f"Snapshot nodes could not be restored: {missing[:10]}"
+        raise ValueError(msg)
+
+    expressions: dict[NodeKey, Editable] = {}
+    for file in ctx.get_nodes(NodeType.FILE):
+        for editable in file._range_index.nodes:
+            expressions.setdefault(_node_key(editable), editable)
+        if not config.full_range_index:
+            file._range_index.clear_ranges()
+
+    edges = []
+    for u, v, edge_type, snapshot_usage in snapshot.edges:
+        usage = None
+        if snapshot_usage is not None:
+            match = expressions.get(snapshot_usage.match)
+            if match is None:
+                msg = f"Snapshot usage could not be restored: {snapshot_usage.match}"
+                raise ValueError(msg)
+            imported_by = nodes[snapshot_usage.imported_by] if snapshot_usage.imported_by is not None else None
+            usage = Usage(
+                match=match,
+                usage_symbol=nodes[snapshot_usage.usage_symbol],
+                imported_by=imported_by,
+                usage_type=UsageType(snapshot_usage.usage_type),
+                kind=UsageKind(snapshot_usage.kind),
+            )
+        edges.append((nodes[u].node_id, nodes[v].node_id, Edge(edge_type, usage)))
+    ctx.add_edges(edges)
+
+
+def get_snapshot_diffs(ctx: CodebaseContext, snapshot: GraphSnapshot, filepaths: list[Path]) -> list[DiffLite]:
+    """Returns the diffs between the files in a snapshot and the given working tree files.
+
+    Files whose size and mtime did not change since the snapshot was taken are assumed to be unchanged.
+    """
+    snapshot_files = {ctx.to_absolute(file.path): file for file in snapshot.files}
+    diffs = []
+    for filepath in filepaths:
+        file = snapshot_files.pop(filepath, None)
+        if file is None:
+            diffs.append(DiffLite(ChangeType.Added, filepath))
+            continue
+        stat = filepath.stat()
+        if stat.st_size == file.size and stat.st_mtime_ns == file.mtime_ns:
+            continue
+        if file.content is None or ctx.io.read_bytes(filepath) != file.content:
+            diffs.append(DiffLite(ChangeType.Modified, filepath, old_content=file.content))
+    for filepath, file in snapshot_files.items():
+        if file.content is not None:
+            diffs.append(DiffLite(ChangeType.Removed, filepath, old_content=file.content))
+    return diffs
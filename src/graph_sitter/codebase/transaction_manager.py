@@ -1,9 +1,10 @@
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
+from graph_sitter.codebase.diff_lite import DiffLite
+from graph_sitter.codebase.transaction_queue import TransactionQueue
 from graph_sitter.codebase.transactions import (
     EditTransaction,
     FileAddTransaction,
@@ -15,6 +16,7 @@ from graph_sitter.codebase.transactions import (
 )
 from graph_sitter.shared.exceptions.control_flow import MaxPreviewTimeExceeded, MaxTransactionsExceeded
 from graph_sitter.shared.logging.get_logger import get_logger
+from graph_sitter.tree_sitter_parser import PointIndex, TreeEdit
 
 if TYPE_CHECKING:
     from graph_sitter.core.file import File
@@ -33,9 +35,8 @@ class TransactionManager:
     This is used by the Codebase class to queue up transactions and then commit them in bulk.
     """
 
-    # Unsorted list of transactions, grouped by file
-    # TODO: consider using SortedList for better performance
-    queued_transactions: dict[Path, list[Transaction]]
+    # Transactions grouped by file, each queue is sorted by `Transaction._to_sort_key`
+    queued_transactions: dict[Path, TransactionQueue]
     pending_undos: set[Callable[[], None]]
     _commiting: bool = False
     max_transactions: int | None = None  # None = no limit
@@ -47,8 +48,7 @@ class TransactionManager:
         self.pending_undos = set()
 
     def sort_transactions(self) -> None:
-        for file_path, file_transactions in self.queued_transactions.items():
-            file_transactions.sort(key=Transaction._to_sort_key)
+        """No-op, the queues are kept sorted as transactions are added."""
 
     def clear_transactions(self) -> None:
         """Should be called between tests to remove any potential extraneous transactions. Makes sure we reset max_transactions as well."""
@@ -61,7 +61,7 @@ class TransactionManager:
         self.set_max_transactions(None)
         self.reset_stopwatch()
 
-    def _format_transactions(self, transactions: list[Transaction]) -> str:
+    def _format_transactions(self, transactions: Iterable[Transaction]) -> str:
         return "\n".join([">" * 100 + f"\n[ID: {t.transaction_id}]: {t.diff_str()}" + "<" * 100 for t in transactions])
 
     def get_transactions_str(self) -> str:
@@ -120,7 +120,7 @@ class TransactionManager:
         # Get the list of transactions for the file
         file_path = transaction.file_path
         if file_path not in self.queued_transactions:
-            self.queued_transactions[file_path] = []
+            self.queued_transactions[file_path] = TransactionQueue()
         file_queue = self.queued_transactions[file_path]
 
         # Dedupe transactions
@@ -129,7 +129,7 @@ class TransactionManager:
             return False
         # Solve conflicts
         if new_transaction := self._resolve_conflicts(transaction, file_queue, solve_conflicts=solve_conflicts):
-            file_queue.append(new_transaction)
+            file_queue.add(new_transaction)
 
         self.check_limits()
         return True
@@ -178,8 +178,6 @@ class TransactionManager:
             if not self.queued_transactions or len(self.queued_transactions) == 0:
                 return diffs
 
-            self.sort_transactions()
-
             # TODO: raise error if two transactions byte ranges overlap with each other
             if len(files) > 3:
                 num_transactions = sum([len(self.queued_transactions[file_path]) for file_path in files])
@@ -188,37 +186,67 @@ class TransactionManager:
                 for file in files:
                     logger.info(f"Committing {len(self.queued_transactions[file])} transactions for {file}")
             for file_path in files:
-                file_transactions = self.queued_transactions.pop(file_path, [])
-                modified = False
-                for transaction in file_transactions:
-                    # Add diff IF the file is a source file
-                    diff = transaction.get_diff()
-                    if diff.change_type == ChangeType.Modified:
-                        if not modified:
-                            modified = True
-                            diffs.append(diff)
-                    else:
-                        diffs.append(diff)
+                file_transactions = list(self.queued_transactions.pop(file_path, ()))
+                # Content transactions sort before file operations, which always start at byte 0
+                content_transactions = [t for t in file_transactions if t.transaction_order < TransactionPriority.FileAdd]
+                if content_transactions:
+                    diffs.append(content_transactions[0].get_diff())
+                    edited_file = content_transactions[0].file
+                    old_content = edited_file.content_bytes
+                    new_content, tree_edits = self._splice(old_content, content_transactions)
+                    edited_file.write(new_content)
+                    # Track the exact edits so the file can be reparsed incrementally
+                    edited_file.record_tree_edits(old_content, new_content, tree_edits)
+                for transaction in file_transactions[len(content_transactions) :]:
+                    diffs.append(transaction.get_diff())
                     transaction.execute()
             return diffs
         finally:
             self._commiting = False
 
+    def _splice(self, content: bytes, transactions: list[Transaction]) -> tuple[bytes, list[TreeEdit]]:
+        """Applies the content transactions of a file, sorted by `Transaction._to_sort_key`, in a single pass.
+
+        Equivalent to executing them one after the other, but since they are applied back to front the content before
+        each transaction is still the original one, so each byte is only copied once instead of once per transaction.
+
+        Returns:
+            The new content and the tree edits that turn `content` into it.
+        """
+        points = PointIndex(content)
+        # The new content after `cursor`, in reverse order
+        chunks: list[bytes] = []
+        cursor = len(content)
+        tree_edits = []
+        for transaction in transactions:
+            start_byte, end_byte = transaction.start_byte, transaction.end_byte
+            new_bytes = transaction.get_new_bytes()
+            if end_byte <= cursor:
+                tree_edits.append(TreeEdit.at_points(start_byte, end_byte, new_bytes, points[start_byte], points[end_byte]))
+                chunks.append(content[end_byte:cursor])
+            else:
+                # Overlaps a transaction that was already applied, so edit the current content instead
+                current = content[:cursor] + b"".join(reversed(chunks))
+                tree_edits.append(TreeEdit.from_replacement(current, start_byte, end_byte, new_bytes))
+                chunks = [current[end_byte:]]
+            chunks.append(new_bytes)
+            cursor = start_byte
+            if transaction.exec_func:
+                transaction.exec_func()
+        chunks.append(content[:cursor])
+        return b"".join(reversed(chunks)), tree_edits
+
     ####################################################################################################################
     # Conflict Resolution
     ####################################################################################################################
 
-    def _resolve_conflicts(self, transaction: Transaction, file_queue: list[Transaction], solve_conflicts: bool = True) -> Transaction | None:
+    def _resolve_conflicts(self, transaction: Transaction, file_queue: TransactionQueue, solve_conflicts: bool = True) -> Transaction | None:
         def break_down(to_break: EditTransaction) -> bool:
             if new_transactions := to_break.break_down():
-                try:
-                    insert_idx = file_queue.index(to_break)
-                    file_queue.pop(insert_idx)
-                except ValueError:
-                    insert_idx = len(file_queue)
+                file_queue.discard(to_break)
                 for new_transaction in new_transactions:
                     if broken_down := self._resolve_conflicts(new_transaction, file_queue, solve_conflicts=solve_conflicts):
-                        file_queue.insert(insert_idx, broken_down)
+                        file_queue.add(broken_down)
                 return True
             return False
 
@@ -278,29 +306,20 @@ class TransactionManager:
         if file_path not in self.queued_transactions:
             return matching_transactions
 
-        for t in self.queued_transactions[file_path]:
-            if t.start_byte == start_byte:
-                if t.end_byte == end_byte:
-                    if transaction_order is None or t.transaction_order == transaction_order:
-                        matching_transactions.append(t)
-                elif combined and t.start_byte != t.end_byte:
-                    if other := self.get_transactions_at_range(t.file_path, t.end_byte, end_byte, transaction_order, combined=combined):
-                        return [t, *other]
+        for t in self.queued_transactions[file_path].starting_at(start_byte):
+            if t.end_byte == end_byte:
+                if transaction_order is None or t.transaction_order == transaction_order:
+                    matching_transactions.append(t)
+            elif combined and t.start_byte != t.end_byte:
+                if other := self.get_transactions_at_range(t.file_path, t.end_byte, end_byte, transaction_order, combined=combined):
+                    return [t, *other]
 
         return matching_transactions
 
     def _get_conflicts(self, transaction: Transaction) -> list[Transaction]:
         """Returns all transactions that overlap with the given transaction"""
-        overlapping_transactions = []
-        queued_transactions = list(self.queued_transactions[transaction.file_path])
-        for t in queued_transactions:
-            if transaction.start_byte < t.end_byte and transaction.end_byte > t.start_byte:
-                overlapping_transactions.append(t)
-        return overlapping_transactions
+        return self.queued_transactions[transaction.file_path].overlapping(transaction.start_byte, transaction.end_byte)
 
     def _get_overlapping_conflicts(self, transaction: Transaction) -> Transaction | None:
-        """Returns the transaction that completely overlaps with the given transaction"""
-        for t in self.queued_transactions[transaction.file_path]:
-            if transaction.start_byte >= t.start_byte and transaction.end_byte <= t.end_byte:
-                return t
-        return None
+        """Returns the transaction that completely overlaps with the given transaction, the earliest queued if several do"""
+        return min(self.queued_transactions[transaction.file_path].containing(transaction.start_byte, transaction.end_byte), key=lambda t: t.transaction_id, default=None)
@@ -0,0 +1,172 @@
+import random
+from collections.abc import Iterator
+
+from graph_sitter.codebase.transactions import Transaction
+
+
+class _Node:
+    """A node of the treap backing `TransactionQueue`, augmented with the byte ranges covered by its subtree."""
+
+    __slots__ = ("key", "left", "max_end", "max_start", "min_start", "right", "size", "transaction", "weight")
+
+    def __init__(self, transaction: Transaction) -> None:
+        self.transaction = transaction
+        self.key = transaction._to_sort_key()
+        self.weight = random.random()
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+        self.update()
+
+    def update(self) -> None:
+        self.size = 1
+        self.min_start = self.max_start = self.transaction.start_byte
+        self.max_end = self.transaction.end_byte
+        for child in (self.left, self.right):
+            if child is not None:
+                self.size += child.size
+                self.min_start = min(self.min_start, child.min_start)
+                self.max_start = max(self.max_start, child.max_start)
+                self.max_end = max(self.max_end, child.max_end)
+
+
+def _split(node: _Node | None, key: tuple, inclusive: bool = False) -> tuple[_Node | None, _Node | None]:
+    """Splits a subtree into the nodes before `key` (or at it, if `inclusive`) and the rest."""
+    if node is None:
+        return None, None
+    if node.key < key or (inclusive and node.key == key):
+        node.right, right = _split(node.right, key, inclusive)
+        node.update()
+        return node, right
+    left, node.left = _split(node.left, key, inclusive)
+    node.update()
+    return left, node
+
+
+def _merge(left: _Node | None, right: _Node | None) -> _Node | None:
+    """Merges two subtrees, every node of `left` coming before every node of `right`."""
+    if left is None or right is None:
+        return left or right
+    if left.weight > right.weight:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+class TransactionQueue:
+    """The transactions queued for a file, kept in `Transaction._to_sort_key` order.
+
+    Backed by a treap where each subtree tracks the byte ranges of its transactions, so queuing a transaction and finding
+    the queued transactions that overlap or contain a byte range take O(log n) per transaction involved instead of a
+    scan of the whole queue. Membership is checked by hash, with the same equality as `Transaction.__eq__`.
+    """
+
+    _root: _Node | None
+    _counts: dict[Transaction, int]
+
+    def __init__(self) -> None:
+        self._root = None
+        self._counts = {}
+
+    def __len__(self) -> int:
+        return 0 if self._root is None else self._root.size
+
+    def __bool__(self) -> bool:
+        return self._root is not None
+
+    def __contains__(self, transaction: Transaction) -> bool:
+        return transaction in self._counts
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return self._iter_nodes(self._root)
+
+    def __getitem__(self, idx: int) -> Transaction:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            msg = "TransactionQueue index out of range"
+            raise IndexError(msg)
+        node = self._root
+        while True:
+            left_size = 0 if node.left is None else node.left.size
+            if idx < left_size:
+                node = node.left
+            elif idx == left_size:
+                return node.transaction
+            else:
+                idx -= left_size + 1
+                node = node.right
+
+    def __repr__(self) -> str:
+        return f"TransactionQueue({list(self)!r})"
+
+    def add(self, transaction: Transaction) -> None:
+        node = _Node(transaction)
+        # Like a stable sort, a transaction goes after the queued ones with the same key
+        left, right = _split(self._root, node.key, inclusive=True)
+        self._root = _merge(_merge(left, node), right)
+        self._counts[transaction] = self._counts.get(transaction, 0) + 1
+
+    def discard(self, transaction: Transaction) -> bool:
+        """Removes the given transaction (not just an equal one) from the queue, returning whether it was queued."""
+        key = transaction._to_sort_key()
+        left, right = _split(self._root, key)
+        same_key, right = _split(right, key, inclusive=True)
+        same_key_transactions = [] if same_key is None else list(self._iter_nodes(same_key))
+        if not any(t is transaction for t in same_key_transactions):
+            self._root = _merge(_merge(left, same_key), right)
+            return False
+        same_key = None
+        for t in same_key_transactions:
+            if t is not transaction:
+                same_key = _merge(same_key, _Node(t))
+        self._root = _merge(_merge(left, same_key), right)
+        if self._counts[transaction] == 1:
+            del self._counts[transaction]
+        else:
+            self._counts[transaction] -= 1
+        return True
+
+    def remove(self, transaction: Transaction) -> None:
+        if not self.discard(transaction):
+            msg = f"{transaction} is not queued"
+            raise ValueError(msg)
+
+    def overlapping(self, start_byte: int, end_byte: int) -> list[Transaction]:
+        """Returns the queued transactions that overlap `[start_byte, end_byte)`, in queue order."""
+        return self._query(lambda node: node.min_start < end_byte and node.max_end > start_byte, lambda t: t.start_byte < end_byte and t.end_byte > start_byte)
+
+    def containing(self, start_byte: int, end_byte: int) -> list[Transaction]:
+        """Returns the queued transactions that contain `[start_byte, end_byte)`, in queue order."""
+        return self._query(lambda node: node.min_start <= start_byte and node.max_end >= end_byte, lambda t: t.start_byte <= start_byte and t.end_byte >= end_byte)
+
+    def starting_at(self, start_byte: int) -> list[Transaction]:
+        """Returns the queued transactions that start at `start_byte`, in queue order."""
+        return self._query(lambda node: node.min_start <= start_byte <= node.max_start, lambda t: t.start_byte == start_byte)
+
+    def _query(self, subtree_may_match, matches) -> list[Transaction]:
+        ret = []
+
+        def visit(node: _Node | None) -> None:
+            if node is None or not subtree_may_match(node):
+                return
+            visit(node.left)
+            if matches(node.transaction):
+                ret.append(node.transaction)
+            visit(node.right)
+
+        visit(self._root)
+        return ret
+
+    @staticmethod
+    def _iter_nodes(node: _Node | None) -> Iterator[Transaction]:
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.transaction
+            node = node.right
@@ -35,6 +35,8 @@ class Transaction:
     priority: int | tuple
     transaction_order: TransactionPriority
     transaction_counter: int = 0
+    # Called once the transaction has been applied
+    exec_func: Callable[[], None] | None = None
 
     def __init__(
         self,
@@ -58,7 +60,8 @@ class Transaction:
         return f"<Transaction at bytes [{self.start_byte}:{self.end_byte}] on {self.file_path}>"
 
     def __hash__(self):
-        return hash((self.start_byte, self.end_byte, self.file_path, self.priority, self.new_content))
+        # Hash the content function rather than its result, so queuing a transaction doesn't evaluate it early
+        return hash((self.start_byte, self.end_byte, self.file_path, self.priority, self._new_content))
 
     def __eq__(self, other):
         if not isinstance(other, type(self)):
@@ -91,6 +94,10 @@ class Transaction:
         msg = "Transaction.diff_str() must be implemented by subclasses"
         raise NotImplementedError(msg)
 
+    def get_new_bytes(self) -> bytes | None:
+        """Gets the bytes that replace `[start_byte, end_byte)`, or None if this transaction does not edit content."""
+        return None
+
     def _to_sort_key(transaction: "Transaction"):
         # Sort by:
         # 1. Descending start_byte
@@ -131,6 +138,9 @@ class RemoveTransaction(Transaction):
         """Gets the diff produced by this transaction"""
         return DiffLite(ChangeType.Modified, self.file_path, old_content=self.file.content_bytes)
 
+    def get_new_bytes(self) -> bytes:
+        return b""
+
     def diff_str(self) -> str:
         """Human-readable string representation of the change"""
         diff = "".join(unified_diff(self.file.content.splitlines(True), self._generate_new_content_bytes().decode("utf-8").splitlines(True)))
@@ -174,6 +184,9 @@ class InsertTransaction(Transaction):
         """Gets the diff produced by this transaction"""
         return DiffLite(ChangeType.Modified, self.file_path, old_content=self.file.content_bytes)
 
+    def get_new_bytes(self) -> bytes:
+        return bytes(self.new_content, encoding="utf-8")
+
     def diff_str(self) -> str:
         """Human-readable string representation of the change"""
         diff = "".join(unified_diff(self.file.content.splitlines(True), self._generate_new_content_bytes().decode("utf-8").splitlines(True)))
@@ -209,6 +222,9 @@ class EditTransaction(Transaction):
         """Gets the diff produced by this transaction"""
         return DiffLite(ChangeType.Modified, self.file_path, old_content=self.file.content_bytes)
 
+    def get_new_bytes(self) -> bytes:
+        return bytes(self.new_content, "utf-8")
+
     def diff_str(self) -> str:
         """Human-readable string representation of the change"""
         diff = "".join(unified_diff(self.file.content.splitlines(True), self._generate_new_content_bytes().decode("utf-8").splitlines(True)))
@@ -0,0 +1,171 @@
+from collections.abc import Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from graph_sitter.core.dataclasses.usage import UsageType
+from graph_sitter.core.node_id_factory import NodeId
+from graph_sitter.enums import EdgeType
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+    from graph_sitter.core.interfaces.importable import Importable
+
+# (node, reverse, usage types, hop imports)
+NeighborsKey = tuple[NodeId, bool, UsageType | None, bool]
+# (node, reverse, usage types, hop imports, max depth)
+WalkKey = tuple[NodeId, bool, UsageType | None, bool, int | None]
+
+T = TypeVar("T")
+
+
+class GraphTraversal:
+    """Depth-limited breadth-first traversals of the symbol usage graph.
+
+    Forward traversals follow the `SYMBOL_USAGE` edges out of a node and its descendant symbols, like
+    `Importable.dependencies`. Reverse traversals follow the `SYMBOL_USAGE` edges into a node to the symbols that use it,
+    like `Usable.symbol_usages`. With `hop_imports`, imports reached along the way are replaced by the symbols they
+    resolve to through their `IMPORT_SYMBOL_RESOLUTION` edges.
+
+    The neighbors of each node and the result of each walk are computed on node ids and shared by every query until the
+    graph changes, which is detected through the generations of the context and of its cache registry. Other queries over
+    the graph can share their results the same way through `memoize`. Nothing is cached while the graph is being computed.
+    """
+
+    ctx: "CodebaseContext"
+    _generation: tuple[int, int] | None
+    _neighbors: dict[NeighborsKey, tuple[NodeId, ...]]
+    _walks: dict[WalkKey, dict[NodeId, int]]
+    _results: dict[Hashable, Any]
+
+    def __init__(self, ctx: "CodebaseContext") -> None:
+        self.ctx = ctx
+        self._generation = None
+        self._neighbors = {}
+        self._walks = {}
+        self._results = {}
+
+    def clear(self) -> None:
+        self._neighbors.clear()
+        self._walks.clear()
+        self._results.clear()
+
+    def _can_cache(self) -> bool:
+        """Drops the cached results if the graph changed since they were computed, returning whether results can be
+        cached (and looked up).
+        """
+        if self.ctx._computing:
+            self.clear()
+            self._generation = None
+            return False
+        generation = (self.ctx.generation, self.ctx.cache_registry.generation)
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+        return True
+
+    def neighbors(self, node_id: NodeId, reverse: bool = False, usage_types: UsageType | None = None, hop_imports: bool = False) -> tuple[NodeId, ...]:
+        """Returns the nodes one step away from a node.
+
+        Args:
+            reverse: Follow usages instead of dependencies
+            usage_types: Only follow usages of these types, or of any type if None
+            hop_imports: Replace imports by the symbols they resolve to
+        """
+        key = (node_id, reverse, usage_types, hop_imports)
+        can_cache = self._can_cache()
+        if (cached := self._neighbors.get(key)) is not None:
+            return cached
+        ret = self._usages(node_id, usage_types) if reverse else self._dependencies(node_id, usage_types)
+        if hop_imports:
+            ret = dict.fromkeys(self._hop_import(neighbor) for neighbor in ret)
+        ret = tuple(ret)
+        if can_cache:
+            self._neighbors[key] = ret
+        return ret
+
+    def walk(self, node_id: NodeId, reverse: bool = False, usage_types: UsageType | None = None, hop_imports: bool = False, max_depth: int | None = 1) -> dict[NodeId, int]:
+        """Returns the nodes reachable from a node in at most `max_depth` steps (or any number of steps if None).
+
+        The nodes are mapped to their distance from the starting node, in breadth-first order. The starting node is only
+        included if it can be reached from itself.
+        """
+        key = (node_id, reverse, usage_types, hop_imports, max_depth)
+        can_cache = self._can_cache()
+        if (cached := self._walks.get(key)) is not None:
+            return cached
+        depths: dict[NodeId, int] = {}
+        expanded = {node_id}
+        frontier = [node_id]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for current in frontier:
+                for neighbor in self.neighbors(current, reverse, usage_types, hop_imports):
+                    if neighbor not in depths:
+                        depths[neighbor] = depth
+                    if neighbor not in expanded:
+                        expanded.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        if can_cache:
+            self._walks[key] = depths
+        return depths
+
+    def memoize(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Returns the result of `compute`, shared by every call with the same key until the graph changes."""
+        can_cache = self._can_cache()
+        if key in self._results:
+            return self._results[key]
+        ret = compute()
+        if can_cache:
+            self._results[key] = ret
+        return ret
+
+    def dependencies(self, node: "Importable", usage_types: UsageType | None = UsageType.DIRECT, max_depth: int | None = 1, hop_imports: bool = False) -> list["Importable"]:
+        """Returns the nodes `node` depends on, directly or through at most `max_depth` dependencies, in breadth-first
+        order.
+        """
+        return [self.ctx.get_node(node_id) for node_id in self.walk(node.node_id, False, usage_types, hop_imports, max_depth)]
+
+    def usages(self, node: "Importable", usage_types: UsageType | None = None, max_depth: int | None = 1, hop_imports: bool = False) -> list["Importable"]:
+        """Returns the symbols that use `node`, directly or through at most `max_depth` usages, in breadth-first order."""
+        return [self.ctx.get_node(node_id) for node_id in self.walk(node.node_id, True, usage_types, hop_imports, max_depth)]
+
+    def _dependencies(self, node_id: NodeId, usage_types: UsageType | None) -> Iterable[NodeId]:
+        from graph_sitter.core.interfaces.importable import Importable
+
+        node = self.ctx.get_node(node_id)
+        if not isinstance(node, Importable):
+            return ()
+        descendants = {symbol.node_id for symbol in node.descendant_symbols}
+        ret = {}
+        for symbol_id in descendants:
+            for _, target, edge in self.ctx.out_edges(symbol_id):
+                if edge.type != EdgeType.SYMBOL_USAGE or target in descendants:
+                    continue
+                usage_type = edge.usage.usage_type
+                if usage_types is None or usage_type is None or usage_type in usage_types:
+                    ret[target] = None
+        return ret
+
+    def _usages(self, node_id: NodeId, usage_types: UsageType | None) -> Iterable[NodeId]:
+        from graph_sitter.core.interfaces.usable import Usable
+
+        node = self.ctx.get_node(node_id)
+        if not isinstance(node, Usable):
+            return ()
+        return dict.fromkeys(usage.usage_symbol.parent_symbol.node_id for usage in node.usages(usage_types))
+
+    def _hop_import(self, node_id: NodeId) -> NodeId:
+        """Follows a chain of imports to the symbol, file or external module it resolves to."""
+        from graph_sitter.core.import_resolution import Import
+
+        seen = set()
+        node = self.ctx.get_node(node_id)
+        while isinstance(node, Import) and node.node_id not in seen:
+            seen.add(node.node_id)
+            imported = node.imported_symbol
+            if imported is None:
+                break
+            node = imported
+        return node.node_id
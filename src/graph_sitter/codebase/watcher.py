@@ -0,0 +1,194 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from watchfiles import Change, watch
+
+from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
+from graph_sitter.git.utils.file_utils import is_ignored
+from graph_sitter.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+
+logger = get_logger(__name__)
+
+# Milliseconds without a new event before a batch of changes is synced
+DEFAULT_WATCH_STEP = 50
+# Maximum milliseconds to keep extending a batch while events keep arriving
+DEFAULT_WATCH_DEBOUNCE = 1600
+# Milliseconds the watcher waits for events before checking whether it was stopped
+WATCH_POLL_TIMEOUT = 500
+
+
+class CodebaseWatcher:
+    """Keeps a codebase graph in sync with the files on disk.
+
+    Filesystem events are filtered through the codebase's extensions, subdirectories, the global ignore list and (for
+    files the graph does not hold yet) the repo's gitignore rules, then batched: a batch ends once no event has arrived for `step` milliseconds (or after `debounce` milliseconds of
+    continuous events), and events that arrive while a batch is being synced are coalesced into the next one. A
+    `git checkout` touching thousands of files is therefore applied with a single `CodebaseContext.apply_diffs` call.
+
+    Each synced batch bumps `generation`. Readers can wait for a generation with `wait_for_generation` and should hold
+    the graph through `read`, which never runs concurrently with a sync.
+    """
+
+    ctx: "CodebaseContext"
+    step: int
+    debounce: int
+    last_sync_latency: float | None
+    _generation: int
+    _thread: threading.Thread | None
+
+    def __init__(self, ctx: "CodebaseContext", step: int = DEFAULT_WATCH_STEP, debounce: int = DEFAULT_WATCH_DEBOUNCE) -> None:
+        from graph_sitter.codebase.codebase_context import GLOBAL_FILE_IGNORE_LIST
+
+        self.ctx = ctx
+        self.step = step
+        self.debounce = debounce
+        self.last_sync_latency = None
+        self._repo_path = Path(ctx.repo_path)
+        self._extensions = set(ctx.extensions)
+        self._subdirectories = ctx.projects[0].subdirectories
+        self._repo_operator = ctx.projects[0].repo_operator
+        self._ignore_list = GLOBAL_FILE_IGNORE_LIST
+        self._generation = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        # Notified whenever a batch has been synced
+        self._synced = threading.Condition()
+        # Held while the graph is synced or read
+        self._graph_lock = threading.RLock()
+
+    def __enter__(self) -> "CodebaseWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def generation(self) -> int:
+        """Number of batches of changes synced to the graph since the watcher started."""
+        return self._generation
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, timeout: float | None = None) -> None:
+        """Starts watching on a background thread, returning once changes to the files are being picked up."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="codebase-watcher", daemon=True)
+        self._thread.start()
+        if timeout is None:
+            timeout = 2 * WATCH_POLL_TIMEOUT / 1000
+        if not self._ready.wait(timeout):
+            logger.warning(f"Watcher for {self._repo_path} did not start within {timeout}s")
+
+    def stop(self) -> None:
+        """Stops watching, waiting for a sync that is already running."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def wait_for_generation(self, generation: int, timeout: float | None = None) -> bool:
+        """Waits until at least `generation` batches have been synced, returning whether they were."""
+        with self._synced:
+            return self._synced.wait_for(lambda: self._generation >= generation, timeout)
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Holds the graph for the duration of a read, blocking syncs until it is released."""
+        with self._graph_lock:
+            yield
+
+    def should_watch(self, change: Change, path: str) -> bool:
+        """Whether a change to `path` can affect the graph.
+
+        Gitignore rules need a call to git, so they are checked once per batch in `_to_diffs` instead.
+        """
+        filepath = Path(path)
+        if filepath.suffix not in self._extensions:
+            return False
+        try:
+            relative = filepath.relative_to(self._repo_path).as_posix()
+        except ValueError:
+            return False
+        if self._subdirectories is not None and not any(Path(relative).is_relative_to(subdir) for subdir in self._subdirectories):
+            return False
+        return not is_ignored(relative, self._ignore_list)
+
+    def _run(self) -> None:
+        # With yield_on_timeout, the first (possibly empty) batch is yielded once the underlying watcher is running
+        changes = watch(
+            self._repo_path,
+            watch_filter=self.should_watch,
+            debounce=self.debounce,
+            step=self.step,
+            stop_event=self._stop,
+            rust_timeout=WATCH_POLL_TIMEOUT,
+            yield_on_timeout=True,
+            raise_interrupt=False,
+        )
+        try:
+            for batch in changes:
+                self._ready.set()
+                if batch:
+                    self.sync(batch)
+        except Exception:
+            logger.exception(f"Watcher for {self._repo_path} stopped")
+        finally:
+            self._ready.set()
+
+    def sync(self, changes: set[tuple[Change, str]]) -> None:
+        """Applies a batch of filesystem changes to the graph."""
+        try:
+            with self._graph_lock:
+                diffs = self._to_diffs(changes)
+                if diffs:
+                    start = time.perf_counter()
+                    self.ctx.apply_diffs(diffs)
+                    self.last_sync_latency = time.perf_counter() - start
+                    logger.info(f"Synced {len(diffs)} changed files ({len(changes)} events) in {self.last_sync_latency * 1000:.0f}ms")
+        except Exception:
+            logger.exception(f"Failed to sync {len(changes)} filesystem events")
+        finally:
+            # Readers waiting for this batch are woken up even if it failed to sync
+            with self._synced:
+                self._generation += 1
+                self._synced.notify_all()
+
+    def _to_diffs(self, changes: set[tuple[Change, str]]) -> list[DiffLite]:
+        """Reduces a batch of events to one diff per file, based on the state of the file after the batch.
+
+        Events in a batch are unordered, so a file that still exists is synced as modified (`apply_diffs` adds it if
+        it is not in the graph yet) and a file that no longer exists as removed. Files whose content matches the
+        parsed graph are skipped, which covers the codebase's own writes and files a checkout left unchanged. Files that
+        are not in the graph yet are only added if they are not gitignored, like in a full build.
+        """
+        diffs = []
+        added = []
+        for path in sorted({Path(path) for _, path in changes}):
+            file = self.ctx.get_file(path)
+            try:
+                content = path.read_bytes()
+            except (FileNotFoundError, IsADirectoryError):
+                if file is not None:
+                    diffs.append(DiffLite.from_watch_change(Change.deleted, path))
+                continue
+            if file is None:
+                added.append(path)
+            elif file.ts_node is None or file.ts_node.text != content:
+                diffs.append(DiffLite(ChangeType.Modified, path))
+        ignored = self._repo_operator.get_ignored_filepaths([path.relative_to(self._repo_path).as_posix() for path in added])
+        diffs.extend(DiffLite(ChangeType.Modified, path) for path in added if path.relative_to(self._repo_path).as_posix() not in ignored)
+        return diffs
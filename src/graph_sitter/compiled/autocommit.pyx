@@ -4,6 +4,7 @@ from typing import Any, ParamSpec, TypeVar, Union, overload
 
 import wrapt
 
+from graph_sitter.compiled.utils import copy_state
 from graph_sitter.core.autocommit.constants import AutoCommitState, OutdatedNodeError, enabled
 
 P = ParamSpec("P")
@@ -170,7 +171,7 @@ def update_dict(seen: set["Editable"], obj: "Editable", new_obj: "Editable"):
     #         v = obj.autocommit_cache.get(k)
     #         update_child(v, new_value)
     assert new_obj.__class__ == obj.__class__
-    obj.__dict__ = new_obj.__dict__
+    copy_state(obj, new_obj)
     assert new_obj.ts_node == obj.ts_node
     assert new_obj.is_same_version(obj)
     assert not obj.is_outdated
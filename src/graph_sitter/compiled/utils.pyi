@@ -1,4 +1,4 @@
-from collections.abc import Generator, Iterable
+from collections.abc import Generator, Hashable, Iterable
 from functools import cached_property as functools_cached_property
 from functools import lru_cache as functools_lru_cache
 
@@ -20,8 +20,41 @@ def find_line_start_and_end_nodes(node: TSNode) -> list[tuple[TSNode, TSNode]]:
 
 def find_first_descendant(node: TSNode, type_names: list[str], max_depth: int | None = None) -> TSNode | None: ...
 
+class CacheRegistry:
+    """Tracks the values computed by `cached_property` so they can be dropped when the code they depend on changes."""
+
+    generation: int
+    misses: int
+    invalidations: int
+
+    def __len__(self) -> int: ...
+    def register(self, instance: object, name: str) -> None: ...
+    def invalidate(self, scopes: Iterable[Hashable] | None = None) -> int:
+        """Drops the cached values of the given scopes (all scopes if None) and the values not tied to a scope."""
+
+    def stats(self) -> dict[str, int]:
+        """Returns the cache counters, including the hits and misses of the `lru_cache` functions."""
+
+default_registry: CacheRegistry
+
+def get_cache_registry(instance: object) -> CacheRegistry: ...
+def cache_slot(name: str) -> str:
+    """Returns the name of the slot `cached_property` stores the value of the property `name` in."""
+
+def cache_slots(*names: str) -> tuple[str, ...]:
+    """Returns the slots to declare in the `__slots__` of a class to store the values of its cached properties `names`."""
+
 cached_property = functools_cached_property
+
+def copy_state(dst: object, src: object) -> None:
+    """Makes `dst` take the state of `src`, which must be of the same class: `dst` shares the `__dict__` of `src` and
+    gets the values of its slots.
+    """
+
 lru_cache = functools_lru_cache
 
-def uncache_all(): ...
+def clear_lru_caches() -> None: ...
+def uncache_all() -> None:
+    """Drops every cached value, in every codebase context."""
+
 def is_descendant_of(node: TSNode, possible_parent: TSNode) -> bool: ...
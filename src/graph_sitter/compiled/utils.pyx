@@ -1,7 +1,9 @@
+import weakref
 from collections import Counter
 from collections.abc import Generator, Iterable
 from functools import cached_property as functools_cached_property
 from functools import lru_cache as functools_lru_cache
+from types import MemberDescriptorType
 
 from tabulate import tabulate
 from tree_sitter import Node as TSNode
@@ -109,23 +111,199 @@ def find_first_descendant(node: TSNode, type_names: list[str], max_depth: int |
     return find(node)
 
 
-to_uncache = []
 lru_caches = []
 counter = Counter()
 
 
+class CacheRegistry:
+    """Tracks the values computed by `cached_property` so they can be dropped when the code they depend on changes.
+
+    Values are grouped by the file of the instance they are cached on (values on objects outside of a file share the
+    `None` scope), so a sync can drop only the values of the files it affects. Each instance is registered once per
+    attribute and only while its value is cached, so the registry never holds more than the live cached values.
+
+    Attributes:
+        generation: Number of times values have been invalidated
+        misses: Number of values computed and registered
+        invalidations: Number of values dropped
+    """
+
+    def __init__(self):
+        # scope -> id(instance) -> (weak or strong reference to the instance, names the cached values are stored under)
+        self._scopes = {}
+        self.generation = 0
+        self.misses = 0
+        self.invalidations = 0
+        # A single callback for every reference, instead of one closure per instance
+        self._on_collected = self._drop_collected
+        _registries.add(self)
+
+    def __len__(self):
+        return sum(len(names) for entries in self._scopes.values() for _, names in entries.values())
+
+    def register(self, instance, name):
+        scope = getattr(instance, "file_node_id", None)
+        entries = self._scopes.get(scope)
+        if entry := (entries.get(id(instance)) if entries is not None else None):
+            if name not in entry[1]:
+                entry[1].append(name)
+        else:
+            if entries is None:
+                entries = self._scopes[scope] = {}
+            key = id(instance)
+            try:
+                ref = _InstanceRef(instance, self._on_collected, scope, key)
+            except TypeError:
+                ref = lambda instance=instance: instance
+            entries[key] = (ref, [name])
+        self.misses += 1
+
+    def _drop_collected(self, ref):
+        entries = self._scopes.get(ref.scope)
+        if entries is not None and (entry := entries.get(ref.key)) is not None and entry[0] is ref:
+            del entries[ref.key]
+
+    def invalidate(self, scopes=None):
+        """Drops the cached values of the given scopes (all scopes if None) and the values not tied to a scope.
+
+        Returns:
+            The number of values dropped.
+        """
+        if scopes is None:
+            dropped = list(self._scopes.values())
+            self._scopes = {}
+        else:
+            dropped = [self._scopes.pop(scope) for scope in {None, *scopes} if scope in self._scopes]
+        count = 0
+        for entries in dropped:
+            for ref, names in list(entries.values()):
+                instance = ref()
+                if instance is None:
+                    continue
+                for name in names:
+                    # Deleting the attribute does not materialize the `__dict__` of the instance, and also clears slots
+                    try:
+                        object.__delattr__(instance, name)
+                    except AttributeError:
+                        continue
+                    count += 1
+        self.generation += 1
+        self.invalidations += count
+        return count
+
+    def stats(self):
+        """Returns the cache counters, including the hits and misses of the `lru_cache` functions."""
+        lru_hits = lru_misses = 0
+        for cached_func in lru_caches:
+            info = cached_func.cache_info()
+            lru_hits += info.hits
+            lru_misses += info.misses
+        return {
+            "cached": len(self),
+            "generation": self.generation,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "lru_hits": lru_hits,
+            "lru_misses": lru_misses,
+        }
+
+
+class _InstanceRef(weakref.ref):
+    __slots__ = ("scope", "key")
+
+    def __new__(cls, instance, callback, scope, key):
+        self = super().__new__(cls, instance, callback)
+        self.scope = scope
+        self.key = key
+        return self
+
+    def __init__(self, instance, callback, scope, key):
+        super().__init__(instance, callback)
+
+
+_registries = weakref.WeakSet()
+# Values cached on objects that don't belong to a codebase context
+default_registry = CacheRegistry()
+
+
+def get_cache_registry(instance):
+    registry = getattr(getattr(instance, "ctx", None), "cache_registry", None)
+    if registry is None:
+        return default_registry
+    return registry
+
+
+def cache_slot(name):
+    """Returns the name of the slot `cached_property` stores the value of the property `name` in."""
+    return "_cached_" + name
+
+
+def cache_slots(*names):
+    """Returns the slots to declare in the `__slots__` of a class to store the values of its cached properties `names`."""
+    return tuple(cache_slot(name) for name in names)
+
+
 class cached_property(functools_cached_property):
+    """`functools.cached_property` whose values are tracked by the cache registry of the instance.
+
+    If the class declares the `cache_slots` of the property, the value is stored in that slot. Otherwise it is set as
+    an instance attribute, without materializing the instance `__dict__`.
+    """
+
+    def __set_name__(self, owner, name):
+        super().__set_name__(owner, name)
+        slot = getattr(owner, cache_slot(name), None)
+        self.slot = slot if isinstance(slot, MemberDescriptorType) else None
+
     def __get__(self, instance, owner=None):
-        ret = super().__get__(instance)
-        if instance is not None:
-            to_uncache.append((instance, self.attrname))
-            counter[self.attrname] += 1
+        if instance is None:
+            return self
+        slot = self.slot
+        if slot is None:
+            ret = self.func(instance)
+            # Once the value is cached, the instance attribute shadows this descriptor, so this only runs on misses
+            object.__setattr__(instance, self.attrname, ret)
+            get_cache_registry(instance).register(instance, self.attrname)
+        else:
+            try:
+                return slot.__get__(instance, owner)
+            except AttributeError:
+                pass
+            ret = self.func(instance)
+            slot.__set__(instance, ret)
+            get_cache_registry(instance).register(instance, slot.__name__)
+        counter[self.attrname] += 1
         return ret
 
 
+_slot_descriptors = {}
+
+
+def copy_state(dst, src):
+    """Makes `dst` take the state of `src`, which must be of the same class: `dst` shares the `__dict__` of `src` and
+    gets the values of its slots.
+    """
+    cls = type(src)
+    descriptors = _slot_descriptors.get(cls)
+    if descriptors is None:
+        descriptors = _slot_descriptors[cls] = [
+            descriptor for klass in cls.__mro__ for descriptor in vars(klass).values() if isinstance(descriptor, MemberDescriptorType) and descriptor.__objclass__ is klass
+        ]
+    if hasattr(src, "__dict__"):
+        dst.__dict__ = src.__dict__
+    for descriptor in descriptors:
+        try:
+            descriptor.__set__(dst, descriptor.__get__(src, cls))
+        except AttributeError:
+            try:
+                descriptor.__delete__(dst)
+            except AttributeError:
+                pass
+
+
 def lru_cache(func=None, *, maxsize=128, typed=False):
     """A wrapper around functools.lru_cache that tracks the cached function so that its cache
-    can be cleared later via uncache_all().
+    can be cleared later via clear_lru_caches() or uncache_all().
     """
     if func is None:
         # return decorator
@@ -137,17 +315,18 @@ def lru_cache(func=None, *, maxsize=128, typed=False):
     return cached_func
 
 
-def uncache_all():
-    for instance, name in to_uncache:
-        try:
-            del instance.__dict__[name]
-        except KeyError:
-            pass
-
+def clear_lru_caches():
     for cached_func in lru_caches:
         cached_func.cache_clear()
 
 
+def uncache_all():
+    """Drops every cached value, in every codebase context."""
+    for registry in list(_registries):
+        registry.invalidate()
+    clear_lru_caches()
+
+
 def report():
     print(tabulate(counter.most_common(10)))
 
@@ -27,6 +27,9 @@ class CodebaseConfig(BaseConfig):
     ignore_process_errors: bool = True
     disable_graph: bool = False
     disable_file_parse: bool = False
+    parse_workers: int = 1
+    snapshot_dir: str | None = None
+    metrics_path: str | None = None
     exp_lazy_graph: bool = False
     generics: bool = True
     import_resolution_paths: list[str] = Field(default_factory=lambda: [])
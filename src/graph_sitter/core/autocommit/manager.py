@@ -16,6 +16,7 @@ from graph_sitter.core.autocommit.constants import (
 from graph_sitter.core.autocommit.utils import is_file, is_on_graph, is_symbol
 from graph_sitter.core.node_id_factory import NodeId
 from graph_sitter.compiled.autocommit import update_dict
+from graph_sitter.compiled.utils import copy_state
 
 if TYPE_CHECKING:
     from graph_sitter.codebase.codebase_context import CodebaseContext
@@ -108,7 +109,7 @@ class AutoCommit:
             new_node = self.ctx.get_node(
                 new_id if new_id is not None else symbol.file_node_id
             )
-            old_node.__dict__ = new_node.__dict__
+            copy_state(old_node, new_node)
             if not lock:
                 self._files[symbol.file_node_id] = new_id
 
@@ -28,6 +28,7 @@ from graph_sitter.codebase.codebase_ai import generate_system_prompt, generate_t
 from graph_sitter.codebase.codebase_context import (
     GLOBAL_FILE_IGNORE_LIST,
     CodebaseContext,
+    SyncType,
 )
 from graph_sitter.codebase.config import ProjectConfig, SessionOptions
 from graph_sitter.codebase.diff_lite import DiffLite
@@ -37,8 +38,8 @@ from graph_sitter.codebase.flagging.group import Group
 from graph_sitter.codebase.io.io import IO
 from graph_sitter.codebase.progress.progress import Progress
 from graph_sitter.codebase.span import Span
+from graph_sitter.codebase.watcher import DEFAULT_WATCH_DEBOUNCE, DEFAULT_WATCH_STEP, CodebaseWatcher
 from graph_sitter.compiled.sort import sort_editables
-from graph_sitter.compiled.utils import uncache_all
 from graph_sitter.configs.models.codebase import CodebaseConfig, PinkMode
 from graph_sitter.configs.models.secrets import SecretsConfig
 from graph_sitter.core.assignment import Assignment
@@ -272,8 +273,7 @@ class Codebase(
 
     @noapidoc
     def _symbols(self, symbol_type: SymbolType | None = None) -> list[TSymbol | TClass | TFunction | TGlobalVar]:
-        matches: list[Symbol] = self.ctx.get_nodes(NodeType.SYMBOL)
-        return [x for x in matches if x.is_top_level and (symbol_type is None or x.symbol_type == symbol_type)]
+        return self.ctx.get_symbol_nodes(symbol_type=symbol_type, top_level=True)
 
     # =====[ Node Types ]=====
     @overload
@@ -316,6 +316,7 @@ class Codebase(
             for filepath, _ in self._op.iter_files(
                 extensions=None if extensions == "*" else extensions,
                 ignore_list=GLOBAL_FILE_IGNORE_LIST,
+                skip_content=True,
             ):
                 files.append(self.get_file(filepath, optional=False))
         # Sort files alphabetically
@@ -503,9 +504,11 @@ class Codebase(
         else:
             # Create file as non-source file
             file = File.from_content(filepath, content, self.ctx, sync=False)
+            # Non-source files are written directly, without a diff to sync
+            self.ctx.sync_unparsed_files({file.path: SyncType.ADD})
 
         # This is to make sure we keep track of this file for diff purposes
-        uncache_all()
+        self.ctx.invalidate_caches([file.file_node_id])
         return file
 
     def create_directory(self, dir_path: str, exist_ok: bool = False, parents: bool = False) -> None:
@@ -639,7 +642,7 @@ class Codebase(
         Returns:
             bool: True if a symbol with the given name exists in the codebase, False otherwise.
         """
-        return any([x.name == symbol_name for x in self.symbols])
+        return len(self.ctx.get_symbol_nodes(name=symbol_name, top_level=True)) > 0
 
     def get_symbol(self, symbol_name: str, optional: bool = False) -> TSymbol | None:
         """Returns a Symbol by name from the codebase.
@@ -682,7 +685,7 @@ class Codebase(
         Note:
             When a unique symbol is required, use get_symbol() instead. It will raise ValueError if multiple symbols are found.
         """
-        return sort_editables(x for x in self.symbols if x.name == symbol_name)
+        return sort_editables(self.ctx.get_symbol_nodes(name=symbol_name, top_level=True))
 
     def get_class(self, class_name: str, optional: bool = False) -> TClass | None:
         """Returns a class that matches the given name.
@@ -697,7 +700,7 @@ class Codebase(
         Raises:
             ValueError: If the class is not found and optional=False, or if multiple classes with the same name exist.
         """
-        matches = [c for c in self.classes if c.name == class_name]
+        matches = sort_editables(self.ctx.get_symbol_nodes(name=class_name, symbol_type=SymbolType.Class, top_level=True), dedupe=False)
         if len(matches) == 0:
             if not optional:
                 msg = f"Class {class_name} not found in codebase. Use optional=True to return None instead."
@@ -726,7 +729,7 @@ class Codebase(
         Raises:
             ValueError: If function is not found and optional=False, or if multiple matching functions exist.
         """
-        matches = [f for f in self.functions if f.name == function_name]
+        matches = sort_editables(self.ctx.get_symbol_nodes(name=function_name, symbol_type=SymbolType.Function, top_level=True), dedupe=False)
         if len(matches) == 0:
             if not optional:
                 msg = f"Function {function_name} not found in codebase. Use optional=True to return None instead."
@@ -927,6 +930,21 @@ class Codebase(
         self.ctx.apply_diffs(diff_lites)
         self.ctx.save_commit(target_commit)
 
+    @noapidoc
+    def watch(self, step: int = DEFAULT_WATCH_STEP, debounce: int = DEFAULT_WATCH_DEBOUNCE) -> CodebaseWatcher:
+        """Keeps the codebase in sync with the files on disk until the returned watcher is stopped.
+
+        Args:
+            step: Milliseconds without a new filesystem event before a batch of changes is synced
+            debounce: Maximum milliseconds to keep extending a batch while events keep arriving
+
+        Returns:
+            The started watcher, which can also be used as a context manager to stop it
+        """
+        watcher = CodebaseWatcher(self.ctx, step=step, debounce=debounce)
+        watcher.start()
+        return watcher
+
     @noapidoc
     def get_diffs(self, base: str | None = None) -> list[Diff]:
         """Get all changed files."""
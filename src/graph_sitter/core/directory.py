@@ -1,4 +1,5 @@
 import os
+from bisect import bisect_left, insort
 from collections.abc import Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Generic, Literal, Self
@@ -47,8 +48,9 @@ class Directory(
     ctx: "CodebaseContext"
     path: Path  # Absolute Path
     dirpath: str  # Relative Path
-    _files: list[str]  # List of file names
-    _subdirectories: list[str]  # List of subdirectory names
+    _files: list[str]  # List of file names, sorted like files are (by stem)
+    _subdirectories: list[str]  # List of subdirectory names, sorted
+    _file_names_lower: dict[str, str]  # Lowercase file name -> file name, for case insensitive lookups
 
     def __init__(self, ctx: "CodebaseContext", path: Path, dirpath: str):
         self.ctx = ctx
@@ -56,6 +58,7 @@ class Directory(
         self.dirpath = dirpath
         self._files = []
         self._subdirectories = []
+        self._file_names_lower = {}
 
     def __iter__(self):
         return iter(self.items)
@@ -142,18 +145,18 @@ class Directory(
             extensions = self.ctx.extensions
 
         files = []
-        for file_name in self._files:
-            if extensions == "*":
-                files.append(self.get_file(file_name))
-            elif extensions is not None:
-                if any(file_name.endswith(ext) for ext in extensions):
-                    files.append(self.get_file(file_name))
+        for directory in self._walk() if recursive else (self,):
+            for file_name in directory._files:
+                if extensions == "*":
+                    files.append(directory.get_file(file_name))
+                elif extensions is not None:
+                    if any(file_name.endswith(ext) for ext in extensions):
+                        files.append(directory.get_file(file_name))
 
         if recursive:
-            for directory in self.subdirectories:
-                files.extend(directory.files(extensions=extensions, recursive=True))
-
-        return sort_editables(files, alphabetical=True, dedupe=False)
+            # Only the files of different directories need to be sorted, the file names of a directory are kept sorted
+            return sort_editables(files, alphabetical=True, dedupe=False)
+        return [file for file in files if file is not None]
 
     @proxy_property
     def subdirectories(self, recursive: bool = False) -> list[Self]:
@@ -164,15 +167,13 @@ class Directory(
         Returns:
             list[Directory]: A sorted list of subdirectories in the directory.
         """
-        subdirectories = []
-        for directory_name in self._subdirectories:
-            subdirectories.append(self.get_subdirectory(directory_name))
+        subdirectories = [self.get_subdirectory(directory_name) for directory_name in self._subdirectories]
 
         if recursive:
-            for directory in self.subdirectories:
-                subdirectories.extend(directory.subdirectories(recursive=True))
-
-        return sorted(subdirectories, key=lambda x: x.name)
+            for directory in list(subdirectories):
+                subdirectories.extend(directory._collect_subdirectories())
+            return sorted(subdirectories, key=lambda x: x.name)
+        return subdirectories
 
     @proxy_property
     def items(self, recursive: bool = False) -> list[Self | TFile]:
@@ -229,12 +230,13 @@ class Directory(
         file = self.ctx.get_file(file_path, ignore_case=ignore_case)
         if file is not None:
             return file
-        # If the file is not in the graph, check the filesystem
-        for file in absolute_path.parent.iterdir():
-            if ignore_case and str(absolute_path).lower() == str(file).lower():
-                return self.ctx._get_raw_file_from_path(file)
-            elif not ignore_case and str(absolute_path) == str(file):
-                return self.ctx._get_raw_file_from_path(file)
+        # If the file is not in the graph, check the directory tree
+        directory = self if not os.path.dirname(filename) else self.ctx.get_directory(absolute_path.parent, ignore_case=ignore_case)
+        if directory is not None and (file_name := directory._get_file_name(absolute_path.name, ignore_case=ignore_case)) is not None:
+            return self.ctx._get_raw_file_from_path(directory.path / file_name)
+        # Files left out of the tree (e.g. ignored files) are only found with their exact name
+        if not ignore_case and absolute_path.is_file():
+            return self.ctx._get_raw_file_from_path(absolute_path)
         return None
 
     def get_subdirectory(self, subdirectory_name: str) -> Self | None:
@@ -260,10 +262,58 @@ class Directory(
         new_path = os.path.join(parent_dir, new_name)
         self.update_filepath(new_path)
 
+    def _walk(self) -> Iterator[Self]:
+        """Yield the directory and its subdirectories recursively, depth first."""
+        yield self
+        for directory in self.subdirectories:
+            yield from directory._walk()
+
+    def _collect_subdirectories(self) -> list[Self]:
+        """Get the subdirectories followed by the subdirectories of each of them, in the order `subdirectories(recursive=True)` sorts."""
+        subdirectories = self.subdirectories
+        for directory in list(subdirectories):
+            subdirectories.extend(directory._collect_subdirectories())
+        return subdirectories
+
+    def _get_file_name(self, file_name: str, ignore_case: bool = False) -> str | None:
+        """Get the name of a file of the directory, matching case insensitively if `ignore_case` is set."""
+        if ignore_case:
+            return self._file_names_lower.get(file_name.lower(), None)
+        index = bisect_left(self._files, _file_sort_key(file_name), key=_file_sort_key)
+        if index < len(self._files) and self._files[index] == file_name:
+            return file_name
+        return None
+
     def _add_file(self, file_name: str) -> None:
         """Add a file to the directory."""
-        self._files.append(file_name)
+        if self._get_file_name(file_name) is not None:
+            return
+        insort(self._files, file_name, key=_file_sort_key)
+        self._file_names_lower.setdefault(file_name.lower(), file_name)
+
+    def _remove_file(self, file_name: str) -> None:
+        """Remove a file from the directory."""
+        if self._get_file_name(file_name) is None:
+            return
+        self._files.remove(file_name)
+        if self._file_names_lower.get(file_name.lower()) == file_name:
+            del self._file_names_lower[file_name.lower()]
+            # Another file may differ only by case
+            if other := next((name for name in self._files if name.lower() == file_name.lower()), None):
+                self._file_names_lower[file_name.lower()] = other
 
     def _add_subdirectory(self, subdirectory_name: str) -> None:
         """Add a subdirectory to the directory."""
-        self._subdirectories.append(subdirectory_name)
+        index = bisect_left(self._subdirectories, subdirectory_name)
+        if index == len(self._subdirectories) or self._subdirectories[index] != subdirectory_name:
+            self._subdirectories.insert(index, subdirectory_name)
+
+    def _remove_subdirectory(self, subdirectory_name: str) -> None:
+        """Remove a subdirectory from the directory."""
+        if subdirectory_name in self._subdirectories:
+            self._subdirectories.remove(subdirectory_name)
+
+
+def _file_sort_key(file_name: str) -> tuple[str, str]:
+    # Files are sorted by name, which is the stem of their path
+    return Path(file_name).stem, file_name
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Generic, Literal, Self, TypeVar, override
 
 from tree_sitter import Node as TSNode
+from tree_sitter import Tree
 from typing_extensions import deprecated
 
 from graph_sitter._proxy import proxy_property
@@ -33,7 +34,7 @@ from graph_sitter.enums import EdgeType, ImportType, NodeType, SymbolType
 from graph_sitter.shared.decorators.docs import apidoc, noapidoc
 from graph_sitter.shared.logging.get_logger import get_logger
 from graph_sitter.topological_sort import pseudo_topological_sort
-from graph_sitter.tree_sitter_parser import get_parser_by_filepath_or_extension, parse_file
+from graph_sitter.tree_sitter_parser import TreeEdit, copy_tree, get_parser_by_filepath_or_extension, is_parsed_from, parse_file, parse_tree
 from graph_sitter.typescript.function import TSFunction
 from graph_sitter.utils import is_minified_js
 from graph_sitter.visualizations.enums import VizNode
@@ -165,6 +166,11 @@ class File(Editable[None]):
     def write_bytes(self, content_bytes: bytes, to_disk: bool = False) -> None:
         self.write(content_bytes, to_disk=to_disk)
 
+    @noapidoc
+    def record_tree_edits(self, old_content: bytes, new_content: bytes, edits: list[TreeEdit]) -> None:
+        """Records the edits that turned `old_content` into `new_content`, so the next sync can reparse incrementally."""
+        pass  # Non-source files are not parsed
+
     @property
     @reader
     def directory(self) -> Directory | None:
@@ -427,10 +433,19 @@ class SourceFile(
 
     code_block: TCodeBlock
     _nodes: list[Importable]
-
-    def __init__(self, ts_node: TSNode, filepath: PathLike, ctx: CodebaseContext) -> None:
+    # The tree the file was last parsed into, kept around to reparse incrementally
+    _tree: Tree | None
+    # Edits made to the content of `_tree` since it was parsed, and the hash of the content they result in. Hashes are
+    # kept instead of the contents, which the tree and the IO already hold
+    _tree_edits: list[TreeEdit]
+    _edited_content_hash: int | None
+
+    def __init__(self, ts_node: TSNode, filepath: PathLike, ctx: CodebaseContext, tree: Tree | None = None) -> None:
         self.node_id = ctx.add_node(self)
         self._nodes = []
+        self._tree = tree
+        self._tree_edits = []
+        self._edited_content_hash = None
         super().__init__(filepath, ctx, ts_node=ts_node)
         self._nodes.clear()
         self.ctx.filepath_idx[self.file_path] = self.node_id
@@ -514,12 +529,52 @@ class SourceFile(
         self._nodes.clear()
         return list(filter(lambda node: self.ctx.has_node(node.node_id) and node is not None, external_edges_to_resolve))
 
+    @noapidoc
+    @override
+    def record_tree_edits(self, old_content: bytes, new_content: bytes, edits: list[TreeEdit]) -> None:
+        if self._tree_edits:
+            matches = self._edited_content_hash == hash(old_content)
+        else:
+            matches = self._tree is not None and is_parsed_from(self._tree, old_content)
+        if not matches:
+            # The content was changed some other way, the edits can't be applied to the tree anymore
+            self._tree_edits = []
+            self._edited_content_hash = None
+            return
+        self._tree_edits.extend(edits)
+        self._edited_content_hash = hash(new_content)
+
+    @noapidoc
+    def _reparse_tree(self) -> Tree:
+        """Parses the current content of the file, reusing the previous tree where possible.
+
+        The previous tree is edited with the recorded transaction edits (or a single edit covering the changed bytes if
+        the content changed some other way) so tree-sitter only needs to reparse the modified regions. The editables
+        are still rebuilt for the whole file.
+        """
+        content_bytes = self.content_bytes
+        old_tree = None
+        if self._tree is not None:
+            if self._tree_edits and self._edited_content_hash == hash(content_bytes):
+                edits = self._tree_edits
+            else:
+                edits = [TreeEdit.from_tree(self._tree, content_bytes)]
+            # Editing a tree in place invalidates the nodes still referencing it, so edit a copy instead
+            old_tree = copy_tree(self.filepath, self._tree)
+            for edit in edits:
+                old_tree.edit(*edit)
+        tree = parse_tree(self.filepath, content_bytes, old_tree=old_tree)
+        self._tree = tree
+        self._tree_edits = []
+        self._edited_content_hash = None
+        return tree
+
     @noapidoc
     @commiter
     def sync_with_file_content(self) -> None:
         """Re-parses parent file and re-sets current TSNode."""
         self._pending_imports.clear()
-        self.ts_node = parse_file(self.filepath, self.content)
+        self.ts_node = self._reparse_tree().root_node
         if self.node_id is None:
             self.ctx.filepath_idx[self.file_path] = self.node_id
             self.file_node_id = self.node_id
@@ -563,16 +618,21 @@ class SourceFile(
 
     @classmethod
     @noapidoc
-    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True) -> Self | None:
-        """Creates a new file from content and adds it to the graph."""
+    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True, tree: Tree | None = None) -> Self | None:
+        """Creates a new file from content and adds it to the graph.
+
+        If `tree` is provided, the content is assumed to have already been checked and parsed into it (e.g. by a parse worker).
+        """
         path = ctx.to_absolute(filepath)
 
-        # Sanity check to ensure file is not a minified file
-        if is_minified_js(content):
-            logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
-            return None
+        if tree is None:
+            # Sanity check to ensure file is not a minified file
+            if is_minified_js(content):
+                logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
+                return None
 
-        ts_node = parse_file(path, content)
+            tree = parse_tree(path, content)
+        ts_node = tree.root_node
         if ts_node.has_error and verify_syntax:
             logger.info("Failed to parse file %s", filepath)
             return None
@@ -588,7 +648,7 @@ class SourceFile(
             ctx.add_single_file(path)
             return ctx.get_file(filepath)
         else:
-            return cls(ts_node, Path(filepath), ctx)
+            return cls(ts_node, Path(filepath), ctx, tree=tree)
 
     @classmethod
     @noapidoc
@@ -767,8 +827,8 @@ class SourceFile(
         ids = [x.node_id for x in self.symbols]
         # Create a subgraph based on G
         subgraph = self.ctx.build_subgraph(ids)
-        symbol_names = pseudo_topological_sort(subgraph)
-        return [subgraph.get_node_data(x) for x in symbol_names]
+        symbol_ids = pseudo_topological_sort(subgraph, stable=True)
+        return [subgraph.get_node_data(x) for x in symbol_ids]
 
     @property
     @reader(cache=False)
@@ -1182,9 +1242,9 @@ class SourceFile(
             range (Range): The byte range to search within the file.
 
         Returns:
-            list[Editable]: A list of all Editable objects that overlap with the given range.
+            list[Editable]: A list of all Editable objects that overlap with the given range, ordered by start byte.
         """
-        return self._range_index.get_all_for_range(range)
+        return self._range_index.get_overlapping(range.start_byte, range.end_byte)
 
     @property
     @noapidoc
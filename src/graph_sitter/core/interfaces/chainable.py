@@ -3,7 +3,7 @@ from collections.abc import Generator
 from typing import TYPE_CHECKING, Generic, Self, TypeVar
 
 from graph_sitter.codebase.resolution_stack import ResolutionStack
-from graph_sitter.compiled.utils import cached_property
+from graph_sitter.compiled.utils import cache_slots, cached_property
 from graph_sitter.core.interfaces.editable import Editable
 from graph_sitter.shared.decorators.docs import noapidoc
 
@@ -17,6 +17,8 @@ Parent = TypeVar("Parent", bound="Editable")
 class Chainable(Editable[Parent], Generic[Parent]):
     """Represents a class that can be used as an object in a function call chain."""
 
+    __slots__ = cache_slots("resolved_type_frames", "resolved_types")
+
     _resolving: bool = False
 
     @abstractmethod
@@ -30,9 +32,8 @@ class Chainable(Editable[Parent], Generic[Parent]):
             return [ResolutionStack(self)]  # Break cycles
         self._resolving = True
         try:
-            ret = list(self._resolved_types())
-            self.__dict__.pop("resolved_type_frames", None)
-            return ret
+            # Replaces the value cached by the accesses that broke cycles
+            return list(self._resolved_types())
         finally:
             self._resolving = False
 
@@ -111,18 +111,28 @@ class Editable(JSONable, Generic[Parent]):
         node_type: The type of node this Editable instance represents.
     """
 
+    # Every node has these, so they are kept in slots rather than in the instance __dict__ (which subclasses still have)
+    __slots__ = ("_file", "_hash", "_indexed", "ctx", "file_node_id", "parent", "ts_node")
+
     ts_node: TSNode
     file_node_id: NodeId
     ctx: CodebaseContext
     parent: Parent
     node_type: NodeType
-    _hash: int | None = None
+    # Caches of __hash__ and file
+    _hash: int | None
+    _file: SourceFile | None
+    # Whether the node was added to the range index of its file
+    _indexed: bool
 
     def __init__(self, ts_node: TSNode, file_node_id: NodeId, ctx: CodebaseContext, parent: Parent) -> None:
         self.ts_node = ts_node
         self.file_node_id = file_node_id
         self.ctx = ctx
         self.parent = parent
+        self._hash = None
+        self._file = None
+        self._indexed = False
         if ctx.config.debug:
             seen = set()
             while parent is not None:
@@ -130,7 +140,7 @@ class Editable(JSONable, Generic[Parent]):
                 seen.add((parent.ts_node, parent.__class__))
                 parent = parent.parent
         if self.ctx.config.full_range_index and self.file:
-            self._add_to_index
+            self._add_to_index()
 
     def __hash__(self):
         if self._hash is None:
@@ -369,7 +379,7 @@ class Editable(JSONable, Generic[Parent]):
 
         return self.parent._parse_expression(previous_named_sibling_node)
 
-    @cached_property
+    @property
     def file(self) -> SourceFile:
         """The file object that this Editable instance belongs to.
 
@@ -378,7 +388,9 @@ class Editable(JSONable, Generic[Parent]):
         Returns:
             File: The File object containing this Editable instance.
         """
-        return self.ctx.get_node(self.file_node_id)
+        if self._file is None:
+            self._file = self.ctx.get_node(self.file_node_id)
+        return self._file
 
     @property
     def filepath(self) -> str:
@@ -1071,10 +1083,11 @@ class Editable(JSONable, Generic[Parent]):
             dest = dest.parent
         return dest
 
-    @cached_property
     @noapidoc
     def _add_to_index(self) -> None:
-        self.file._range_index.add_to_range(self)
+        if not self._indexed:
+            self.file._range_index.add_to_range(self)
+            self._indexed = True
 
     @noapidoc
     def _smart_remove(self, child, *args, **kwargs) -> bool:
@@ -58,22 +58,15 @@ class Importable(Expression[Parent], HasName, Generic[Parent]):
         Note:
             This method can be called as both a property or a method. If used as a property, it is equivalent to invoking it without arguments.
         """
-        # Get direct dependencies for this symbol and its descendants
-        avoid = set(self.descendant_symbols)
-        deps = []
-        for symbol in self.descendant_symbols:
-            deps.extend(filter(lambda x: x not in avoid, symbol._get_dependencies(usage_types)))
-
         if max_depth is not None and max_depth > 1:
-            # For max_depth > 1, recursively collect dependencies
-            seen = set(deps)
-            for dep in list(deps):  # Create a copy of deps to iterate over
-                if isinstance(dep, Importable):
-                    next_deps = dep.dependencies(usage_types=usage_types, max_depth=max_depth - 1)
-                    for next_dep in next_deps:
-                        if next_dep not in seen:
-                            seen.add(next_dep)
-                            deps.append(next_dep)
+            # Deeper dependencies are collected by a breadth-first walk shared with other queries
+            deps = self.ctx.traversal.dependencies(self, usage_types=usage_types, max_depth=max_depth)
+        else:
+            # Get direct dependencies for this symbol and its descendants
+            avoid = set(self.descendant_symbols)
+            deps = []
+            for symbol in self.descendant_symbols:
+                deps.extend(filter(lambda x: x not in avoid, symbol._get_dependencies(usage_types)))
 
         return sort_editables(deps, by_file=True)
 
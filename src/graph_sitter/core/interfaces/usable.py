@@ -24,11 +24,13 @@ class Usable(Importable[Parent], Generic[Parent]):
 
     @proxy_property
     @reader(cache=False)
-    def symbol_usages(self, usage_types: UsageType | None = None) -> list[Import | Symbol | Export]:
+    def symbol_usages(self, usage_types: UsageType | None = None, max_depth: int | None = None) -> list[Import | Symbol | Export]:
         """Returns a list of symbols that use or import the exportable object.
 
         Args:
             usage_types (UsageType | None): The types of usages to search for. Defaults to any.
+            max_depth (int | None): Maximum depth to traverse in the usage graph. If provided, will also collect the symbols
+                that use those symbols, up to this depth, in breadth-first order. Defaults to None (only direct usages).
 
         Returns:
             list[Import | Symbol | Export]: A list of symbols that use or import the exportable object.
@@ -36,6 +38,8 @@ class Usable(Importable[Parent], Generic[Parent]):
         Note:
             This method can be called as both a property or a method. If used as a property, it is equivalent to invoking it without arguments.
         """
+        if max_depth is not None and max_depth > 1:
+            return self.ctx.traversal.usages(self, usage_types=usage_types, max_depth=max_depth)
         symbol_usages = []
         for usage in self.usages(usage_types=usage_types):
             symbol_usages.append(usage.usage_symbol.parent_symbol)
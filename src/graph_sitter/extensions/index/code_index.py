@@ -7,6 +7,7 @@ from typing import TypeVar
 import numpy as np
 
 from graph_sitter.core.codebase import Codebase
+from graph_sitter.extensions.index.embedding_store import EmbeddingStore
 
 T = TypeVar("T")  # Type of the items being indexed (e.g., File, Symbol)
 
@@ -20,12 +21,13 @@ class CodeIndex(ABC):
 
     Attributes:
         codebase (Codebase): The codebase being indexed
-        E (Optional[np.ndarray]): The embeddings matrix
-        items (Optional[np.ndarray]): Array of items corresponding to embeddings
+        store (Optional[EmbeddingStore]): The normalized embeddings, keyed by item identifier
         commit_hash (Optional[str]): Git commit hash when index was last updated
     """
 
     DEFAULT_SAVE_DIR = ".codegen"
+    # Storage type of the embeddings, float16 halves the size of the index
+    EMBEDDING_DTYPE = np.float32
 
     def __init__(self, codebase: Codebase):
         """Initialize the code index.
@@ -34,14 +36,27 @@ class CodeIndex(ABC):
             codebase: The codebase to index
         """
         self.codebase = codebase
-        self.E: np.ndarray | None = None
-        self.items: np.ndarray | None = None
+        self.store: EmbeddingStore | None = None
         self.commit_hash: str | None = None
 
+    @property
+    def E(self) -> np.ndarray | None:
+        """The normalized embeddings matrix."""
+        if self.store is None:
+            return None
+        return self.store.vectors
+
+    @property
+    def items(self) -> np.ndarray | None:
+        """Array of item identifiers corresponding to the rows of `E`."""
+        if self.store is None:
+            return None
+        return np.array(self.store.ids, dtype=str)
+
     @property
     @abstractmethod
     def save_file_name(self) -> str:
-        """The filename template for saving the index."""
+        """The directory name template for saving the index."""
         pass
 
     @abstractmethod
@@ -97,11 +112,11 @@ class CodeIndex(ABC):
         """Create embeddings for all indexed items."""
         self.commit_hash = self._get_current_commit()
 
+        self.store = EmbeddingStore(dtype=self.EMBEDDING_DTYPE)
+
         # Get items and their content
         items_with_content = self._get_items_to_index()
         if not items_with_content:
-            self.E = np.array([])
-            self.items = np.array([])
             return
 
         # Split into separate lists
@@ -111,12 +126,11 @@ class CodeIndex(ABC):
         embeddings = self._get_embeddings(contents)
 
         # Store embeddings and item identifiers
-        self.E = np.array(embeddings)
-        self.items = np.array([str(item) for item in items])  # Store string identifiers
+        self.store.upsert([str(item) for item in items], embeddings)
 
     def update(self) -> None:
         """Update embeddings for changed items only."""
-        if self.E is None or self.items is None or self.commit_hash is None:
+        if self.store is None or self.commit_hash is None:
             msg = "No index to update. Call create() or load() first."
             raise ValueError(msg)
 
@@ -134,26 +148,15 @@ class CodeIndex(ABC):
         items, contents = zip(*items_with_content)
         new_embeddings = self._get_embeddings(contents)
 
-        # Create mapping of items to their indices
-        item_to_idx = {str(item): idx for idx, item in enumerate(self.items)}
-
-        # Update embeddings
-        for item, embedding in zip(items, new_embeddings):
-            item_key = str(item)
-            if item_key in item_to_idx:
-                # Update existing embedding
-                self.E[item_to_idx[item_key]] = embedding
-            else:
-                # Add new embedding
-                self.E = np.vstack([self.E, embedding])
-                self.items = np.append(self.items, item)
+        # Overwrite existing embeddings in place and append new ones
+        self.store.upsert([str(item) for item in items], new_embeddings)
 
         # Update commit hash
         self.commit_hash = self._get_current_commit()
 
     def save(self, save_path: str | None = None) -> None:
         """Save the index to disk."""
-        if self.E is None or self.items is None:
+        if self.store is None:
             msg = "No embeddings to save. Call create() first."
             raise ValueError(msg)
 
@@ -172,15 +175,15 @@ class CodeIndex(ABC):
 
         self._load_index(load_path)
 
-    @abstractmethod
     def _save_index(self, path: Path) -> None:
         """Save index data to disk."""
-        pass
+        self.store.metadata["commit_hash"] = self.commit_hash
+        self.store.save(path)
 
-    @abstractmethod
     def _load_index(self, path: Path) -> None:
         """Load index data from disk."""
-        pass
+        self.store = EmbeddingStore.load(path)
+        self.commit_hash = self.store.metadata.get("commit_hash")
 
     def _similarity_search_raw(self, query: str, k: int = 5) -> list[tuple[str, float]]:
         """Internal method to find the k most similar items by their string identifiers.
@@ -192,24 +195,25 @@ class CodeIndex(ABC):
         Returns:
             List of tuples (item_identifier, similarity_score) sorted by similarity
         """
-        if self.E is None or self.items is None:
-            msg = "No embeddings available. Call create() or load() first."
-            raise ValueError(msg)
+        return self._similarity_search_raw_batch([query], k)[0]
 
-        # Get query embedding
-        query_embeddings = self._get_embeddings([query])
-        query_embedding = query_embeddings[0]
+    def _similarity_search_raw_batch(self, queries: list[str], k: int = 5) -> list[list[tuple[str, float]]]:
+        """Internal method to find the k most similar items to each of several queries at once.
 
-        # Compute cosine similarity
-        query_norm = query_embedding / np.linalg.norm(query_embedding)
-        E_norm = self.E / np.linalg.norm(self.E, axis=1)[:, np.newaxis]
-        similarities = np.dot(E_norm, query_norm)
+        Args:
+            queries: The texts to search for
+            k: Number of results to return per query
 
-        # Get top k indices
-        top_indices = np.argsort(similarities)[-k:][::-1]
+        Returns:
+            For each query, a list of tuples (item_identifier, similarity_score) sorted by similarity
+        """
+        if self.store is None:
+            msg = "No embeddings available. Call create() or load() first."
+            raise ValueError(msg)
 
-        # Return items and similarity scores
-        return [(str(self.items[idx]), float(similarities[idx])) for idx in top_indices]
+        # Embed all queries in one request and score them in a single pass over the store
+        query_embeddings = self._get_embeddings(queries)
+        return self.store.search(query_embeddings, k)
 
     @abstractmethod
     def similarity_search(self, query: str, k: int = 5) -> list[tuple[T, float]]:
@@ -0,0 +1,225 @@
+"""Columnar on-disk storage for code index embeddings."""
+
+import json
+import os
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+
+from graph_sitter.shared.logging.get_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scales each row to unit length, leaving all-zero rows as is."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class EmbeddingStore:
+    """Unit-normalized embeddings keyed by item id.
+
+    Vectors are kept in a single over-allocated matrix so appends are amortized O(1) per row, replaced items are
+    overwritten in place and deleted items are tombstoned instead of shifting the rows behind them. On disk the store
+    is a directory with the vectors as a `.npy` file (memory mapped on load, so only the rows that are touched are
+    read), the item id table as JSON and a small metadata file.
+
+    Since the vectors are normalized on insert, cosine similarity is a plain dot product and `search` never has to
+    re-normalize the whole matrix.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    IDS_FILE = "ids.json"
+    METADATA_FILE = "metadata.json"
+    # Rows scored at once, bounds the memory used by a search independently of the size of the store
+    ROW_BATCH_SIZE = 65536
+    # Queries scored at once
+    QUERY_BATCH_SIZE = 64
+
+    dtype: np.dtype
+    metadata: dict
+    _vectors: np.ndarray
+    _alive: npt.NDArray[np.bool_]
+    _ids: list[str]
+    _id_to_row: dict[str, int]
+    _size: int
+
+    def __init__(self, dtype: npt.DTypeLike = np.float32) -> None:
+        """Creates an empty store.
+
+        Args:
+            dtype: Storage type of the vectors, float16 halves the size of the store at a small loss of precision.
+                Scores are always computed in float32.
+        """
+        self.dtype = np.dtype(dtype)
+        self.metadata = {}
+        self._vectors = np.empty((0, 0), dtype=self.dtype)
+        self._alive = np.zeros(0, dtype=np.bool_)
+        self._ids = []
+        self._id_to_row = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._id_to_row)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._id_to_row
+
+    @property
+    def dim(self) -> int:
+        """Number of dimensions of the vectors, 0 while the store is empty."""
+        return self._vectors.shape[1]
+
+    @property
+    def ids(self) -> list[str]:
+        """The ids of the live items, in row order."""
+        if len(self) == self._size:
+            return list(self._ids)
+        return [self._ids[row] for row in np.flatnonzero(self._alive[: self._size])]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The normalized vectors of the live items, in the same order as `ids`."""
+        if len(self) == self._size:
+            return self._vectors[: self._size]
+        return self._vectors[: self._size][self._alive[: self._size]]
+
+    @property
+    def tombstones(self) -> int:
+        """Number of rows held by deleted items, reclaimed by `compact` or `save`."""
+        return self._size - len(self)
+
+    def _reserve(self, count: int, dim: int) -> None:
+        """Makes room for `count` more rows, growing the matrix geometrically."""
+        if self._size == 0 and self.dim != dim:
+            self._vectors = np.empty((0, dim), dtype=self.dtype)
+        elif self.dim != dim:
+            msg = f"Expected embeddings with {self.dim} dimensions, got {dim}"
+            raise ValueError(msg)
+        capacity = len(self._vectors)
+        if self._size + count <= capacity:
+            return
+        capacity = max(self._size + count, 2 * capacity, 16)
+        vectors = np.empty((capacity, dim), dtype=self.dtype)
+        vectors[: self._size] = self._vectors[: self._size]
+        alive = np.zeros(capacity, dtype=np.bool_)
+        alive[: self._size] = self._alive[: self._size]
+        self._vectors, self._alive = vectors, alive
+
+    def upsert(self, ids: Sequence[str], embeddings: npt.ArrayLike) -> None:
+        """Inserts or replaces the embeddings of the given items.
+
+        Existing items are overwritten in place, new items are appended.
+        """
+        if len(ids) == 0:
+            return
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        new_ids = [item_id for item_id in dict.fromkeys(ids) if item_id not in self._id_to_row]
+        self._reserve(len(new_ids), vectors.shape[1])
+        for row, item_id in enumerate(new_ids, start=self._size):
+            self._id_to_row[item_id] = row
+            self._ids.append(item_id)
+        self._alive[self._size : self._size + len(new_ids)] = True
+        self._size += len(new_ids)
+        rows = np.fromiter((self._id_to_row[item_id] for item_id in ids), dtype=np.intp, count=len(ids))
+        self._vectors[rows] = vectors
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """Tombstones the given items, ignoring ids that are not in the store."""
+        rows = [self._id_to_row.pop(item_id) for item_id in ids if item_id in self._id_to_row]
+        self._alive[rows] = False
+
+    def compact(self) -> None:
+        """Drops the rows held by tombstones."""
+        if self.tombstones == 0:
+            return
+        ids, vectors = self.ids, self.vectors
+        self._vectors = np.array(vectors, dtype=self.dtype)
+        self._alive = np.ones(len(ids), dtype=np.bool_)
+        self._ids = ids
+        self._id_to_row = {item_id: row for row, item_id in enumerate(ids)}
+        self._size = len(ids)
+
+    def search(self, queries: npt.ArrayLike, k: int = 5) -> list[list[tuple[str, float]]]:
+        """Finds the k items most similar to each query.
+
+        The store is scanned once per batch of queries, keeping a running top k per query with `argpartition`, so a
+        search is linear in the size of the store and never sorts more than k candidates.
+
+        Args:
+            queries: A single query embedding or a matrix of them, one per row
+            k: Number of results per query
+
+        Returns:
+            For each query, a list of (item_id, cosine_similarity) sorted by decreasing similarity
+        """
+        queries = _normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        k = min(k, len(self))
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        results = []
+        for start in range(0, len(queries), self.QUERY_BATCH_SIZE):
+            scores, rows = self._top_k(queries[start : start + self.QUERY_BATCH_SIZE], k)
+            order = np.argsort(-scores, axis=1, kind="stable")
+            scores, rows = np.take_along_axis(scores, order, axis=1), np.take_along_axis(rows, order, axis=1)
+            results.extend([(self._ids[row], float(score)) for row, score in zip(query_rows, query_scores)] for query_rows, query_scores in zip(rows, scores))
+        return results
+
+    def _top_k(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the scores and rows of the (unordered) k best live rows for each query."""
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.intp)
+        for start in range(0, self._size, self.ROW_BATCH_SIZE):
+            end = min(start + self.ROW_BATCH_SIZE, self._size)
+            scores = queries @ np.asarray(self._vectors[start:end], dtype=np.float32).T
+            scores[:, ~self._alive[start:end]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, end, dtype=np.intp), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores, rows = np.take_along_axis(scores, top, axis=1), np.take_along_axis(rows, top, axis=1)
+            best_scores, best_rows = scores, rows
+        return best_scores, best_rows
+
+    def save(self, path: Path) -> None:
+        """Writes the live items to the directory at `path`."""
+        path.mkdir(parents=True, exist_ok=True)
+        # The vectors may be memory mapped from the file being replaced, so they are written to a new file first
+        with tempfile.NamedTemporaryFile(dir=path, suffix=".npy", delete=False) as f:
+            try:
+                np.save(f, np.ascontiguousarray(self.vectors))
+            except BaseException:
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, path / self.VECTORS_FILE)
+        (path / self.IDS_FILE).write_text(json.dumps(self.ids))
+        (path / self.METADATA_FILE).write_text(json.dumps(self.metadata))
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> Self:
+        """Reads a store written by `save`.
+
+        Args:
+            mmap: Memory map the vectors instead of reading them into memory. Replacing items only changes the mapped
+                pages in memory, appending copies the vectors into memory once.
+        """
+        vectors = np.load(path / cls.VECTORS_FILE, mmap_mode="c" if mmap else None)
+        ids = json.loads((path / cls.IDS_FILE).read_text())
+        if len(ids) != len(vectors):
+            msg = f"Index at {path} has {len(ids)} ids but {len(vectors)} vectors"
+            raise ValueError(msg)
+        store = cls(dtype=vectors.dtype)
+        store.metadata = json.loads((path / cls.METADATA_FILE).read_text())
+        store._vectors = vectors
+        store._alive = np.ones(len(ids), dtype=np.bool_)
+        store._ids = ids
+        store._id_to_row = {item_id: row for row, item_id in enumerate(ids)}
+        store._size = len(ids)
+        logger.info(f"Loaded {len(ids)} embeddings from {path}")
+        return store
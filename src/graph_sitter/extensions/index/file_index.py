@@ -1,6 +1,5 @@
 """File-level semantic code search index."""
 
-import pickle
 from pathlib import Path
 
 import modal
@@ -12,6 +11,7 @@ from tqdm import tqdm
 from graph_sitter.core.codebase import Codebase
 from graph_sitter.core.file import File
 from graph_sitter.extensions.index.code_index import CodeIndex
+from graph_sitter.extensions.index.embedding_store import EmbeddingStore
 from graph_sitter.shared.logging.get_logger import get_logger
 
 logger = get_logger(__name__)
@@ -50,11 +50,11 @@ class FileIndex(CodeIndex):
 
     @property
     def save_file_name(self) -> str:
-        return "file_index_{commit}.pkl"
+        return "file_index_{commit}"
 
     @property
     def modal_dict_id(self) -> str:
-        """Get the Modal Dict ID based on the same naming convention as the pickle file."""
+        """Get the Modal Dict ID based on the same naming convention as the local index."""
         if not self.commit_hash:
             return "file_index_latest"
         return f"file_index_{self.commit_hash}"
@@ -215,9 +215,8 @@ class FileIndex(CodeIndex):
 
     def _save_index(self, path: Path) -> None:
         """Save index data to disk and optionally to Modal Dict."""
-        # Save to local pickle file
-        with open(path, "wb") as f:
-            pickle.dump({"E": self.E, "items": self.items, "commit_hash": self.commit_hash}, f)
+        # Save to local directory
+        super()._save_index(path)
 
         # Save to Modal Dict if enabled
         if self.USE_MODAL_DICT:
@@ -252,9 +251,10 @@ class FileIndex(CodeIndex):
                     if "index_data" in modal_dict:
                         data = modal_dict["index_data"]
 
-                        # Convert lists back to numpy arrays
-                        self.E = np.array(data["E"]) if data["E"] is not None else None
-                        self.items = np.array(data["items"]) if data["items"] is not None else None
+                        # Convert lists back to an embedding store
+                        self.store = EmbeddingStore(dtype=self.EMBEDDING_DTYPE)
+                        if data["E"] is not None and data["items"] is not None:
+                            self.store.upsert(data["items"], np.array(data["E"]))
                         self.commit_hash = data["commit_hash"]
 
                         logger.info(f"Successfully loaded index from Modal Dict: {dict_id}")
@@ -266,16 +266,12 @@ class FileIndex(CodeIndex):
             except Exception as e:
                 logger.warning(f"Failed to load index from Modal Dict, falling back to local file: {e}")
 
-        # Fall back to loading from local file
+        # Fall back to loading from local directory
         try:
-            with open(path, "rb") as f:
-                data = pickle.load(f)
-                self.E = data["E"]
-                self.items = data["items"]
-                self.commit_hash = data["commit_hash"]
-                logger.info(f"Loaded index from local file: {path}")
+            super()._load_index(path)
+            logger.info(f"Loaded index from local directory: {path}")
         except Exception as e:
-            logger.exception(f"Failed to load index from local file: {e}")
+            logger.exception(f"Failed to load index from local directory: {e}")
             raise
 
     def similarity_search(self, query: str, k: int = 5) -> list[tuple[File, float]]:
@@ -302,7 +298,7 @@ class FileIndex(CodeIndex):
 
     def update(self) -> None:
         """Update embeddings for changed files only."""
-        if self.E is None or self.items is None or self.commit_hash is None:
+        if self.store is None or self.commit_hash is None:
             msg = "No index to update. Call create() or load() first."
             raise ValueError(msg)
 
@@ -317,6 +313,12 @@ class FileIndex(CodeIndex):
         # Get content for changed files only
         items_with_content = self._get_items_to_index_for_files(list(changed_files))
 
+        # Drop chunks of changed files that no longer exist, e.g. when a file shrank below the chunking threshold
+        changed_paths = {file.filepath for file in changed_files}
+        new_ids = {str(item) for item, _ in items_with_content}
+        stale_ids = [item_id for item_id in self.store.ids if item_id.split("#")[0] in changed_paths and item_id not in new_ids]
+        self.store.delete(stale_ids)
+
         if not items_with_content:
             logger.info("No valid content found in changed files")
             return
@@ -325,25 +327,13 @@ class FileIndex(CodeIndex):
         logger.info(f"Processing {len(contents)} chunks from changed files")
         new_embeddings = self._get_embeddings(contents)
 
-        # Create mapping of items to their indices
-        item_to_idx = {str(item): idx for idx, item in enumerate(self.items)}
-
-        # Update embeddings
-        num_updated = 0
-        num_added = 0
-        for item, embedding in zip(items, new_embeddings):
-            item_key = str(item)
-            if item_key in item_to_idx:
-                # Update existing embedding
-                self.E[item_to_idx[item_key]] = embedding
-                num_updated += 1
-            else:
-                # Add new embedding
-                self.E = np.vstack([self.E, embedding])
-                self.items = np.append(self.items, item)
-                num_added += 1
+        # Overwrite existing embeddings in place and append new ones
+        item_ids = [str(item) for item in items]
+        num_updated = sum(item_id in self.store for item_id in item_ids)
+        num_added = len(item_ids) - num_updated
+        self.store.upsert(item_ids, new_embeddings)
 
-        logger.info(f"Updated {num_updated} existing embeddings and added {num_added} new embeddings")
+        logger.info(f"Updated {num_updated} existing embeddings, added {num_added} new embeddings and removed {len(stale_ids)} stale embeddings")
 
         # Update commit hash
         self.commit_hash = self._get_current_commit()
@@ -1,8 +1,5 @@
 """Symbol-level semantic code search index."""
 
-import pickle
-from pathlib import Path
-
 import tiktoken
 from openai import OpenAI
 from tqdm import tqdm
@@ -36,7 +33,7 @@ class SymbolIndex(CodeIndex):
 
     @property
     def save_file_name(self) -> str:
-        return "symbol_index_{commit}.pkl"
+        return "symbol_index_{commit}"
 
     def _batch_texts_by_tokens(self, texts: list[str]) -> list[list[str]]:
         """Batch texts to maximize tokens per API call while respecting limits.
@@ -131,19 +128,6 @@ class SymbolIndex(CodeIndex):
         logger.info(f"Found {len(changed_symbols)} changed symbols")
         return changed_symbols
 
-    def _save_index(self, path: Path) -> None:
-        """Save index data to disk."""
-        with open(path, "wb") as f:
-            pickle.dump({"E": self.E, "items": self.items, "commit_hash": self.commit_hash}, f)
-
-    def _load_index(self, path: Path) -> None:
-        """Load index data from disk."""
-        with open(path, "rb") as f:
-            data = pickle.load(f)
-            self.E = data["E"]
-            self.items = data["items"]
-            self.commit_hash = data["commit_hash"]
-
     def similarity_search(self, query: str, k: int = 5) -> list[tuple[Symbol, float]]:
         """Find the k most similar symbols to a query."""
         results = []
@@ -1,4 +1,6 @@
+import asyncio
 import uuid
+from collections.abc import Callable
 
 from lsprotocol import types
 from lsprotocol.types import ProgressToken
@@ -9,13 +11,41 @@ from graph_sitter.codebase.progress.stub_task import StubTask
 from graph_sitter.codebase.progress.task import Task
 
 
+def call_in_loop(loop: asyncio.AbstractEventLoop | None, callback: Callable, *args) -> None:
+    """Calls `callback` on the event loop's thread, since pygls is not thread safe.
+
+    Calls made from other threads are queued in order and return without waiting for the loop.
+    """
+    if loop is None or loop.is_closed():
+        callback(*args)
+        return
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        callback(*args)
+    else:
+        loop.call_soon_threadsafe(callback, *args)
+
+
 class LSPTask(Task):
     count: int | None
+    loop: asyncio.AbstractEventLoop | None
 
-    def __init__(self, server: LanguageServer, message: str, token: ProgressToken, count: int | None = None, create_token: bool = True) -> None:
+    def __init__(
+        self,
+        server: LanguageServer,
+        message: str,
+        token: ProgressToken,
+        count: int | None = None,
+        create_token: bool = True,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ) -> None:
         self.token = token
+        self.loop = loop
         if create_token:
-            server.work_done_progress.begin(self.token, types.WorkDoneProgressBegin(title=message))
+            call_in_loop(self.loop, server.work_done_progress.begin, self.token, types.WorkDoneProgressBegin(title=message))
         self.server = server
         self.message = message
         self.count = count
@@ -26,19 +56,25 @@ class LSPTask(Task):
             percent = int(count * 100 / self.count)
         else:
             percent = None
-        self.server.work_done_progress.report(self.token, types.WorkDoneProgressReport(message=message, percentage=percent))
+        call_in_loop(self.loop, self.server.work_done_progress.report, self.token, types.WorkDoneProgressReport(message=message, percentage=percent))
 
     def end(self) -> None:
         if self.create_token:
-            self.server.work_done_progress.end(self.token, value=types.WorkDoneProgressEnd())
+            call_in_loop(self.loop, self.server.work_done_progress.end, self.token, types.WorkDoneProgressEnd())
 
 
 class LSPProgress(Progress[LSPTask | StubTask]):
     initialized = False
+    loop: asyncio.AbstractEventLoop | None
 
     def __init__(self, server: LanguageServer, initial_token: ProgressToken | None = None):
         self.server = server
         self.initial_token = initial_token
+        # The loop the server runs on, tasks begun from other threads send their notifications through it
+        try:
+            self.loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
         if initial_token is not None:
             self.server.work_done_progress.begin(initial_token, types.WorkDoneProgressBegin(title="Parsing codebase..."))
 
@@ -54,6 +90,15 @@ class LSPProgress(Progress[LSPTask | StubTask]):
             return LSPTask(self.server, message, token, count, create_token=False)
         return self.begin_with_token(message, self.initial_token, count=None, create_token=False)
 
+    def begin_nowait(self, message: str, count: int | None = None) -> LSPTask:
+        """Begins a server initiated task without waiting for the client to acknowledge its token.
+
+        Unlike `begin`, this is safe to call from other threads, e.g. during a graph sync.
+        """
+        token = str(uuid.uuid4())
+        call_in_loop(self.loop, self.server.work_done_progress.create, token)
+        return LSPTask(self.server, message, token, count, loop=self.loop)
+
     def finish_initialization(self) -> None:
         self.initialized = False  # We can't initiate server work during syncs
         if self.initial_token is not None:
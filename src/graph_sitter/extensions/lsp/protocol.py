@@ -9,6 +9,7 @@ from graph_sitter.configs.models.codebase import CodebaseConfig
 from graph_sitter.core.codebase import Codebase
 from graph_sitter.extensions.lsp.io import LSPIO
 from graph_sitter.extensions.lsp.progress import LSPProgress
+from graph_sitter.extensions.lsp.sync import DEFAULT_SYNC_DEBOUNCE, SyncScheduler
 from graph_sitter.extensions.lsp.utils import get_path
 
 if TYPE_CHECKING:
@@ -31,6 +32,9 @@ class GraphSitterLanguageServerProtocol(LanguageServerProtocol):
         self._server.codebase = Codebase(repo_path=str(root), config=config, io=io, progress=progress)
         self._server.progress_manager = progress
         self._server.io = io
+        options = params.initialization_options if isinstance(params.initialization_options, dict) else {}
+        debounce = options.get("syncDebounceMs", DEFAULT_SYNC_DEBOUNCE * 1000) / 1000
+        self._server.sync_scheduler = SyncScheduler(self._server.codebase.ctx, progress, debounce=debounce)
         progress.finish_initialization()
 
     @lsp_method(INITIALIZE)
@@ -14,6 +14,7 @@ from graph_sitter.extensions.lsp.execute import execute_action
 from graph_sitter.extensions.lsp.io import LSPIO
 from graph_sitter.extensions.lsp.progress import LSPProgress
 from graph_sitter.extensions.lsp.range import get_tree_sitter_range
+from graph_sitter.extensions.lsp.sync import SyncScheduler
 from graph_sitter.extensions.lsp.utils import get_path
 from graph_sitter.shared.logging.get_logger import get_logger
 
@@ -24,6 +25,7 @@ class GraphSitterLanguageServer(LanguageServer):
     codebase: Codebase | None
     io: LSPIO | None
     progress_manager: LSPProgress | None
+    sync_scheduler: SyncScheduler | None
     actions: dict[str, CodeAction]
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -48,18 +50,9 @@ class GraphSitterLanguageServer(LanguageServer):
         resolved_uri = file.path.absolute().as_uri()
         logger.info(f"Getting node under cursor for {resolved_uri} at {position}")
         document = self.workspace.get_text_document(resolved_uri)
-        candidates = []
         target_byte = document.offset_at_position(position)
         end_byte = document.offset_at_position(end_position) if end_position is not None else None
-        for node in file._range_index.nodes:
-            if node.start_byte <= target_byte and node.end_byte >= target_byte:
-                if end_position is not None:
-                    if node.end_byte < end_byte:
-                        continue
-                candidates.append(node)
-        if not candidates:
-            return None
-        return min(candidates, key=lambda node: abs(node.end_byte - node.start_byte))
+        return file._range_index.get_smallest_containing(target_byte, end_byte)
 
     def get_node_for_range(self, uri: str, range: Range) -> Editable | None:
         file = self.get_file(uri)
@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from graph_sitter.codebase.diff_lite import DiffLite
+from graph_sitter.extensions.lsp.progress import LSPProgress, LSPTask
+from graph_sitter.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+
+logger = get_logger(__name__)
+
+# Seconds without a new change before the pending changes are synced
+DEFAULT_SYNC_DEBOUNCE = 0.2
+
+
+class SyncScheduler:
+    """Coalesces and debounces graph syncs for document change notifications.
+
+    Changes are queued per file, and once no new change has arrived for `debounce` seconds they are applied to the graph
+    together on a background thread instead of on the event loop. Handlers that use the graph or the workspace files go
+    through `read`, which either applies the pending changes first or bypasses them, but never runs concurrently with a
+    sync. Waiting for a sync and applying the pending changes happen on an executor, so the event loop is never blocked.
+    """
+
+    ctx: "CodebaseContext"
+    progress: LSPProgress
+    debounce: float
+    last_sync_latency: float | None
+    _pending: dict[Path, DiffLite]
+    _queued: int
+    _timer: threading.Timer | None
+
+    def __init__(self, ctx: "CodebaseContext", progress: LSPProgress, debounce: float = DEFAULT_SYNC_DEBOUNCE) -> None:
+        self.ctx = ctx
+        self.progress = progress
+        self.debounce = debounce
+        self.last_sync_latency = None
+        self._pending = {}
+        self._queued = 0
+        self._timer = None
+        # Guards the pending changes and the timer
+        self._pending_lock = threading.Lock()
+        # Held while the graph is synced or read. Reads may acquire it on an executor and release it on the event loop
+        self._graph_lock = threading.Lock()
+        # Lets handlers into `read` in the order they were received
+        self._read_lock = asyncio.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of files with changes waiting to be synced."""
+        return len(self._pending)
+
+    def schedule(self, diff: DiffLite) -> None:
+        """Queues a change and restarts the debounce window.
+
+        Only the latest change to each file is kept, `CodebaseContext.apply_diffs` works out whether the file has to be
+        added, reparsed or removed from the current graph.
+        """
+        with self._pending_lock:
+            self._pending[Path(diff.path)] = diff
+            self._queued += 1
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Applies the pending changes now, waiting for a sync that is already running."""
+        with self._graph_lock:
+            self._flush()
+
+    @asynccontextmanager
+    async def read(self, wait: bool = True) -> AsyncIterator[None]:
+        """Holds the graph for the duration of a request.
+
+        Args:
+            wait: Apply the pending changes first. Requests that can tolerate a slightly stale graph (such as the
+                document outline, which editors request after every change) should pass False so they don't defeat
+                the debouncing.
+        """
+        async with self._read_lock:
+            # The lock is taken on the loop if that doesn't block it, otherwise on an executor
+            if (wait and self._pending) or not self._graph_lock.acquire(blocking=False):
+                acquired = asyncio.get_running_loop().run_in_executor(None, self._acquire, wait)
+                try:
+                    await asyncio.shield(acquired)
+                except asyncio.CancelledError:
+                    # The executor still takes the lock, release it once it does
+                    acquired.add_done_callback(self._release_acquired)
+                    raise
+            try:
+                yield
+            finally:
+                self._graph_lock.release()
+
+    def _acquire(self, wait: bool) -> None:
+        self._graph_lock.acquire()
+        if wait:
+            try:
+                self._flush()
+            except BaseException:
+                self._graph_lock.release()
+                raise
+
+    def _release_acquired(self, acquired: asyncio.Future) -> None:
+        if not acquired.cancelled() and acquired.exception() is None:
+            self._graph_lock.release()
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            diffs = list(self._pending.values())
+            queued = self._queued
+            self._pending.clear()
+            self._queued = 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not diffs:
+            return
+        task = self.progress.begin_nowait("Syncing graph", count=len(diffs))
+        try:
+            self._sync(diffs, queued, task)
+        except Exception:
+            logger.exception(f"Failed to sync {len(diffs)} files")
+        finally:
+            task.end()
+
+    def _sync(self, diffs: list[DiffLite], queued: int, task: LSPTask) -> None:
+        task.update(f"Syncing {len(diffs)} files ({queued} changes queued)", count=0)
+        start = time.perf_counter()
+        self.ctx.apply_diffs(diffs)
+        self.last_sync_latency = time.perf_counter() - start
+        message = f"Synced {len(diffs)} files ({queued} changes queued) in {self.last_sync_latency * 1000:.0f}ms"
+        logger.info(message)
+        task.update(message, count=len(diffs))
@@ -0,0 +1,159 @@
+"""Process-wide pool of parsed codebases shared by the MCP tool servers."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from graph_sitter.codebase.codebase_context import GLOBAL_FILE_IGNORE_LIST
+from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
+from graph_sitter.configs.models.codebase import CodebaseConfig
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+from graph_sitter.shared.logging.get_logger import get_logger
+
+logger = get_logger(__name__)
+
+# (resolved repo path, language, serialized config)
+PoolKey = tuple[str, ProgrammingLanguage | None, str | None]
+
+# Maximum number of codebases kept warm
+DEFAULT_POOL_SIZE = 4
+# Maximum number of graph nodes kept warm across all codebases, a proxy for their memory use
+DEFAULT_POOL_MAX_NODES = 5_000_000
+
+
+@dataclass
+class _PoolEntry:
+    # Held while the codebase is built, refreshed or used by a tool call
+    lock: threading.RLock = field(default_factory=threading.RLock)
+    codebase: Codebase | None = None
+    # (size, mtime_ns) of each file the graph was last synced with
+    stats: dict[Path, tuple[int, int]] = field(default_factory=dict)
+    num_nodes: int = 0
+
+
+class CodebasePool:
+    """Keeps parsed codebases warm between tool calls.
+
+    Codebases are keyed by (repo path, language, config). Checking one out with `acquire` refreshes it incrementally:
+    files whose size and mtime changed since the last call are compared against their parsed content, and only the
+    ones that differ (along with added and removed files) are synced with `apply_diffs`. Tool calls on the same
+    codebase are serialized, calls on different codebases run concurrently.
+
+    The least recently used codebases are evicted once there are more than `max_size` of them or they hold more than
+    `max_nodes` graph nodes in total. The most recently used codebase is always kept.
+    """
+
+    max_size: int
+    max_nodes: int
+    factory: Callable[..., Codebase]
+    _entries: OrderedDict[PoolKey, _PoolEntry]
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE, max_nodes: int = DEFAULT_POOL_MAX_NODES, factory: Callable[..., Codebase] = Codebase) -> None:
+        self.max_size = max_size
+        self.max_nodes = max_nodes
+        self.factory = factory
+        self._entries = OrderedDict()
+        # Guards `_entries`, never held while a codebase is built or refreshed
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def get_key(repo_path: str | Path, language: ProgrammingLanguage | str | None = None, config: CodebaseConfig | None = None) -> PoolKey:
+        language = ProgrammingLanguage(language.upper()) if isinstance(language, str) else language
+        return str(Path(repo_path).resolve()), language, config.model_dump_json() if config is not None else None
+
+    @contextmanager
+    def acquire(self, repo_path: str | Path, language: ProgrammingLanguage | str | None = None, config: CodebaseConfig | None = None) -> Iterator[Codebase]:
+        """Checks out an up to date codebase for the duration of the block, building it on first use."""
+        key = self.get_key(repo_path, language, config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _PoolEntry()
+            self._entries.move_to_end(key)
+        with entry.lock:
+            try:
+                if entry.codebase is None:
+                    self._build(key, entry, config)
+                else:
+                    self._refresh(key, entry)
+            except Exception:
+                self._discard(key, entry)
+                raise
+            yield entry.codebase
+            # The tool call may have changed the graph
+            entry.num_nodes = len(entry.codebase.ctx.nodes)
+        self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _build(self, key: PoolKey, entry: _PoolEntry, config: CodebaseConfig | None) -> None:
+        repo_path, language, _ = key
+        start = time.perf_counter()
+        entry.codebase = self.factory(repo_path=repo_path, language=language, config=config)
+        entry.stats = self._scan(entry.codebase)
+        entry.num_nodes = len(entry.codebase.ctx.nodes)
+        logger.info(f"Built codebase {repo_path} in {time.perf_counter() - start:.2f}s ({entry.num_nodes} nodes)")
+
+    def _refresh(self, key: PoolKey, entry: _PoolEntry) -> None:
+        start = time.perf_counter()
+        codebase = entry.codebase
+        stats = self._scan(codebase)
+        diffs = []
+        for filepath, stat in stats.items():
+            old_stat = entry.stats.get(filepath)
+            if old_stat is None:
+                diffs.append(DiffLite(ChangeType.Added, filepath))
+            elif stat != old_stat:
+                file = codebase.ctx.get_file(filepath)
+                if file is None or file.ts_node is None or file.ts_node.text != filepath.read_bytes():
+                    diffs.append(DiffLite(ChangeType.Modified, filepath))
+        diffs.extend(DiffLite(ChangeType.Removed, filepath) for filepath in entry.stats.keys() - stats.keys())
+        if diffs:
+            codebase.ctx.apply_diffs(diffs)
+            logger.info(f"Refreshed codebase {key[0]} with {len(diffs)} changed files in {time.perf_counter() - start:.2f}s")
+        entry.stats = stats
+
+    @staticmethod
+    def _scan(codebase: Codebase) -> dict[Path, tuple[int, int]]:
+        """Returns the (size, mtime_ns) of each working tree file the codebase parses."""
+        ctx = codebase.ctx
+        stats = {}
+        for filepath, _ in codebase._op.iter_files(subdirs=ctx.projects[0].subdirectories, extensions=ctx.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True):
+            filepath = ctx.to_absolute(filepath)
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                continue
+            stats[filepath] = (stat.st_size, stat.st_mtime_ns)
+        return stats
+
+    def _discard(self, key: PoolKey, entry: _PoolEntry) -> None:
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def _evict(self) -> None:
+        with self._lock:
+            while len(self._entries) > 1:
+                if len(self._entries) <= self.max_size and sum(entry.num_nodes for entry in self._entries.values()) <= self.max_nodes:
+                    break
+                key, _ = self._entries.popitem(last=False)
+                logger.info(f"Evicted codebase {key[0]} from the pool")
+
+
+_pool = CodebasePool()
+
+
+def get_codebase_pool() -> CodebasePool:
+    """Returns the process-wide codebase pool."""
+    return _pool
@@ -3,7 +3,7 @@ from typing import Annotated
 
 from mcp.server.fastmcp import FastMCP
 
-from graph_sitter.core.codebase import Codebase
+from graph_sitter.extensions.mcp.codebase_pool import get_codebase_pool
 from graph_sitter.extensions.tools import reveal_symbol
 from graph_sitter.extensions.tools.search import search
 from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
@@ -25,21 +25,21 @@ def reveal_symbol_tool(
     collect_dependencies: Annotated[bool | None, "includes dependencies of symbol"],
     collect_usages: Annotated[bool | None, "includes usages of symbol"],
 ):
-    codebase = Codebase(repo_path=codebase_dir, language=codebase_language)
-    result = reveal_symbol(
-        codebase=codebase,
-        symbol_name=symbol_name,
-        filepath=target_file,
-        max_depth=max_depth,
-        collect_dependencies=collect_dependencies,
-        collect_usages=collect_usages,
-    )
+    with get_codebase_pool().acquire(codebase_dir, codebase_language) as codebase:
+        result = reveal_symbol(
+            codebase=codebase,
+            symbol_name=symbol_name,
+            filepath=target_file,
+            max_depth=max_depth,
+            collect_dependencies=collect_dependencies,
+            collect_usages=collect_usages,
+        )
     return json.dumps(result, indent=2)
 
 
-@mcp.tool(name="search_codebase", description="The search query to find in the codebase. When ripgrep is available, this will be passed as a ripgrep pattern. For regex searches, set use_regex=True")
+@mcp.tool(name="search_codebase", description="Search the content of the files in the codebase. For regex searches, set use_regex=True")
 def search_codebase_tool(
-    query: Annotated[str, "The search query to find in the codebase. When ripgrep is available, this will be passed as a ripgrep pattern. For regex searches, set use_regex=True."],
+    query: Annotated[str, "The search query to find in the codebase. For regex searches, set use_regex=True and pass a Python regular expression."],
     codebase_dir: Annotated[str, "The root directory of your codebase"],
     codebase_language: Annotated[ProgrammingLanguage, "The language the codebase is written in"],
     target_directories: Annotated[list[str] | None, "list of directories to search within"] = None,
@@ -48,8 +48,8 @@ def search_codebase_tool(
     files_per_page: Annotated[int, "number of files to return per page"] = 10,
     use_regex: Annotated[bool, "use regex for the search query"] = False,
 ):
-    codebase = Codebase(repo_path=codebase_dir, language=codebase_language)
-    result = search(codebase, query, target_directories=target_directories, file_extensions=file_extensions, page=page, files_per_page=files_per_page, use_regex=use_regex)
+    with get_codebase_pool().acquire(codebase_dir, codebase_language) as codebase:
+        result = search(codebase, query, target_directories=target_directories, file_extensions=file_extensions, page=page, files_per_page=files_per_page, use_regex=use_regex)
     return json.dumps(result, indent=2)
 
 
@@ -5,11 +5,11 @@ from typing import Any, ClassVar, Optional
 import tiktoken
 from pydantic import Field
 
-from codegen.sdk.ai.utils import count_tokens
-from codegen.sdk.core.codebase import Codebase
-from codegen.sdk.core.external_module import ExternalModule
-from codegen.sdk.core.import_resolution import Import
-from codegen.sdk.core.symbol import Symbol
+from graph_sitter.ai.utils import count_tokens
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.core.external_module import ExternalModule
+from graph_sitter.core.import_resolution import Import
+from graph_sitter.core.symbol import Symbol
 
 from .observation import Observation
 
@@ -185,7 +185,12 @@ def get_extended_context(
         Tuple of (dependencies, usages, total_tokens)
     """
     if seen_symbols is None:
-        seen_symbols = set()
+        # The result of a whole walk is shared by the calls made until the codebase changes
+        key = (get_extended_context, symbol.node_id, degree, max_tokens, current_degree, total_tokens, collect_dependencies, collect_usages)
+        dependencies, usages, total_tokens = symbol.ctx.traversal.memoize(
+            key, lambda: get_extended_context(symbol, degree, max_tokens, set(), current_degree, total_tokens, collect_dependencies, collect_usages)
+        )
+        return list(dependencies), list(usages), total_tokens
 
     if current_degree >= degree or symbol in seen_symbols:
         return [], [], total_tokens
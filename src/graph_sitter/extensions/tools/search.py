@@ -0,0 +1,110 @@
+"""Full-text search over the files of a codebase, backed by the codebase's trigram index."""
+
+import re
+from pathlib import Path
+from typing import Any
+
+from graph_sitter.codebase.search_index import compile_query
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.core.file import SourceFile
+from graph_sitter.core.interfaces.editable import Editable
+from graph_sitter.tree_sitter_parser import PointIndex
+from graph_sitter.utils import descendant_for_byte_range
+
+
+def _enclosing_editable(file: SourceFile, start_byte: int, end_byte: int) -> Editable | None:
+    """Returns the smallest node of the file containing the byte range."""
+    if ts_node := descendant_for_byte_range(file.ts_node, start_byte, end_byte):
+        return file._parse_expression(ts_node)
+    return None
+
+
+def _match_info(file: SourceFile, content: bytes, points: PointIndex, match: re.Match[bytes]) -> dict[str, Any]:
+    start, end = points[match.start()], points[match.end()]
+    line_start = match.start() - start.column
+    line_end = content.find(b"\n", match.start())
+    line = content[line_start : line_end if line_end != -1 else len(content)]
+    info = {
+        "line_number": start.row + 1,
+        "line": line.decode("utf-8", errors="replace"),
+        "match": match.group().decode("utf-8", errors="replace"),
+        "start_column": start.column,
+        "end_line_number": end.row + 1,
+    }
+    if node := _enclosing_editable(file, match.start(), match.end()):
+        info["node_type"] = type(node).__name__
+        info["node_start_line"] = node.start_point[0] + 1
+        info["node_end_line"] = node.end_point[0] + 1
+        symbol = node.parent_symbol
+        if symbol is not None and symbol is not file and (name := getattr(symbol, "name", None)):
+            info["symbol"] = name
+    return info
+
+
+def search(
+    codebase: Codebase,
+    query: str,
+    target_directories: list[str] | None = None,
+    file_extensions: list[str] | None = None,
+    page: int = 1,
+    files_per_page: int = 10,
+    use_regex: bool = False,
+    case_sensitive: bool = True,
+) -> dict[str, Any]:
+    """Searches the content of the files in a codebase.
+
+    Only files that contain every trigram of the literal parts of the query are read, the rest are pruned by the
+    codebase's trigram index. Matches are reported for one page of matching files at a time, each mapped to the
+    smallest node enclosing it.
+
+    Args:
+        codebase: The codebase to search
+        query: The text to search for, or a Python regular expression if `use_regex` is set
+        target_directories: Only search files in these directories (relative to the repo root)
+        file_extensions: Only search files with these extensions (e.g. [".py"])
+        page: Page of matching files to return, starting at 1
+        files_per_page: Number of matching files per page
+        use_regex: Treat the query as a regular expression
+        case_sensitive: Match the case of the query
+
+    Returns:
+        The matches in the requested page of files, along with the total number of matching files and pages
+    """
+    if page < 1 or files_per_page < 1:
+        return {"status": "error", "error": "page and files_per_page must be at least 1"}
+    try:
+        pattern, trigrams = compile_query(query, use_regex=use_regex, case_sensitive=case_sensitive)
+    except re.error as e:
+        return {"status": "error", "error": f"Invalid regex {query!r}: {e}"}
+    ctx = codebase.ctx
+    directories = [ctx.to_absolute(directory) for directory in target_directories or []]
+    extensions = {extension if extension.startswith(".") else f".{extension}" for extension in file_extensions or []}
+
+    def included(path: Path) -> bool:
+        if extensions and path.suffix not in extensions:
+            return False
+        return not directories or any(path.is_relative_to(directory) for directory in directories)
+
+    candidates = [path for path in ctx.get_search_index().candidates(trigrams) if included(path)]
+    matching_files = []
+    for path in candidates:
+        file = ctx.get_file(path)
+        if file is not None and pattern.search(file.ts_node.text):
+            matching_files.append(file)
+
+    total_pages = (len(matching_files) + files_per_page - 1) // files_per_page
+    results = []
+    for file in matching_files[(page - 1) * files_per_page : page * files_per_page]:
+        content = file.ts_node.text
+        points = PointIndex(content)
+        results.append({"filepath": file.file_path, "matches": [_match_info(file, content, points, match) for match in pattern.finditer(content)]})
+    return {
+        "status": "success",
+        "query": query,
+        "page": page,
+        "total_pages": total_pages,
+        "total_files": len(matching_files),
+        "files_per_page": files_per_page,
+        "files_searched": len(candidates),
+        "results": results,
+    }
@@ -1,5 +1,4 @@
 import codecs
-import fnmatch
 import glob
 import os
 from collections.abc import Generator
@@ -25,7 +24,7 @@ from graph_sitter.git.schemas.repo_config import RepoConfig
 from graph_sitter.git.utils.clone import clone_or_pull_repo, clone_repo, pull_repo
 from graph_sitter.git.utils.clone_url import add_access_token_to_url, get_authenticated_clone_url_for_repo_config, get_clone_url_for_repo_config, url_to_github
 from graph_sitter.git.utils.codeowner_utils import create_codeowners_parser_for_repo
-from graph_sitter.git.utils.file_utils import create_files
+from graph_sitter.git.utils.file_utils import create_files, is_ignored
 from graph_sitter.git.utils.remote_progress import CustomRemoteProgress
 from graph_sitter.shared.logging.get_logger import get_logger
 from graph_sitter.shared.performance.stopwatch_utils import stopwatch
@@ -605,7 +604,7 @@ class RepoOperator:
             filepaths = glob.glob("**", root_dir=self.repo_path, recursive=True, include_hidden=True)
             # Filter filepaths by ignore list.
         if ignore_list:
-            filepaths = [f for f in filepaths if not any(fnmatch.fnmatch(f, pattern) or f.startswith(pattern) for pattern in ignore_list)]
+            filepaths = [f for f in filepaths if not is_ignored(f, ignore_list)]
 
         # Fix bug where unicode characters are not handled correctly
         for i, filepath in enumerate(filepaths):
@@ -628,6 +627,21 @@ class RepoOperator:
 
         return filepaths
 
+    def get_ignored_filepaths(self, filepaths: list[str]) -> set[str]:
+        """Returns the filepaths (relative to the repo) that are excluded by gitignore rules, and so are not listed by
+        `get_filepaths_for_repo`. Tracked files are never ignored.
+        """
+        if not self.repo_config.respect_gitignore or not filepaths:
+            return set()
+        ignored = set()
+        for i in range(0, len(filepaths), 1000):
+            # ls-file flags:
+            # -o -i --exclude-standard: show untracked files that are excluded by the standard gitignore rules
+            # -z: separate paths with NUL instead of quoting them
+            output = self.git_cli.git.ls_files("-z", "-o", "-i", "--exclude-standard", "--", *filepaths[i : i + 1000])
+            ignored.update(filepath for filepath in output.split("\0") if filepath)
+        return ignored
+
     # TODO: unify param naming i.e. subdirectories vs subdirs probably use subdirectories since that's in the DB
     def iter_files(
         self,
@@ -1,3 +1,4 @@
+import fnmatch
 import os
 from pathlib import Path
 
@@ -38,6 +39,11 @@ def create_files(base_dir: str, files: dict[str, str]) -> None:
         create_file(os.path.join(base_dir, filename), content)
 
 
+def is_ignored(filepath: str, ignore_list: list[str]) -> bool:
+    """Whether a relative filepath matches one of the patterns (or path prefixes) of an ignore list."""
+    return any(fnmatch.fnmatch(filepath, pattern) or filepath.startswith(pattern) for pattern in ignore_list)
+
+
 def split_git_path(filepath: str) -> tuple[str, str | None]:
     """Split a filepath into (git_root, base_path) tuple by finding .git directory.
 
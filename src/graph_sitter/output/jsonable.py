@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from functools import cached_property
 
 from tree_sitter import Node as TSNode
 
@@ -16,6 +15,8 @@ BLACKLIST = ["json", "G", "viz", "autocommit_cache", "ts_node", "symbol_usages",
 
 @noapidoc
 class JSONable(ABC):
+    __slots__ = ()
+
     ts_node: TSNode
 
     @noapidoc
@@ -46,7 +47,7 @@ class JSONable(ABC):
     @noapidoc
     def json(self, max_depth: int = 2, methods: bool = True) -> JSON:
         if max_depth < 0:
-            self._add_to_index
+            self._add_to_index()
             return self.placeholder.model_dump()
 
         res = {}
@@ -82,7 +83,6 @@ class JSONable(ABC):
     @abstractmethod
     @noapidoc
     def span(self) -> Span: ...
-    @cached_property
     @abstractmethod
     @noapidoc
     def _add_to_index(self) -> None: ...
@@ -235,16 +235,20 @@ class PyFile(SourceFile[PyImport, PyFunction, PyClass, PyAssignment, Interface[P
             PySymbol | None: The found symbol if it exists in this file or any of its wildcard
                 imports, None otherwise.
         """
-        node = None
         if node := self.get_node_by_name(symbol_name):
             return node
+        node_id = self.ctx.py_module_index.get_wildcard_chain(self, symbol_name)
+        return None if node_id is None else self.ctx.get_node(node_id)
 
-        if wildcard_imports := {imp for imp in self.imports if imp.is_wildcard_import()}:
-            for wildcard_import in wildcard_imports:
-                if imp_resolution := wildcard_import.resolve_import():
-                    node = imp_resolution.from_file.get_node_from_wildcard_chain(symbol_name=symbol_name)
-
-        return node
+    @noapidoc
+    def _get_node_from_wildcard_chain(self, symbol_name: str) -> PySymbol | None:
+        """Searches for a symbol through the wildcard imports of the file, see `PyModuleIndex.get_wildcard_chain`."""
+        # Names imported by later wildcard imports shadow the earlier ones
+        for wildcard_import in reversed(self.imports):
+            if wildcard_import.is_wildcard_import() and (imp_resolution := wildcard_import.resolve_import()):
+                if node := imp_resolution.from_file.get_node_from_wildcard_chain(symbol_name=symbol_name):
+                    return node
+        return None
 
     @noapidoc
     def get_node_wildcard_resolves_for(self, symbol_name: str) -> PyImport | PySymbol | None:
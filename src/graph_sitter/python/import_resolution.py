@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import sys
 from typing import TYPE_CHECKING
 
 from graph_sitter.core.autocommit import reader
@@ -15,7 +14,6 @@ if TYPE_CHECKING:
     from tree_sitter import Node as TSNode
 
     from graph_sitter.codebase.codebase_context import CodebaseContext
-    from graph_sitter.core.file import SourceFile
     from graph_sitter.core.interfaces.editable import Editable
     from graph_sitter.core.interfaces.exportable import Exportable
     from graph_sitter.core.node_id_factory import NodeId
@@ -96,86 +94,9 @@ class PyImport(Import["PyFile"]):
             if module_source.startswith("."):
                 module_source = self._relative_to_absolute_import(module_source)
 
-            # =====[ Check if we are importing an entire file ]=====
-            if self.is_module_import():
-                # covers `import a.b.c` case and `from a.b.c import *` case
-                filepath = os.path.join(base_path, module_source.replace(".", "/") + ".py")
-            else:
-                # This is the case where you do:
-                # `from a.b.c import foo`
-                filepath = os.path.join(
-                    base_path,
-                    module_source.replace(".", "/") + "/" + symbol_name + ".py",
-                )
-
-            # =====[ Check if we are importing an entire file with custom resolve path or sys.path enabled ]=====
-            if len(self.ctx.config.import_resolution_paths) > 0 or self.ctx.config.py_resolve_syspath:
-                # Handle resolve overrides first if both is set
-                resolve_paths: list[str] = self.ctx.config.import_resolution_paths + (sys.path if self.ctx.config.py_resolve_syspath else [])
-                if file := self._file_by_custom_resolve_paths(resolve_paths, filepath):
-                    return ImportResolution(from_file=file, symbol=None, imports_file=True)
-
-            # =====[ Default path ]=====
-            if file := self.ctx.get_file(filepath, relative_only=True):
-                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-
-            filepath = filepath.replace(".py", "/__init__.py")
-            if file := self.ctx.get_file(filepath, relative_only=True):
-                # TODO - I think this is another edge case, due to `dao/__init__.py` etc.
-                # You can't do `from a.b.c import foo` => `foo.utils.x` right now since `foo` is just a file...
-                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-
-            # =====[ Check if `module.py` file exists in the graph with custom resolve path or sys.path enabled  ]=====
-            filepath = module_source.replace(".", "/") + ".py"
-            if len(self.ctx.config.import_resolution_paths) > 0 or self.ctx.config.py_resolve_syspath:
-                # Handle resolve overrides first if both is set
-                resolve_paths: list[str] = self.ctx.config.import_resolution_paths + (sys.path if self.ctx.config.py_resolve_syspath else [])
-                if file := self._file_by_custom_resolve_paths(resolve_paths, filepath):
-                    symbol = file.get_node_by_name(symbol_name)
-                    return ImportResolution(from_file=file, symbol=symbol)
-
-            # =====[ Check if `module.py` file exists in the graph ]=====
-            filepath = os.path.join(base_path, filepath)
-            if file := self.ctx.get_file(filepath, relative_only=True):
-                symbol = file.get_node_by_name(symbol_name)
-                if symbol is None:
-                    if file.get_node_from_wildcard_chain(symbol_name):
-                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                    else:
-                        # This is most likely a broken import
-                        return ImportResolution(from_file=file, symbol=None)
-                else:
-                    return ImportResolution(from_file=file, symbol=symbol)
-
-            # =====[ Check if `module/__init__.py` file exists in the graph with custom resolve path or sys.path enabled ]=====
-            filepath = filepath.replace(".py", "/__init__.py")
-            if len(self.ctx.config.import_resolution_paths) > 0 or self.ctx.config.py_resolve_syspath:
-                # Handle resolve overrides first if both is set
-                resolve_paths: list[str] = self.ctx.config.import_resolution_paths + (sys.path if self.ctx.config.py_resolve_syspath else [])
-                if from_file := self._file_by_custom_resolve_paths(resolve_paths, filepath):
-                    symbol = from_file.get_node_by_name(symbol_name)
-                    if symbol is None:
-                        if from_file.get_node_from_wildcard_chain(symbol_name):
-                            return ImportResolution(from_file=from_file, symbol=None, imports_file=True)
-                        else:
-                            # This is most likely a broken import
-                            return ImportResolution(from_file=from_file, symbol=None)
-
-                    else:
-                        return ImportResolution(from_file=from_file, symbol=symbol)
-
-            # =====[ Check if `module/__init__.py` file exists in the graph ]=====
-            if from_file := self.ctx.get_file(filepath, relative_only=True):
-                symbol = from_file.get_node_by_name(symbol_name)
-                if symbol is None:
-                    if from_file.get_node_from_wildcard_chain(symbol_name):
-                        return ImportResolution(from_file=from_file, symbol=None, imports_file=True)
-                    else:
-                        # This is most likely a broken import
-                        return ImportResolution(from_file=from_file, symbol=None)
-
-                else:
-                    return ImportResolution(from_file=from_file, symbol=symbol)
+            module_path = module_source.replace(".", "/")
+            if resolution := self._resolve_module_path(base_path, module_path, symbol_name):
+                return resolution
 
             # =====[ Case: Can't resolve the import ]=====
             if base_path == "":
@@ -206,18 +127,87 @@ class PyImport(Import["PyFile"]):
 
     @noapidoc
     @reader
-    def _file_by_custom_resolve_paths(self, resolve_paths: list[str], filepath: str) -> SourceFile | None:
-        """Check if a certain file import can be found within a set sys.path
+    def _resolve_module_path(self, base_path: str, module_path: str, symbol_name: str) -> ImportResolution[PyFile] | None:
+        """Resolves the import to a file of the module index, with the module path relative to `base_path` or to the
+        custom resolve paths (`import_resolution_paths`, then `sys.path` with `py_resolve_syspath`).
+        """
+        module_index = self.ctx.py_module_index
+        # Handle resolve overrides first if both are set
+        roots = module_index.roots
+
+        # =====[ Skip modules outside of the codebase, every candidate file is under their top level package ]=====
+        if module_path:
+            top_level = module_path.split("/", 1)[0]
+            if not module_index.exists(os.path.join(base_path, top_level)) and not any(
+                module_index.exists(os.path.normpath(os.path.join(root, base_path, top_level))) or module_index.exists(os.path.normpath(os.path.join(root, top_level))) for root in roots
+            ):
+                return None
+
+        # =====[ Check if we are importing an entire file ]=====
+        if self.is_module_import():
+            # covers `import a.b.c` case and `from a.b.c import *` case
+            file_module_path = os.path.join(base_path, module_path)
+        else:
+            # This is the case where you do:
+            # `from a.b.c import foo`
+            file_module_path = os.path.join(base_path, module_path + "/" + symbol_name)
+
+        # =====[ Check if we are importing an entire file with custom resolve path or sys.path enabled ]=====
+        if file := self._file_by_custom_resolve_paths(roots, file_module_path):
+            return ImportResolution(from_file=file, symbol=None, imports_file=True)
+
+        # =====[ Default path ]=====
+        if file := module_index.get_module(file_module_path):
+            return ImportResolution(from_file=file, symbol=None, imports_file=True)
+
+        if file := module_index.get_package(file_module_path):
+            # TODO - I think this is another edge case, due to `dao/__init__.py` etc.
+            # You can't do `from a.b.c import foo` => `foo.utils.x` right now since `foo` is just a file...
+            return ImportResolution(from_file=file, symbol=None, imports_file=True)
+
+        # =====[ Check if `module.py` file exists in the graph with custom resolve path or sys.path enabled  ]=====
+        if file := self._file_by_custom_resolve_paths(roots, module_path):
+            symbol = file.get_node_by_name(symbol_name)
+            return ImportResolution(from_file=file, symbol=symbol)
+
+        # =====[ Check if `module.py` file exists in the graph ]=====
+        module_path = os.path.join(base_path, module_path)
+        if file := module_index.get_module(module_path):
+            return self._resolve_symbol(file, symbol_name)
+
+        # =====[ Check if `module/__init__.py` file exists in the graph with custom resolve path or sys.path enabled ]=====
+        if from_file := self._file_by_custom_resolve_paths(roots, module_path, package=True):
+            return self._resolve_symbol(from_file, symbol_name)
+
+        # =====[ Check if `module/__init__.py` file exists in the graph ]=====
+        if from_file := module_index.get_package(module_path):
+            return self._resolve_symbol(from_file, symbol_name)
+        return None
+
+    @noapidoc
+    @reader
+    def _resolve_symbol(self, from_file: PyFile, symbol_name: str) -> ImportResolution[PyFile]:
+        symbol = from_file.get_node_by_name(symbol_name)
+        if symbol is None:
+            if from_file.get_node_from_wildcard_chain(symbol_name):
+                return ImportResolution(from_file=from_file, symbol=None, imports_file=True)
+            else:
+                # This is most likely a broken import
+                return ImportResolution(from_file=from_file, symbol=None)
+        else:
+            return ImportResolution(from_file=from_file, symbol=symbol)
+
+    @noapidoc
+    @reader
+    def _file_by_custom_resolve_paths(self, roots: list[str], module_path: str, package: bool = False) -> PyFile | None:
+        """Check if a certain module (or package) can be found within the custom resolve paths or sys.path
 
         Returns either None or the SourceFile.
         """
-        for resolve_path in resolve_paths:
-            filepath_new: str = os.path.join(resolve_path, filepath)
-            try:
-                file = self.ctx.get_file(filepath_new)
-            except AssertionError as e:
-                file = None
-            if file:
+        module_index = self.ctx.py_module_index
+        for root in roots:
+            root_module_path = os.path.normpath(os.path.join(root, module_path))
+            if file := (module_index.get_package(root_module_path) if package else module_index.get_module(root_module_path)):
                 return file
 
         return None
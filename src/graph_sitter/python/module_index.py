@@ -0,0 +1,171 @@
+import os
+import sys
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from graph_sitter.codebase.module_index import ModuleIndex
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+    from graph_sitter.core.node_id_factory import NodeId
+    from graph_sitter.python.file import PyFile
+
+
+class PyModuleIndex(ModuleIndex["PyFile"]):
+    """Index of the Python files of a codebase by module path, used to resolve imports.
+
+    A module path is a dotted module name with `/` separators (`a/b/c` for `a.b.c`), relative to the repository. It
+    maps to its module (`a/b/c.py`) and package (`a/b/c/__init__.py`) files. Every directory with Python files is also
+    tracked (i.e. namespace packages), so that imports of modules that are not part of the codebase, which are most of
+    the imports, are rejected after a single lookup instead of trying every candidate file.
+
+    The index is refreshed on its first use after the files changed (see `ModuleIndex`). The roots of
+    `import_resolution_paths` and `sys.path` (when `py_resolve_syspath` is enabled) are converted to module paths once
+    until the config or `sys.path` change.
+    """
+
+    # Module path -> file path of `<module path>.py`
+    _modules: dict[str, str]
+    # Module path -> file path of `<module path>/__init__.py`
+    _packages: dict[str, str]
+    # Number of indexed files under each directory
+    _directories: Counter[str]
+    # Custom resolve paths the roots were computed from
+    _resolve_paths: tuple[str, ...] | None
+    # Module paths of the custom resolve paths with Python files, in order of precedence. None if not computed yet
+    _roots: list[str] | None
+    # Generation of the context the wildcard chains were computed in
+    _generation: int | None
+    # (file, symbol name) -> node id of the symbol found through the wildcard imports of the file
+    _wildcard_chains: dict[tuple["NodeId", str], "NodeId | None"]
+    # Searches in progress -> their depth in the stack of searches
+    _wildcard_searches: dict[tuple["NodeId", str], int]
+    # Smallest depth of the searches in progress the current search ran into, i.e. the root of the cycles it is part of
+    _wildcard_cycle_depth: int
+
+    def __init__(self, ctx: "CodebaseContext") -> None:
+        super().__init__(ctx)
+        self._modules = {}
+        self._packages = {}
+        self._directories = Counter()
+        self._resolve_paths = None
+        self._roots = None
+        self._generation = None
+        self._wildcard_chains = {}
+        self._wildcard_searches = {}
+        self._wildcard_cycle_depth = sys.maxsize
+
+    def get_module(self, module_path: str) -> "PyFile | None":
+        """Returns the file of `<module_path>.py`."""
+        self._check_files()
+        return self._get_file(self._modules.get(module_path, None))
+
+    def get_package(self, module_path: str) -> "PyFile | None":
+        """Returns the file of `<module_path>/__init__.py`."""
+        self._check_files()
+        return self._get_file(self._packages.get(module_path, None))
+
+    def exists(self, module_path: str) -> bool:
+        """Returns whether a module path is a module, or a directory (namespace package or not) with Python files."""
+        self._check_files()
+        return module_path in self._modules or module_path in self._directories
+
+    @property
+    def roots(self) -> list[str]:
+        """The module paths of `import_resolution_paths`, followed by those of `sys.path` if `py_resolve_syspath` is enabled.
+
+        Paths without indexed Python files are left out, as are paths outside of the repository unless `allow_external`
+        is enabled.
+        """
+        self._check_files()
+        config = self.ctx.config
+        resolve_paths = (*config.import_resolution_paths, *(sys.path if config.py_resolve_syspath else ()))
+        if resolve_paths != self._resolve_paths:
+            self._resolve_paths = resolve_paths
+            self._roots = None
+            # Wildcard imports may resolve to other files
+            self._wildcard_chains.clear()
+        if self._roots is None:
+            self._roots = []
+            for resolve_path in resolve_paths:
+                if not self.ctx.is_subdir(resolve_path) and not config.allow_external:
+                    continue
+                root = str(self.ctx.to_relative(resolve_path))
+                # Paths without Python files (e.g. the site-packages of sys.path) cannot resolve anything
+                if root == "." or root in self._directories:
+                    self._roots.append("" if root == "." else root)
+        return self._roots
+
+    def get_wildcard_chain(self, file: "PyFile", symbol_name: str) -> "NodeId | None":
+        """Returns the memoized result of `PyFile.get_node_from_wildcard_chain`, computing it if needed.
+
+        Results are kept until the files or the graph change. Wildcard import cycles end the search instead of
+        recursing forever. A search cut short by a cycle is only memoized at the root of the cycle, where it has seen
+        every file of the cycle, so that results do not depend on the order of the searches.
+        """
+        if self._generation != self.ctx.generation:
+            self._wildcard_chains.clear()
+            self._generation = self.ctx.generation
+        self._check_files()
+        key = (file.node_id, symbol_name)
+        if key in self._wildcard_chains:
+            return self._wildcard_chains[key]
+        if (depth := self._wildcard_searches.get(key)) is not None:
+            # A cycle, the search in progress is the one that looks further
+            self._wildcard_cycle_depth = min(self._wildcard_cycle_depth, depth)
+            return None
+        depth = self._wildcard_searches[key] = len(self._wildcard_searches)
+        outer_cycle_depth, self._wildcard_cycle_depth = self._wildcard_cycle_depth, sys.maxsize
+        try:
+            node = file._get_node_from_wildcard_chain(symbol_name)
+        finally:
+            del self._wildcard_searches[key]
+            cycle_depth, self._wildcard_cycle_depth = self._wildcard_cycle_depth, outer_cycle_depth
+        node_id = node.node_id if node is not None else None
+        if cycle_depth >= depth:
+            self._wildcard_chains[key] = node_id
+        else:
+            # Part of a cycle rooted in an enclosing search, which has to be done first
+            self._wildcard_cycle_depth = min(outer_cycle_depth, cycle_depth)
+        return node_id
+
+    def _invalidate(self) -> None:
+        """Drops the roots and the wildcard chains, which may resolve to other files once the Python files changed."""
+        self._roots = None
+        self._wildcard_chains.clear()
+
+    def _add(self, filepath: str) -> None:
+        module_path, extension = os.path.splitext(filepath)
+        if extension != ".py":
+            return
+        self._invalidate()
+        if os.path.basename(module_path) == "__init__":
+            self._packages[os.path.dirname(module_path)] = filepath
+        else:
+            self._modules[module_path] = filepath
+        for directory in _parents(filepath):
+            self._directories[directory] += 1
+
+    def _remove(self, filepath: str) -> None:
+        module_path, extension = os.path.splitext(filepath)
+        if extension != ".py":
+            return
+        self._invalidate()
+        if os.path.basename(module_path) == "__init__":
+            self._packages.pop(os.path.dirname(module_path), None)
+        else:
+            self._modules.pop(module_path, None)
+        for directory in _parents(filepath):
+            self._directories[directory] -= 1
+            if not self._directories[directory]:
+                del self._directories[directory]
+
+
+def _parents(filepath: str) -> list[str]:
+    """Returns the directories containing a file, from the closest one up to the root (excluded)."""
+    parents = []
+    directory = os.path.dirname(filepath)
+    while directory and directory != os.path.dirname(directory):
+        parents.append(directory)
+        directory = os.path.dirname(directory)
+    return parents
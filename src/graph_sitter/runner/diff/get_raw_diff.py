@@ -1,9 +1,13 @@
 import io
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
 
 from unidiff import LINE_TYPE_CONTEXT, Hunk, PatchedFile, PatchSet
 from unidiff.patch import Line
 
 from graph_sitter.core.codebase import Codebase
+from graph_sitter.runner.diff.unified_diff import iter_file_diff
 from graph_sitter.shared.logging.get_logger import get_logger
 
 logger = get_logger(__name__)
@@ -24,13 +28,11 @@ def append_flag(file: PatchedFile, append_at: int, line_no: int, codebase: Codeb
 def patch_to_limited_diff_string(patch, codebase: Codebase, max_lines=10000):
     diff_lines = []
     total_lines = 0
+    flag_rows = _get_flag_rows(codebase)
 
     # Add flags that are not in the diff
-    filenames = [patched_file.path for patched_file in patch]
-    flags_not_in_diff = list(filter(lambda flag: flag.symbol.filepath not in filenames, codebase.ctx.flags._flags))
-
-    for flag in flags_not_in_diff:
-        filename = flag.symbol.filepath
+    filenames = {patched_file.path for patched_file in patch}
+    for filename in flag_rows.keys() - filenames:
         patched_file = PatchedFile(
             patch_info=f"diff --git a/{filename} b/{filename}\n",
             source=f"a/{filename}",
@@ -39,11 +41,7 @@ def patch_to_limited_diff_string(patch, codebase: Codebase, max_lines=10000):
         patch.append(patched_file)
 
     for patched_file in patch:
-        filtered_flags = filter(lambda flag: flag.symbol.filepath == patched_file.path, codebase.ctx.flags._flags)
-        sorted_flags = list(map(lambda flag: flag.symbol.start_point.row + 1, filtered_flags))
-        sorted_flags.sort()
-
-        for flag in sorted_flags:
+        for flag in flag_rows.get(patched_file.path, ()):
             is_in_diff = False
 
             for i, hunk in enumerate(patched_file):
@@ -87,6 +85,59 @@ def get_raw_diff(codebase: Codebase, base: str = "HEAD", max_lines: int = 10000)
     return raw_diff_trunc
 
 
+def get_raw_diff_from_transactions(codebase: Codebase, max_lines: int = 10000) -> str:
+    """Same as `get_raw_diff` against the synced commit, built from the contents the files had before the changes made since
+    the graph was synced (see `CodebaseContext.get_original_contents`) and their current contents instead of calling git.
+
+    Files are only read and diffed until the diff reaches `max_lines`.
+    """
+    ctx = codebase.ctx
+    original_contents = ctx.get_original_contents()
+    changes = ((path, original_contents[path], ctx.io.read_bytes(path) if ctx.io.file_exists(path) else None) for path in sorted(original_contents))
+    return _changes_to_diff_string(changes, codebase, max_lines)
+
+
+def _changes_to_diff_string(changes: Iterable[tuple[Path, bytes | None, bytes | None]], codebase: Codebase, max_lines: int) -> str:
+    """Formats the changes and the flags like `patch_to_limited_diff_string`, stopping at the first hunk that reaches
+    `max_lines`.
+    """
+    repo_path = Path(codebase.repo_path)
+    flag_rows = _get_flag_rows(codebase)
+
+    def file_diffs() -> Iterator[tuple[str, bytes | None, bytes | None, list[int]]]:
+        for path, original, new in changes:
+            filename = path.relative_to(repo_path).as_posix() if path.is_absolute() else path.as_posix()
+            rows = flag_rows.pop(filename, [])
+            if original != new or rows:
+                yield filename, original, new, rows
+        # Files that are flagged but unchanged
+        for filename, rows in flag_rows.items():
+            if (file := codebase.get_file(filename, optional=True)) is not None:
+                content = file.content_bytes
+                yield filename, content, content, rows
+
+    chunks = []
+    total_lines = 0
+    for filename, original, new, rows in file_diffs():
+        for chunk in iter_file_diff(filename, original, new, rows):
+            chunks.append(chunk)
+            total_lines += chunk.count("\n")
+            if total_lines >= max_lines:
+                logger.info(f"Truncated diff to {total_lines} lines (max: {max_lines})")
+                return "".join(chunks)
+    return "".join(chunks)
+
+
+def _get_flag_rows(codebase: Codebase) -> dict[str, list[int]]:
+    """Groups the lines (1-based) of the flags of the codebase by file, sorted."""
+    flag_rows = defaultdict(list)
+    for flag in codebase.ctx.flags._flags:
+        flag_rows[flag.symbol.filepath].append(flag.symbol.start_point.row + 1)
+    for rows in flag_rows.values():
+        rows.sort()
+    return dict(flag_rows)
+
+
 def get_filenames_from_diff(diff: str) -> list[str]:
     patch_set = PatchSet(io.StringIO(diff))
     filenames = [patched_file.path for patched_file in patch_set]
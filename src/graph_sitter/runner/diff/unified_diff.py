@@ -0,0 +1,119 @@
+"""Unified diffs in the format of `git diff`, built from the contents of the files instead of calling git."""
+
+import difflib
+from collections.abc import Iterable, Iterator
+
+# Lines of unchanged context around the changes of a hunk, same as git
+CONTEXT_LINES = 3
+
+
+def iter_file_diff(filename: str, original: bytes | None, new: bytes | None, flag_rows: Iterable[int] = ()) -> Iterator[str]:
+    """Yields the diff of a file, its header first and then one hunk at a time.
+
+    Args:
+        filename: Path of the file relative to the repository
+        original: Content before the change, None if the file did not exist
+        new: Content after the change, None if the file was removed
+        flag_rows: Lines (1-based, in the new content) to show even if unchanged. The ones outside of the hunks are added as
+            hunks of a single line of context.
+    """
+    header = f"diff --git a/{filename} b/{filename}\n"
+    if original is None:
+        header += "new file mode 100644\n"
+    elif new is None:
+        header += "deleted file mode 100644\n"
+    source_lines = _split_lines(original)
+    target_lines = _split_lines(new)
+    if source_lines is None or target_lines is None:
+        yield header + f"Binary files {'/dev/null' if original is None else f'a/{filename}'} and {'/dev/null' if new is None else f'b/{filename}'} differ\n"
+        return
+    # The file headers are only shown if there is at least one hunk, like git does for empty files
+    file_header = f"--- {'/dev/null' if original is None else f'a/{filename}'}\n+++ {'/dev/null' if new is None else f'b/{filename}'}\n"
+
+    rows = iter(sorted(set(flag_rows)))
+    row = next(rows, None)
+    # Difference between the line numbers of the new and original content after the last hunk
+    offset = 0
+    for group in _grouped_opcodes(source_lines, target_lines):
+        source_end, target_start, target_end = group[-1][2], group[0][3], group[-1][4]
+        # Flags before the hunk get their own hunk, flags within the hunk are already shown
+        while row is not None and row <= target_end:
+            if row <= target_start:
+                yield header + file_header + _context_hunk(target_lines, row, row - offset)
+                header = file_header = ""
+            row = next(rows, None)
+        yield header + file_header + _hunk(group, source_lines, target_lines)
+        header = file_header = ""
+        offset = target_end - source_end
+    while row is not None and row <= len(target_lines):
+        yield header + file_header + _context_hunk(target_lines, row, row - offset)
+        header = file_header = ""
+        row = next(rows, None)
+    if header:
+        yield header
+
+
+def _grouped_opcodes(source_lines: list[str], target_lines: list[str]) -> Iterator[list[tuple[str, int, int, int, int]]]:
+    """Same as `SequenceMatcher.get_grouped_opcodes`, only matching the lines between the common prefix and suffix (but
+    for the ones needed as context), which are most of the lines of a file when a codemod only edits a few of them.
+    """
+    max_common = min(len(source_lines), len(target_lines))
+    prefix = 0
+    while prefix < max_common and source_lines[prefix] == target_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < max_common - prefix and source_lines[-suffix - 1] == target_lines[-suffix - 1]:
+        suffix += 1
+    start = max(prefix - CONTEXT_LINES, 0)
+    source_end = len(source_lines) - max(suffix - CONTEXT_LINES, 0)
+    target_end = len(target_lines) - max(suffix - CONTEXT_LINES, 0)
+    matcher = difflib.SequenceMatcher(None, source_lines[start:source_end], target_lines[start:target_end])
+    for group in matcher.get_grouped_opcodes(CONTEXT_LINES):
+        yield [(tag, i1 + start, i2 + start, j1 + start, j2 + start) for tag, i1, i2, j1, j2 in group]
+
+
+def _hunk(group: list[tuple[str, int, int, int, int]], source_lines: list[str], target_lines: list[str]) -> str:
+    source_start, source_end, target_start, target_end = group[0][1], group[-1][2], group[0][3], group[-1][4]
+    lines = [f"@@ -{_format_range(source_start, source_end - source_start)} +{_format_range(target_start, target_end - target_start)} @@\n"]
+    for tag, i1, i2, j1, j2 in group:
+        if tag == "equal":
+            lines.extend(_format_line(" ", line) for line in source_lines[i1:i2])
+            continue
+        if tag in ("replace", "delete"):
+            lines.extend(_format_line("-", line) for line in source_lines[i1:i2])
+        if tag in ("replace", "insert"):
+            lines.extend(_format_line("+", line) for line in target_lines[j1:j2])
+    return "".join(lines)
+
+
+def _context_hunk(target_lines: list[str], row: int, source_row: int) -> str:
+    return f"@@ -{source_row} +{row} @@\n" + _format_line(" ", target_lines[row - 1])
+
+
+def _format_range(start: int, length: int) -> str:
+    """Formats a range of lines of a hunk header, like `difflib.unified_diff`."""
+    beginning = start + 1
+    if length == 1:
+        return str(beginning)
+    if length == 0:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _format_line(prefix: str, line: str) -> str:
+    if line.endswith("\n"):
+        return prefix + line
+    return f"{prefix}{line}\n\\ No newline at end of file\n"
+
+
+def _split_lines(content: bytes | None) -> list[str] | None:
+    """Splits the content of a file into lines, returning None for binary files."""
+    if content is None:
+        return []
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    # Only split on "\n" like git, str.splitlines also splits on other line boundaries
+    *lines, last = text.split("\n")
+    return [f"{line}\n" for line in lines] + ([last] if last else [])
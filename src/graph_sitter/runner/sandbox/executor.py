@@ -9,7 +9,7 @@ from graph_sitter.codebase.flagging.code_flag import CodeFlag
 from graph_sitter.codebase.flagging.group import Group
 from graph_sitter.codebase.flagging.groupers.utils import get_grouper_by_group_by
 from graph_sitter.git.models.pr_options import PROptions
-from graph_sitter.runner.diff.get_raw_diff import get_raw_diff
+from graph_sitter.runner.diff.get_raw_diff import get_raw_diff_from_transactions
 from graph_sitter.runner.models.codemod import BranchConfig, CodemodRunResult, CreatedBranch, GroupingConfig
 from graph_sitter.runner.sandbox.repo import SandboxRepo
 from graph_sitter.runner.utils.branch_name import get_head_branch_name
@@ -164,7 +164,7 @@ class SandboxExecutor:
 
         # =====[ Get and store raw diff ]=====
         logger.info("> Extracting diff")
-        raw_diff = get_raw_diff(codebase=self.codebase)
+        raw_diff = get_raw_diff_from_transactions(codebase=self.codebase)
         result.observation = raw_diff
         result.base_commit = self.codebase.current_commit.hexsha if self.codebase.current_commit else "HEAD"
 
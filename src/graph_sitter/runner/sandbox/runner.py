@@ -9,6 +9,7 @@ from graph_sitter.git.schemas.enums import SetupOption
 from graph_sitter.git.schemas.repo_config import RepoConfig
 from graph_sitter.runner.models.apis import CreateBranchRequest, CreateBranchResponse, GetDiffRequest, GetDiffResponse
 from graph_sitter.runner.sandbox.executor import SandboxExecutor
+from graph_sitter.runner.sandbox.worker_pool import SandboxWorkerPool
 from graph_sitter.shared.compilation.string_to_code import create_execute_function_from_codeblock
 from graph_sitter.shared.logging.get_logger import get_logger
 
@@ -25,25 +26,43 @@ class SandboxRunner:
     # =====[ computed instance attributes ]=====
     codebase: CodebaseType
     executor: SandboxExecutor
+    # Forks of the warmed codebase running diffs concurrently, if enabled
+    workers: SandboxWorkerPool | None = None
 
     def __init__(self, repo_config: RepoConfig, op: RepoOperator | None = None) -> None:
         self.repo = repo_config
         self.op = op or RepoOperator(repo_config=self.repo, setup_option=SetupOption.PULL_OR_CLONE, bot_commit=True)
 
-    async def warmup(self, codebase_config: CodebaseConfig | None = None) -> None:
-        """Warms up this runner by cloning the repo and parsing the graph."""
+    async def warmup(self, codebase_config: CodebaseConfig | None = None, num_workers: int = 0) -> None:
+        """Warms up this runner by cloning the repo and parsing the graph.
+
+        Args:
+            num_workers: Number of processes forked from the warmed codebase to run diffs concurrently, or 0 to run them
+                one at a time on the codebase itself
+        """
         logger.info(f"===== Warming runner for {self.repo.full_name or self.repo.name} =====")
         sys.setrecursionlimit(10000)  # for graph parsing
 
         self.codebase = await self._build_graph(codebase_config)
         self.executor = SandboxExecutor(self.codebase)
+        if num_workers > 0:
+            self.workers = SandboxWorkerPool(self.codebase, size=num_workers)
+            self.workers.start()
 
     async def _build_graph(self, codebase_config: CodebaseConfig | None = None) -> Codebase:
         logger.info("> Building graph...")
         projects = [ProjectConfig(programming_language=self.repo.language, repo_operator=self.op, base_path=self.repo.base_path, subdirectories=self.repo.subdirectories)]
         return Codebase(projects=projects, config=codebase_config)
 
-    async def get_diff(self, request: GetDiffRequest) -> GetDiffResponse:
+    async def get_diff(self, request: GetDiffRequest, use_workers: bool = True) -> GetDiffResponse:
+        """Runs a codemod and returns its diff.
+
+        If the runner has workers (and `use_workers` is set), the codemod runs in one of them and its changes are not
+        written to the working tree. Otherwise it runs on the codebase of the runner, and its changes are left on disk.
+        """
+        if use_workers and self.workers is not None:
+            return await self.workers.get_diff(request)
+
         custom_scope = {"context": request.codemod.codemod_context} if request.codemod.codemod_context else {}
         code_to_exec = create_execute_function_from_codeblock(codeblock=request.codemod.user_code, custom_scope=custom_scope)
         session_options = SessionOptions(max_transactions=request.max_transactions, max_seconds=request.max_seconds)
@@ -0,0 +1,274 @@
+import asyncio
+import gc
+import multiprocessing
+import os
+import signal
+import threading
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import recv_handle, send_handle
+from typing import TYPE_CHECKING
+
+from watchfiles import Change
+
+from graph_sitter.codebase.config import SessionOptions
+from graph_sitter.codebase.factory.codebase_factory import CodebaseType
+from graph_sitter.codebase.io.overlay_io import OverlayIO
+from graph_sitter.codebase.watcher import CodebaseWatcher
+from graph_sitter.runner.models.apis import GetDiffRequest, GetDiffResponse
+from graph_sitter.runner.models.codemod import CodemodRunResult
+from graph_sitter.runner.sandbox.executor import SandboxExecutor
+from graph_sitter.shared.compilation.string_to_code import create_execute_function_from_codeblock
+from graph_sitter.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Worker:
+    pid: int
+    conn: Connection
+    # Generation of the codebase context the worker was forked from
+    generation: int
+
+
+class SandboxWorkerPool:
+    """Runs codemods concurrently in worker processes forked from a warmed codebase.
+
+    Each worker is a copy-on-write fork of the parsed graph that waits for a single `GetDiffRequest`, runs it with its file
+    writes kept in memory (see `OverlayIO`) so that the working tree shared with the parent and the other workers is left
+    untouched, sends back the result and exits. Used workers are replaced by fresh forks instead of being reset, and idle
+    workers forked before the codebase was synced are replaced before being used.
+
+    A child only inherits the thread that forked it, so a lock held by any other thread of the parent (a logging handler,
+    a parser) would stay locked in the child forever. The workers are therefore not forked by the pool's process, which
+    runs requests on threads, but by a template process that `start` forks while the pool's process is still
+    single-threaded, and that never starts a thread. When the codebase was synced since the template's last fork, the
+    template first syncs its copy of the graph with the files on disk (see `_sync_with_disk`). The changes made since the
+    graph was synced to its commit are passed along, so that the diffs of the workers start from the same contents.
+
+    Only previews are supported: changes are never written to disk, pushed or committed. Requires the fork start method
+    (i.e. not available on Windows).
+    """
+
+    codebase: CodebaseType
+    size: int
+    # Seconds to wait for the result of a worker, or None to wait forever
+    timeout: float | None
+
+    def __init__(self, codebase: CodebaseType, size: int, timeout: float | None = None) -> None:
+        self.codebase = codebase
+        self.size = size
+        self.timeout = timeout
+        self._mp_context = multiprocessing.get_context("fork")
+        self._idle: list[_Worker] = []
+        self._running = asyncio.Semaphore(size)
+        self._template: BaseProcess | None = None
+        self._template_conn: Connection | None = None
+        # Forks are requested from threads, the template handles one request at a time
+        self._fork_lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        """Forks the template process, then the idle workers from it.
+
+        Must be called before the process starts any thread, e.g. right after the codebase is parsed.
+        """
+        if threading.active_count() > 1:
+            logger.warning(f"Forking the sandbox template with {threading.active_count()} threads running, it may deadlock")
+        logger.info(f"> Forking {self.size} sandbox workers...")
+        gc.collect()
+        # Move every object to the permanent generation, so that the garbage collector of the template and of the workers
+        # does not write to (and copy) the pages of the graph they share with this process
+        gc.freeze()
+        try:
+            # Stop the persistent `git cat-file` processes, the template would otherwise share their pipes with this process
+            self.codebase._op.git_cli.close()
+            self._template_conn, child_conn = self._mp_context.Pipe()
+            self._template = self._mp_context.Process(target=_run_template, args=(child_conn, self.codebase, self.codebase.ctx.generation), daemon=True)
+            self._template.start()
+            child_conn.close()
+        finally:
+            # Only the template needs the objects frozen, the garbage of this process must still be collected
+            gc.unfreeze()
+        while len(self._idle) < self.size:
+            self._idle.append(self._fork())
+
+    async def get_diff(self, request: GetDiffRequest) -> GetDiffResponse:
+        # Compile the user code here as well, so that invalid code raises in the caller like it does without workers
+        custom_scope = {"context": request.codemod.codemod_context} if request.codemod.codemod_context else {}
+        create_execute_function_from_codeblock(codeblock=request.codemod.user_code, custom_scope=custom_scope)
+
+        async with self._running:
+            worker = await self._checkout()
+            try:
+                result = await asyncio.to_thread(self._run, worker, request)
+            finally:
+                await asyncio.to_thread(self._stop, worker)
+                if not self._closed:
+                    worker = await asyncio.to_thread(self._fork)
+                    # The pool may have been closed while forking
+                    if self._closed:
+                        await asyncio.to_thread(self._stop, worker)
+                    else:
+                        self._idle.append(worker)
+        return GetDiffResponse(result=result)
+
+    def close(self) -> None:
+        """Stops the template and the idle workers. Workers that are running finish their request first."""
+        self._closed = True
+        for worker in self._idle:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            self._stop(worker)
+        self._idle.clear()
+        if self._template is not None:
+            with self._fork_lock:
+                try:
+                    self._template_conn.send(None)
+                except OSError:
+                    pass
+                self._template_conn.close()
+            self._template.join(timeout=1)
+            if self._template.is_alive():
+                self._template.kill()
+                self._template.join()
+
+    async def _checkout(self) -> _Worker:
+        generation = self.codebase.ctx.generation
+        while self._idle:
+            worker = self._idle.pop()
+            # Idle workers never send anything, a readable connection means that the worker exited
+            if worker.generation == generation and not worker.conn.poll():
+                return worker
+            await asyncio.to_thread(self._stop, worker)
+        return await asyncio.to_thread(self._fork)
+
+    def _fork(self) -> _Worker:
+        with self._fork_lock:
+            ctx = self.codebase.ctx
+            generation = ctx.generation
+            try:
+                self._template_conn.send((generation, (ctx.all_syncs, ctx.pending_syncs, ctx.unapplied_diffs)))
+                pid = self._template_conn.recv()
+                conn = Connection(recv_handle(self._template_conn))
+            except (EOFError, OSError) as e:
+                msg = f"Sandbox template exited with code {self._template.exitcode}"
+                raise RuntimeError(msg) from e
+            return _Worker(pid=pid, conn=conn, generation=generation)
+
+    def _run(self, worker: _Worker, request: GetDiffRequest) -> CodemodRunResult:
+        try:
+            worker.conn.send(request.model_dump_json())
+            if not worker.conn.poll(self.timeout):
+                try:
+                    os.kill(worker.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                return CodemodRunResult(is_complete=False, error=f"Codemod timed out after {self.timeout} seconds")
+            return CodemodRunResult.model_validate_json(worker.conn.recv())
+        except (EOFError, OSError):
+            logger.exception(f"Sandbox worker {worker.pid} failed")
+            return CodemodRunResult(is_complete=False, error=f"Sandbox worker {worker.pid} exited without a result")
+
+    def _stop(self, worker: _Worker) -> None:
+        # The worker exits once it sent its result, or as soon as it reads the end of its connection. The template reaps it
+        worker.conn.close()
+
+
+def _run_template(conn: Connection, codebase: CodebaseType, generation: int) -> None:
+    """Entry point of the template: forks a worker for each generation and changes of the pool's codebase it receives, and
+    sends back the pid of the worker and the pool's end of the connection to it.
+
+    Every object was frozen by the pool before forking the template, and is frozen again after each sync.
+    """
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            message = None
+        if message is None:
+            break
+        _reap_workers()
+        pool_generation, (all_syncs, pending_syncs, unapplied_diffs) = message
+        if pool_generation != generation:
+            gc.unfreeze()
+            _sync_with_disk(codebase)
+            gc.collect()
+            gc.freeze()
+            generation = pool_generation
+        codebase.ctx.all_syncs, codebase.ctx.pending_syncs, codebase.ctx.unapplied_diffs = all_syncs, pending_syncs, unapplied_diffs
+        # Stop the persistent `git cat-file` processes used by the sync, the workers would otherwise share their pipes
+        codebase._op.git_cli.close()
+        pool_conn, child_conn = multiprocessing.Pipe()
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            pool_conn.close()
+            _run_worker(child_conn, codebase)
+        child_conn.close()
+        conn.send(pid)
+        send_handle(conn, pool_conn.fileno(), os.getppid())
+        pool_conn.close()
+    conn.close()
+    # Skip the exit handlers and finalizers inherited from the pool's process
+    os._exit(0)
+
+
+def _reap_workers() -> None:
+    """Waits for the workers of the template that exited."""
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+
+
+def _sync_with_disk(codebase: CodebaseType) -> None:
+    """Syncs the graph with the files on disk, to which the pool's codebase writes its changes before syncing its graph.
+
+    Every file of the graph and of the repository is read once, files that did not change are not reparsed.
+    """
+    from graph_sitter.codebase.codebase_context import GLOBAL_FILE_IGNORE_LIST
+
+    ctx = codebase.ctx
+    watcher = CodebaseWatcher(ctx)
+    filepaths = {*ctx.filepath_idx, *ctx.projects[0].repo_operator.get_filepaths_for_repo(GLOBAL_FILE_IGNORE_LIST)}
+    changes = {(Change.modified, str(ctx.to_absolute(filepath))) for filepath in filepaths if filepath}
+    watcher.sync({change for change in changes if watcher.should_watch(*change)})
+
+
+def _run_worker(conn: Connection, codebase: CodebaseType) -> None:
+    """Entry point of the workers: runs a single request against the forked codebase, sends back its result and exits."""
+    try:
+        message = conn.recv()
+    except EOFError:
+        message = None
+    if message is None:
+        os._exit(0)
+
+    try:
+        request = GetDiffRequest.model_validate_json(message)
+        codebase.ctx.io = OverlayIO(codebase.ctx.io)
+        custom_scope = {"context": request.codemod.codemod_context} if request.codemod.codemod_context else {}
+        code_to_exec = create_execute_function_from_codeblock(codeblock=request.codemod.user_code, custom_scope=custom_scope)
+        session_options = SessionOptions(max_transactions=request.max_transactions, max_seconds=request.max_seconds)
+        executor = SandboxExecutor(codebase)
+        result = asyncio.run(executor.execute(code_to_exec, session_options=session_options))
+    except Exception as e:
+        logger.exception(e)
+        result = CodemodRunResult(is_complete=False, error=str(e))
+
+    try:
+        conn.send(result.model_dump_json())
+    finally:
+        conn.close()
+        # Skip the exit handlers and finalizers inherited from the parent
+        os._exit(0)
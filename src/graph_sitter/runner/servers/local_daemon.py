@@ -1,4 +1,5 @@
 import logging
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -8,6 +9,7 @@ from graph_sitter.git.configs.constants import CODEGEN_BOT_EMAIL, CODEGEN_BOT_NA
 from graph_sitter.git.repo_operator.repo_operator import RepoOperator
 from graph_sitter.git.schemas.enums import SetupOption
 from graph_sitter.git.schemas.repo_config import RepoConfig
+from graph_sitter.runner.constants.envvars import SANDBOX_WORKERS
 from graph_sitter.runner.enums.warmup_state import WarmupState
 from graph_sitter.runner.models.apis import (
     RUN_FUNCTION_ENDPOINT,
@@ -51,7 +53,7 @@ async def lifespan(server: FastAPI):
         logger.info(f"Starting up fastapi server for repo_name={repo_config.name}")
         server_info.warmup_state = WarmupState.PENDING
         codebase_config = DefaultCodebaseConfig.model_copy(update={"sync_enabled": True})
-        await runner.warmup(codebase_config=codebase_config)
+        await runner.warmup(codebase_config=codebase_config, num_workers=int(os.environ.get(SANDBOX_WORKERS, 0)))
         server_info.synced_commit = runner.op.head_commit.hexsha
         server_info.warmup_state = WarmupState.COMPLETED
 
@@ -76,7 +78,8 @@ def health() -> ServerInfo:
 async def run(request: RunFunctionRequest) -> CodemodRunResult:
     _save_uncommitted_changes_and_sync()
     diff_req = GetDiffRequest(codemod=Codemod(user_code=request.codemod_source))
-    diff_response = await runner.get_diff(request=diff_req)
+    # Changes made in workers are not written to disk, so they can only be used for previews
+    diff_response = await runner.get_diff(request=diff_req, use_workers=not request.commit)
     if request.commit:
         if commit_sha := runner.codebase.git_commit(f"[Codegen] {request.function_name}", exclude_paths=[".codegen/*"]):
             logger.info(f"Committed changes to {commit_sha.hexsha}")
@@ -1,20 +1,35 @@
 import os
+import sys
 from dataclasses import dataclass
 
 import psutil
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 
 @dataclass
 class MemoryStats:
     memory_rss_gb: float
     memory_vms_gb: float
+    # Highest resident set size of the process so far
+    memory_peak_rss_gb: float
 
 
 def get_memory_stats() -> MemoryStats:
     process = psutil.Process(os.getpid())
     memory_info = process.memory_info()
 
+    if resource is not None:
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    else:
+        peak_rss = getattr(memory_info, "peak_wset", memory_info.rss)
+
     return MemoryStats(
         memory_rss_gb=memory_info.rss / 1024 / 1024 / 1024,
         memory_vms_gb=memory_info.vms / 1024 / 1024 / 1024,
+        memory_peak_rss_gb=max(peak_rss, memory_info.rss) / 1024 / 1024 / 1024,
     )
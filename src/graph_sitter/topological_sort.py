@@ -1,3 +1,5 @@
+from typing import NamedTuple
+
 import rustworkx as nx
 from rustworkx import DAGHasCycle, PyDiGraph
 
@@ -6,39 +8,56 @@ from graph_sitter.shared.logging.get_logger import get_logger
 logger = get_logger(__name__)
 
 
-def pseudo_topological_sort(graph: PyDiGraph, flatten: bool = True):
-    """This will come up with an ordering of nodes within the graph respecting topological"""
-    try:
-        # Try to perform a topological sort
-        sorted_nodes = list(nx.topological_sort(graph))
-        return sorted_nodes
-    except DAGHasCycle:
-        # If a cycle is detected, handle it separately
-        logger.warning("The graph contains a cycle. Performing an approximate topological sort.")
-
-        # Find the strongly connected components in the graph
-        sccs = list(nx.strongly_connected_components(graph))
-
-        if not flatten:
-            return sccs
-
-        # Create a new graph with each strongly connected component as a single node
-        scc_graph = nx.PyDiGraph()
-        for i, scc in enumerate(sccs):
-            scc_graph.add_node(i)
-
-        for u, v in graph.edges():
-            scc_u = next((i for i, scc in enumerate(sccs) if u in scc), None)
-            scc_v = next((i for i, scc in enumerate(sccs) if v in scc), None)
-            if scc_u is None or scc_v is None:
-                continue
-            if scc_u != scc_v:
-                scc_graph.add_edge(scc_u, scc_v, None)
-
-        # Perform a topological sort on the condensed graph
-        sorted_sccs = list(nx.topological_sort(scc_graph))
-
-        # Expand the strongly connected components back to individual nodes
-        sorted_nodes = [node for scc_idx in sorted_sccs for node in sccs[scc_idx]]
-
-        return sorted_nodes
+class Condensation(NamedTuple):
+    """A graph with each strongly connected component contracted into a single node."""
+
+    # Node `i` is component `i`, there is an edge between two components if any of their nodes are connected
+    dag: PyDiGraph
+    # The node indices in each component, in ascending order
+    components: list[list[int]]
+    # The component of each node index
+    membership: dict[int, int]
+
+    def topological_order(self, stable: bool = False) -> list[int]:
+        """Returns the component indices in topological order.
+
+        If `stable` is True, ties are broken by the smallest node index in each component so the order only depends on
+        the graph itself.
+        """
+        if stable:
+            return nx.lexicographical_topological_sort(self.dag, key=lambda idx: f"{self.components[idx][0]:020d}")
+        return list(nx.topological_sort(self.dag))
+
+
+def condense(graph: PyDiGraph) -> Condensation:
+    """Contracts each strongly connected component of the graph into a single node, in O(V + E)."""
+    components = [sorted(scc) for scc in nx.strongly_connected_components(graph)]
+    membership = {node: idx for idx, component in enumerate(components) for node in component}
+    dag = PyDiGraph(multigraph=False)
+    dag.add_nodes_from(range(len(components)))
+    dag.add_edges_from_no_data([(membership[u], membership[v]) for u, v in graph.edge_list() if membership[u] != membership[v]])
+    return Condensation(dag, components, membership)
+
+
+def pseudo_topological_sort(graph: PyDiGraph, flatten: bool = True, stable: bool = False) -> list[int] | list[list[int]]:
+    """This will come up with an ordering of nodes within the graph respecting topological order, treating each cycle
+    as a single node.
+
+    Args:
+        flatten: Return the node indices. Otherwise, return the strongly connected components (as lists of node indices)
+            in topological order.
+        stable: Break ties by node index, so the order only depends on the graph itself. Nodes within a cycle are always
+            ordered by index.
+    """
+    if flatten and not stable:
+        try:
+            # Try to perform a topological sort
+            return list(nx.topological_sort(graph))
+        except DAGHasCycle:
+            logger.warning("The graph contains a cycle. Performing an approximate topological sort.")
+    condensation = condense(graph)
+    components = [condensation.components[idx] for idx in condensation.topological_order(stable=stable)]
+    if not flatten:
+        return components
+    # Expand the strongly connected components back to individual nodes
+    return [node for component in components for node in component]
@@ -1,12 +1,15 @@
 import os
+import re
+import threading
+from bisect import bisect_left
 from os import PathLike
 from pathlib import Path
-from typing import Union
+from typing import NamedTuple, Union
 
 import tree_sitter_javascript as ts_javascript
 import tree_sitter_python as ts_python
 import tree_sitter_typescript as ts_typescript
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Point, Tree
 from tree_sitter import Node as TSNode
 
 from graph_sitter.output.utils import stylize_error
@@ -51,6 +54,7 @@ class _TreeSitterAbstraction:
 
 
 _ts_parser_factory = _TreeSitterAbstraction()
+_thread_local_parsers = threading.local()
 
 
 def get_parser_by_filepath_or_extension(filepath_or_extension: str | PathLike = ".py") -> Parser:
@@ -61,6 +65,22 @@ def get_parser_by_filepath_or_extension(filepath_or_extension: str | PathLike =
     return _ts_parser_factory.extension_to_parser[extension]
 
 
+def get_thread_local_parser(filepath_or_extension: str | PathLike = ".py") -> Parser:
+    """Returns a parser owned by the calling thread.
+
+    tree-sitter parsers are not thread safe, so worker threads must not share the parsers held by `_ts_parser_factory`.
+    """
+    extension = to_extension(filepath_or_extension)
+    if extension not in _ts_parser_factory.extension_to_lang:
+        extension = ".py"
+    parsers = getattr(_thread_local_parsers, "parsers", None)
+    if parsers is None:
+        parsers = _thread_local_parsers.parsers = {}
+    if extension not in parsers:
+        parsers[extension] = Parser(_ts_parser_factory.extension_to_lang[extension])
+    return parsers[extension]
+
+
 def get_lang_by_filepath_or_extension(filepath_or_extension: str = ".py") -> Language:
     extension = to_extension(filepath_or_extension)
     # HACK: we do not currently use a plain text parser, so default to python for now
@@ -69,10 +89,134 @@ def get_lang_by_filepath_or_extension(filepath_or_extension: str = ".py") -> Lan
     return _ts_parser_factory.extension_to_lang[extension]
 
 
-def parse_file(filepath: PathLike, content: str) -> TSNode:
-    parser = get_parser_by_filepath_or_extension(filepath)
-    ts_node = parser.parse(bytes(content, "utf-8")).root_node
-    return ts_node
+def parse_tree(filepath: PathLike, content: str | bytes, thread_local: bool = False, old_tree: Tree | None = None) -> Tree:
+    """Parses the content into a tree-sitter tree.
+
+    If `old_tree` is provided, it must already have been edited (see `TreeEdit`) to match the new content.
+    tree-sitter then reuses the unchanged parts of the old tree instead of parsing the whole file again.
+    """
+    if thread_local:
+        parser = get_thread_local_parser(filepath)
+    else:
+        parser = get_parser_by_filepath_or_extension(filepath)
+    if isinstance(content, str):
+        content = bytes(content, "utf-8")
+    if old_tree is None:
+        return parser.parse(content)
+    return parser.parse(content, old_tree)
+
+
+def parse_file(filepath: PathLike, content: str | bytes, thread_local: bool = False) -> TSNode:
+    return parse_tree(filepath, content, thread_local=thread_local).root_node
+
+
+def copy_tree(filepath: PathLike, tree: Tree) -> Tree:
+    """Copies a tree so that it can be edited without invalidating the nodes that still reference it.
+
+    Tree.copy is not safe to edit in the tree-sitter bindings, but reparsing the content against the old tree reuses every
+    node and is nearly free. The tree only keeps the content from its root node onwards, the whitespace before it is
+    padded with spaces of the same length since reused nodes keep their positions.
+    """
+    root = tree.root_node
+    return parse_tree(filepath, b" " * root.start_byte + root.text, old_tree=tree)
+
+
+def is_parsed_from(tree: Tree, content: bytes) -> bool:
+    """Whether `tree` matches `content`, up to the kind of whitespace before its root node."""
+    root = tree.root_node
+    return root.end_byte == len(content) and _get_point(content, root.start_byte) == root.start_point and root.text == content[root.start_byte :]
+
+
+def _get_point(content: bytes, byte: int) -> Point:
+    row = content.count(b"\n", 0, byte)
+    return Point(row, byte - content.rfind(b"\n", 0, byte) - 1)
+
+
+class PointIndex:
+    """Converts byte offsets in a fixed content to points in O(log n), instead of scanning the content every time."""
+
+    _newlines: list[int]
+
+    def __init__(self, content: bytes) -> None:
+        self._newlines = [match.start() for match in re.finditer(b"\n", content)]
+
+    def __getitem__(self, byte: int) -> Point:
+        row = bisect_left(self._newlines, byte)
+        return Point(row, byte - (self._newlines[row - 1] if row else -1) - 1)
+
+
+class TreeEdit(NamedTuple):
+    """A single edit to a file, in the format expected by `Tree.edit`."""
+
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: Point
+    old_end_point: Point
+    new_end_point: Point
+
+    @classmethod
+    def from_replacement(cls, content: bytes, start_byte: int, end_byte: int, new_bytes: bytes) -> "TreeEdit":
+        """Describes replacing `content[start_byte:end_byte]` with `new_bytes`."""
+        return cls.at_points(start_byte, end_byte, new_bytes, _get_point(content, start_byte), _get_point(content, end_byte))
+
+    @classmethod
+    def at_points(cls, start_byte: int, end_byte: int, new_bytes: bytes, start_point: Point, old_end_point: Point) -> "TreeEdit":
+        """Describes replacing the bytes between `start_point` and `old_end_point` with `new_bytes`."""
+        return cls(start_byte, end_byte, start_byte + len(new_bytes), start_point, old_end_point, _advance_point(start_point, new_bytes))
+
+    @classmethod
+    def from_diff(cls, old_content: bytes, new_content: bytes) -> "TreeEdit":
+        """Describes the change between two versions of a file as a single edit spanning every modified byte."""
+        prefix = _common_prefix_length(old_content, new_content)
+        suffix = _common_suffix_length(old_content, new_content, min(len(old_content), len(new_content)) - prefix)
+        return cls.from_replacement(old_content, prefix, len(old_content) - suffix, new_content[prefix : len(new_content) - suffix])
+
+    @classmethod
+    def from_tree(cls, tree: Tree, new_content: bytes) -> "TreeEdit":
+        """Describes the change between the content `tree` was parsed from and `new_content` as a single edit.
+
+        The tree only keeps the content from its root node onwards, so if the file starts with whitespace the edit starts
+        at the beginning of the file.
+        """
+        root = tree.root_node
+        old_text = root.text
+        if root.start_byte == 0:
+            return cls.from_diff(old_text, new_content)
+        suffix = _common_suffix_length(old_text, new_content, min(len(old_text), len(new_content)))
+        old_end_point = _advance_point(root.start_point, old_text[: len(old_text) - suffix])
+        return cls.at_points(0, root.end_byte - suffix, new_content[: len(new_content) - suffix], Point(0, 0), old_end_point)
+
+
+def _advance_point(point: Point, text: bytes) -> Point:
+    """The point after `text` if it starts at `point`."""
+    newlines = text.count(b"\n")
+    if newlines == 0:
+        return Point(point.row, point.column + len(text))
+    return Point(point.row + newlines, len(text) - text.rfind(b"\n") - 1)
+
+
+# Binary search the common prefix and suffix, comparing slices is much faster than iterating bytes in python
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(a: bytes, b: bytes, max_length: int) -> int:
+    lo, hi = 0, max_length
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
 
 
 def print_errors(filepath: PathLike, content: str) -> None:
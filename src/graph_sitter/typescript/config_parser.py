@@ -4,10 +4,13 @@ from typing import TYPE_CHECKING
 from graph_sitter.codebase.config_parser import ConfigParser
 from graph_sitter.core.file import File
 from graph_sitter.enums import NodeType
-from graph_sitter.typescript.ts_config import TSConfig
+from graph_sitter.typescript.module_index import TSModuleIndex
+from graph_sitter.typescript.ts_config import ImportAliasTrie, TSConfig
 
 if TYPE_CHECKING:
-    from graph_sitter.codebase.codebase_context import CodebaseContext
+    from collections.abc import Iterable, Mapping
+
+    from graph_sitter.codebase.codebase_context import CodebaseContext, SyncType
     from graph_sitter.typescript.file import TSFile
 
 import os
@@ -18,12 +21,18 @@ class TSConfigParser(ConfigParser):
     # Cache of path names to TSConfig objects
     config_files: dict[Path, TSConfig]
     ctx: "CodebaseContext"
+    # Files by the module paths that resolve to them, used for import resolution
+    module_index: TSModuleIndex
+    # import_resolution_overrides the override trie was built from, and the trie
+    _overrides: tuple[dict[str, str], ImportAliasTrie] | None
 
     def __init__(self, codebase_context: "CodebaseContext", default_config_name: str = "tsconfig.json"):
         super().__init__()
         self.config_files = dict()
         self.ctx = codebase_context
         self.default_config_name = default_config_name
+        self.module_index = TSModuleIndex(codebase_context)
+        self._overrides = None
 
     def get_config(self, config_path: os.PathLike) -> TSConfig | None:
         path = self.ctx.to_absolute(config_path)
@@ -34,7 +43,21 @@ class TSConfigParser(ConfigParser):
             return self.config_files.get(path)
         return None
 
-    def parse_configs(self):
+    @property
+    def import_resolution_override_trie(self) -> ImportAliasTrie:
+        """Prefix tree of the `import_resolution_overrides` of the codebase config."""
+        overrides = self.ctx.config.import_resolution_overrides
+        if self._overrides is None or self._overrides[0] != overrides:
+            self._overrides = (dict(overrides), ImportAliasTrie(overrides.keys()))
+        return self._overrides[1]
+
+    def parse_configs(self, changed_files: "Mapping[Path, SyncType] | None" = None):
+        """Sets the `ts_config` of the files to the config of their closest directory with one.
+
+        If `changed_files` is given, only the configs among them (and the configs extending them) are parsed again, and
+        only the files added or under a directory whose config may have changed are assigned their config again.
+        """
+
         # This only yields a 0.05s speedup, but its funny writing dynamic programming code
         @cache
         def get_config_for_dir(dir_path: Path) -> TSConfig | None:
@@ -50,8 +73,19 @@ class TSConfigParser(ConfigParser):
                 return get_config_for_dir(dir_path.parent)
             return None
 
-        # Get all the files in the codebase
-        for file in self.ctx.get_nodes(NodeType.FILE):
+        self.module_index.refresh()
+
+        if changed_files is None:
+            # Get all the files in the codebase
+            files = self.ctx.get_nodes(NodeType.FILE)
+            configs_changed = True
+        else:
+            changed_paths = [self.ctx.to_absolute(file_path) for file_path in changed_files]
+            changed_dirs = self._drop_changed_configs(path for path in changed_paths if path.name == self.default_config_name or path in self.config_files)
+            files = self._get_files_to_assign(changed_paths, changed_dirs)
+            configs_changed = len(changed_dirs) > 0
+
+        for file in files:
             file: TSFile  # This should be safe because we only call this on TSFiles
             # Get the config for the directory the file is in
             config = get_config_for_dir(file.path.parent)
@@ -60,4 +94,46 @@ class TSConfigParser(ConfigParser):
 
         # Loop through all the configs and precompute their import aliases
         for config in self.config_files.values():
+            if configs_changed:
+                # Aliases of references depend on the configs of the referenced files
+                config._computed_path_import_aliases = False
             config._precompute_import_aliases()
+
+    def _drop_changed_configs(self, changed_configs: "Iterable[Path]") -> list[Path]:
+        """Drops the cached configs of the changed config files and of the configs extending them, so that they are
+        parsed again.
+
+        Returns:
+            The directories of the configs, whose files may be governed by a different config.
+        """
+        changed_configs = set(changed_configs)
+        if not changed_configs:
+            return []
+        for path, config in list(self.config_files.items()):
+            base_config, seen = config, set()
+            # Walk the extends chain, which may be cyclic
+            while base_config is not None and base_config not in seen:
+                if base_config.config_file.path in changed_configs:
+                    changed_configs.add(path)
+                    break
+                seen.add(base_config)
+                base_config = base_config.base_config
+        for path in changed_configs:
+            self.config_files.pop(path, None)
+        return [path.parent for path in changed_configs]
+
+    def _get_files_to_assign(self, changed_paths: list[Path], changed_dirs: list[Path]) -> "Iterable[TSFile]":
+        """Returns the changed files of the graph, and all the files under the given directories."""
+        files = {}
+        for path in changed_paths:
+            if (file := self.ctx.get_file(path)) is not None:
+                files[file.node_id] = file
+        if changed_dirs:
+            dirpaths = [os.path.join(self.ctx.to_relative(dir_path), "") for dir_path in changed_dirs]
+            # The repository root is the prefix of every file
+            if os.path.join(".", "") in dirpaths:
+                dirpaths = [""]
+            for file in self.ctx.get_nodes(NodeType.FILE):
+                if file.filepath.startswith(tuple(dirpaths)):
+                    files[file.node_id] = file
+        return files.values()
@@ -243,34 +243,20 @@ class TSImport(Import["TSFile"], Exportable):
             else:
                 import_source = os.path.normpath(import_source)
 
-            # covers the case where the import is from a directory ex: "import { postExtract } from './post'"
-            import_name = import_source.split("/")[-1]
-            if "." not in import_name:
-                possible_paths = ["index.ts", "index.js", "index.tsx", "index.jsx"]
-                for p_path in possible_paths:
-                    if self.ctx.to_absolute(os.path.join(import_source, p_path)).exists():
-                        import_source = os.path.join(import_source, p_path)
-                        break
-
-            # Loop through all extensions and try to find the file
-            extensions = ["", ".ts", ".d.ts", ".tsx", ".d.tsx", ".js", ".jsx"]
-            # Try both filename with and without extension
-            for import_source_base in (import_source, os.path.splitext(import_source)[0]):
-                for extension in extensions:
-                    import_source_ext = import_source_base + extension
-                    if file := self.ctx.get_file(import_source_ext):
-                        if self.is_module_import():
-                            return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                        else:
-                            # If the import is a named import, resolve to the named export in the file
-                            if self.symbol_name is None:
-                                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                            export_symbol = file.get_export(export_name=self.symbol_name.source)
-                            if export_symbol is None:
-                                # If the named export is not found, it is importing a module re-export.
-                                # In this case, resolve to the file itself and dynamically resolve the symbol later.
-                                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                            return ImportResolution(from_file=file, symbol=export_symbol)
+            # Find the file, trying the `index` files of directories and the possible extensions
+            if file := self.ctx.config_parser.module_index.resolve(import_source):
+                if self.is_module_import():
+                    return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                else:
+                    # If the import is a named import, resolve to the named export in the file
+                    if self.symbol_name is None:
+                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                    export_symbol = file.get_export(export_name=self.symbol_name.source)
+                    if export_symbol is None:
+                        # If the named export is not found, it is importing a module re-export.
+                        # In this case, resolve to the file itself and dynamically resolve the symbol later.
+                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                    return ImportResolution(from_file=file, symbol=export_symbol)
 
             # If the imported file is not found, treat it as an external module
             return None
@@ -0,0 +1,81 @@
+import os
+from bisect import insort
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from graph_sitter.codebase.module_index import ModuleIndex
+
+if TYPE_CHECKING:
+    from graph_sitter.codebase.codebase_context import CodebaseContext
+    from graph_sitter.typescript.file import TSFile
+
+# Files tried when importing a directory, in order
+INDEX_FILES = ("index.ts", "index.js", "index.tsx", "index.jsx")
+# Extensions appended to a module path, in order of precedence
+MODULE_EXTENSIONS = ("", ".ts", ".d.ts", ".tsx", ".d.tsx", ".js", ".jsx")
+
+
+class TSModuleIndex(ModuleIndex["TSFile"]):
+    """Index of the files of a codebase by the module paths that resolve to them.
+
+    A file `a/b.d.ts` can be imported as `a/b.d.ts`, `a/b.d` or `a/b`, so it is indexed under each of these paths along
+    with the precedence of the extension that was added. Resolving a module path is then a couple of dict lookups
+    instead of probing every extension (and the `index.*` files on disk) one by one.
+
+    The index follows the files of the graph: it is refreshed once per sync by `TSConfigParser.parse_configs`, and
+    lookups check that the files they return are still part of the graph.
+    """
+
+    # Module path -> (precedence of the extension, file path) of the files it resolves to, sorted by precedence
+    _modules: dict[str, list[tuple[int, str]]]
+
+    def __init__(self, ctx: "CodebaseContext") -> None:
+        super().__init__(ctx)
+        self._modules = {}
+
+    def resolve(self, module_path: str) -> "TSFile | None":
+        """Returns the file a normalized module path (relative to the repository, or absolute) resolves to.
+
+        Same as trying `index.{ts,js,tsx,jsx}` for directories, then each of `MODULE_EXTENSIONS` on the module path and
+        finally on the module path without its extension.
+        """
+        self._check_files()
+        if os.path.isabs(module_path):
+            if not self.ctx.is_subdir(module_path) and not self.ctx.config.allow_external:
+                return None
+            module_path = str(self.ctx.to_relative(module_path))
+
+        # Covers the case where the import is from a directory ex: "import { postExtract } from './post'"
+        if "." not in module_path.rsplit("/", 1)[-1]:
+            for index_file in INDEX_FILES:
+                if (file := self._get_file(os.path.join(module_path, index_file))) is not None:
+                    return file
+        if (file := self._get_module(module_path)) is not None:
+            return file
+        stem = os.path.splitext(module_path)[0]
+        if stem != module_path:
+            return self._get_module(stem)
+        return None
+
+    def _get_module(self, module_path: str) -> "TSFile | None":
+        for _, filepath in self._modules.get(module_path, ()):
+            if (file := self._get_file(filepath)) is not None:
+                return file
+        return None
+
+    def _add(self, filepath: str) -> None:
+        for module_path, rank in _module_paths(filepath):
+            insort(self._modules.setdefault(module_path, []), (rank, filepath))
+
+    def _remove(self, filepath: str) -> None:
+        for module_path, rank in _module_paths(filepath):
+            candidates = self._modules[module_path]
+            candidates.remove((rank, filepath))
+            if not candidates:
+                del self._modules[module_path]
+
+
+def _module_paths(filepath: str) -> list[tuple[str, int]]:
+    """Returns the module paths that resolve to a file, with the precedence of the extension added to each."""
+    name = Path(filepath).name
+    return [(filepath.removesuffix(extension), rank) for rank, extension in enumerate(MODULE_EXTENSIONS) if name.endswith(extension) and name != extension]
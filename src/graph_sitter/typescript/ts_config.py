@@ -1,5 +1,5 @@
 import os
-from functools import cache
+from collections.abc import Iterable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -17,6 +17,39 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+class ImportAliasTrie:
+    """Prefix tree of import path aliases by path segment, to find the alias of an import path in a single walk."""
+
+    # Path segment -> subtree. The alias ending at a node is stored under the `None` key
+    _root: dict
+
+    def __init__(self, aliases: Iterable[str]):
+        self._root = {}
+        for alias in aliases:
+            node = self._root
+            for part in alias.split("/"):
+                node = node.setdefault(part, {})
+            node[None] = alias
+
+    def find(self, path: str) -> str | None:
+        """Returns the longest alias that `path` is, or is in (e.g. `@app` or `@app/` for `@app/utils`)."""
+        match = None
+        node = self._root
+        prefix_length = -1
+        for part in path.split("/"):
+            node = node.get(part, None)
+            if node is None:
+                break
+            prefix_length += len(part) + 1
+            # Empty paths and `/` never match
+            if path[:prefix_length].strip("/"):
+                if (alias := node.get(None, None)) is not None:
+                    match = alias
+                elif (alias := node.get("", {}).get(None, None)) is not None:
+                    match = alias
+        return match
+
+
 @ts_apidoc
 class TSConfig:
     """TypeScript configuration file specified in tsconfig.json, used for import resolution and computing dependencies.
@@ -55,10 +88,16 @@ class TSConfig:
     # Optimization hack. If all the path alises start with `@` or `~`, then we can skip any path that doesn't start with `@` or `~`
     # when computing the import resolution.
     _import_optimization_enabled: bool = False
+    # Prefix trees of the keys of _path_import_aliases and _reference_import_aliases
+    _path_alias_trie: ImportAliasTrie = ImportAliasTrie(())
+    _reference_alias_trie: ImportAliasTrie = ImportAliasTrie(())
+    # Memo of translate_import_path, the translation only depends on this config and its base configs
+    _translated_import_paths: dict[str, str]
 
     def __init__(self, config_file: File, config_parser: "TSConfigParser"):
         self.config_file = config_file
         self.config_parser = config_parser
+        self._translated_import_paths = {}
         # Try to parse the config file as JSON5. Fallback to empty dict if it fails.
         # We use json5 because it supports comments in the config file.
         try:
@@ -223,6 +262,9 @@ class TSConfig:
 
         # Precompute _import_optimization_enabled
         self._import_optimization_enabled = all(k.startswith("@") or k.startswith("~") for k in list(self.path_import_aliases.keys()) + list(self.reference_import_aliases.keys()))
+        self._path_alias_trie = ImportAliasTrie(self._path_import_aliases.keys())
+        self._reference_alias_trie = ImportAliasTrie(self._reference_import_aliases.keys())
+        self._translated_import_paths.clear()
 
         # Mark that we've precomputed the import aliases
         self._computed_path_import_aliases = True
@@ -257,13 +299,19 @@ class TSConfig:
         Returns:
             str: The translated absolute path. If no matching path alias is found, returns the original import path unchanged.
         """
+        translated = self._translated_import_paths.get(import_path, None)
+        if translated is None:
+            translated = self._translated_import_paths[import_path] = self._translate_import_path(import_path)
+        return translated
+
+    def _translate_import_path(self, import_path: str) -> str:
         # Break out early if we can
         if self._import_optimization_enabled and not import_path.startswith("@") and not import_path.startswith("~"):
             return import_path
 
         # Step 1: Try to resolve with import_resolution_overrides
         if self.config_file.ctx.config.import_resolution_overrides:
-            if path_check := TSConfig._find_matching_path(frozenset(self.config_file.ctx.config.import_resolution_overrides.keys()), import_path):
+            if path_check := self.config_parser.import_resolution_override_trie.find(import_path):
                 to_base = self.config_file.ctx.config.import_resolution_overrides[path_check]
 
                 # Get the remaining path after the matching prefix
@@ -275,9 +323,9 @@ class TSConfig:
                 return import_path
 
         # Step 2: Keep traveling down the parent config paths until we find a match a reference_import_aliases
-        if path_check := TSConfig._find_matching_path(frozenset(self.reference_import_aliases.keys()), import_path):
+        if path_check := self._reference_alias_trie.find(import_path):
             # TODO: This assumes that there is only one to_base path for the given from_base path
-            to_base = self.reference_import_aliases[path_check][0]
+            to_base = str(self.config_file.ctx.to_relative(self._reference_import_aliases[path_check][0]))
 
             # Get the remaining path after the matching prefix
             remaining_path = import_path[len(path_check) :].lstrip("/")
@@ -288,7 +336,7 @@ class TSConfig:
             return import_path
 
         # Step 3: Keep traveling down the parent config paths until we find a match a path_import_aliases
-        if path_check := TSConfig._find_matching_path(frozenset(self.path_import_aliases.keys()), import_path):
+        if path_check := self._path_alias_trie.find(import_path):
             # TODO: This assumes that there is only one to_base path for the given from_base path
             to_base = self.path_import_aliases[path_check][0]
 
@@ -347,22 +395,6 @@ class TSConfig:
         else:
             return import_path
 
-    @staticmethod
-    @cache
-    def _find_matching_path(path_import_aliases: set[str], path_check: str):
-        """Recursively find the longest matching path in path_import_aliases."""
-        # Base case
-        if not path_check or path_check == "/":
-            return None
-
-        # Recursive case
-        if path_check in path_import_aliases:
-            return path_check
-        elif f"{path_check}/" in path_import_aliases:
-            return f"{path_check}/"
-        else:
-            return TSConfig._find_matching_path(path_import_aliases, os.path.dirname(path_check))
-
     @property
     def base_config(self) -> "TSConfig | None":
         """Returns the base TSConfig that this config inherits from.
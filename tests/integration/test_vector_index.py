@@ -44,7 +44,7 @@ def greet(name: str):
         save_dir = Path(tmpdir) / ".codegen"
         index.save()
         assert save_dir.exists()
-        saved_files = list(save_dir.glob("file_index_*.pkl"))
+        saved_files = list(save_dir.glob("file_index_*"))
         assert len(saved_files) == 1
 
         # Test loading
@@ -118,7 +118,7 @@ def test_file_index_invalid_operations(tmpdir) -> None:
 
         # Test loading from non-existent path
         with pytest.raises(FileNotFoundError):
-            index.load("nonexistent.pkl")
+            index.load("nonexistent")
 
 
 def test_file_index_binary_files(tmpdir) -> None:
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.extensions.lsp.progress import LSPProgress
+from graph_sitter.extensions.lsp.sync import SyncScheduler
+
+
+@pytest.mark.parametrize(
+    "original",
+    [{"a.py": "def foo():\n    pass\n", "b.py": "def bar():\n    pass\n"}],
+)
+async def test_sync_coalesces_changes(codebase: Codebase, mocker) -> None:
+    progress = mocker.MagicMock(spec=LSPProgress)
+    scheduler = SyncScheduler(codebase.ctx, progress, debounce=60)
+    sync_threads = []
+
+    def apply_diffs_on_thread(diffs, original=codebase.ctx.apply_diffs) -> None:
+        sync_threads.append(threading.current_thread())
+        original(diffs)
+
+    apply_diffs = mocker.patch.object(codebase.ctx, "apply_diffs", side_effect=apply_diffs_on_thread)
+    a = codebase.repo_path / "a.py"
+    b = codebase.repo_path / "b.py"
+    for idx in range(3):
+        a.write_text(f"def foo{idx}():\n    pass\n")
+        scheduler.schedule(DiffLite(change_type=ChangeType.Modified, path=a))
+    b.write_text("def baz():\n    pass\n")
+    scheduler.schedule(DiffLite(change_type=ChangeType.Modified, path=b))
+    assert scheduler.queue_depth == 2
+
+    # Bypassing the pending changes leaves the graph as is
+    async with scheduler.read(wait=False):
+        assert codebase.get_file("a.py").get_function("foo") is not None
+    apply_diffs.assert_not_called()
+
+    async with scheduler.read():
+        assert codebase.get_file("a.py").get_function("foo2") is not None
+        assert codebase.get_file("a.py").get_function("foo") is None
+        assert codebase.get_file("b.py").get_function("baz") is not None
+    apply_diffs.assert_called_once()
+    assert len(apply_diffs.call_args.args[0]) == 2
+    assert scheduler.queue_depth == 0
+    assert scheduler.last_sync_latency is not None
+    progress.begin_nowait.assert_called_once_with("Syncing graph", count=2)
+    progress.begin_nowait.return_value.end.assert_called_once()
+    # The pending changes are applied off the event loop
+    assert sync_threads != [threading.current_thread()]
+
+
+@pytest.mark.parametrize(
+    "original",
+    [{"a.py": "def foo():\n    pass\n"}],
+)
+async def test_sync_debounce(codebase: Codebase, mocker) -> None:
+    scheduler = SyncScheduler(codebase.ctx, mocker.MagicMock(spec=LSPProgress), debounce=0.05)
+    a = codebase.repo_path / "a.py"
+    a.write_text("def bar():\n    pass\n")
+    scheduler.schedule(DiffLite(change_type=ChangeType.Modified, path=a))
+    deadline = time.monotonic() + 10
+    while scheduler.last_sync_latency is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    async with scheduler.read(wait=False):
+        assert scheduler.queue_depth == 0
+        assert codebase.get_file("a.py").get_function("bar") is not None
+
+
+async def test_sync_progress_from_thread(mocker) -> None:
+    server = mocker.MagicMock()
+    threads = []
+    server.work_done_progress.create.side_effect = lambda token: threads.append(threading.current_thread())
+    server.work_done_progress.end.side_effect = lambda token, value: threads.append(threading.current_thread())
+    progress = LSPProgress(server)
+    # Syncs begin their progress on a background thread, the notifications are still sent from the event loop
+    task = await asyncio.to_thread(progress.begin_nowait, "Syncing graph")
+    await asyncio.to_thread(task.end)
+    await asyncio.sleep(0)
+    assert threads == [threading.current_thread()] * 2
@@ -0,0 +1,82 @@
+import os
+import threading
+
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.extensions.mcp.codebase_pool import CodebasePool
+from graph_sitter.git.repo_operator.repo_operator import RepoOperator
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+
+
+def make_repo(path, files: dict[str, str]) -> str:
+    RepoOperator.create_from_files(repo_path=str(path), files=files)
+    return str(path)
+
+
+def test_codebase_pool_refresh(tmp_path) -> None:
+    builds = []
+
+    def factory(**kwargs) -> Codebase:
+        builds.append(kwargs["repo_path"])
+        return Codebase(**kwargs)
+
+    repo = make_repo(tmp_path / "repo", {"a.py": "def foo():\n    pass\n", "b.py": "def bar():\n    pass\n"})
+    pool = CodebasePool(factory=factory)
+    with pool.acquire(repo, "python") as codebase:
+        assert codebase.get_function("foo") is not None
+    with pool.acquire(repo, ProgrammingLanguage.PYTHON) as cached:
+        assert cached is codebase
+    assert len(builds) == 1
+
+    (tmp_path / "repo" / "a.py").write_text("def foo2():\n    pass\n")
+    (tmp_path / "repo" / "b.py").unlink()
+    (tmp_path / "repo" / "c.py").write_text("def baz():\n    pass\n")
+    with pool.acquire(repo, "python") as cached:
+        assert cached is codebase
+        assert codebase.get_function("foo2") is not None
+        assert codebase.get_file("b.py", optional=True) is None
+        assert codebase.get_function("baz") is not None
+    assert len(builds) == 1
+
+    # Touched but unchanged files are not resynced
+    generation = codebase.ctx.generation
+    os.utime(tmp_path / "repo" / "c.py", ns=(0, 0))
+    with pool.acquire(repo, "python"):
+        assert codebase.ctx.generation == generation
+
+
+def test_codebase_pool_eviction(tmp_path) -> None:
+    repos = [make_repo(tmp_path / f"repo{idx}", {"a.py": "x = 1\n"}) for idx in range(3)]
+    pool = CodebasePool(max_size=2)
+    for repo in repos:
+        with pool.acquire(repo, "python"):
+            pass
+    assert len(pool) == 2
+    assert pool.get_key(repos[0], "python") not in pool._entries
+
+    pool.max_nodes = 0
+    with pool.acquire(repos[1], "python"):
+        pass
+    # The most recently used codebase is kept even when it is over budget
+    assert list(pool._entries) == [pool.get_key(repos[1], "python")]
+
+
+def test_codebase_pool_serializes_calls(tmp_path) -> None:
+    repo = make_repo(tmp_path / "repo", {"a.py": "x = 1\n"})
+    pool = CodebasePool()
+    active = []
+    overlaps = []
+
+    def call() -> None:
+        with pool.acquire(repo, "python") as codebase:
+            active.append(codebase)
+            overlaps.append(len(active))
+            codebase.get_file("a.py")
+            active.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == [1, 1, 1, 1]
+    assert len(pool) == 1
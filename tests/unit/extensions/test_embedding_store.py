@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from graph_sitter.extensions.index.embedding_store import EmbeddingStore
+
+
+def brute_force_top_k(ids: list[str], vectors: np.ndarray, query: np.ndarray, k: int) -> list[str]:
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = vectors @ (query / np.linalg.norm(query))
+    return [ids[idx] for idx in np.argsort(-scores, kind="stable")[:k]]
+
+
+def test_embedding_store_upsert_delete() -> None:
+    store = EmbeddingStore()
+    store.upsert(["a", "b"], [[1, 0], [0, 1]])
+    store.upsert(["c"], [[3, 4]])
+    assert store.ids == ["a", "b", "c"]
+    np.testing.assert_allclose(store.vectors[2], [0.6, 0.8])
+
+    # Replacing an item keeps its row
+    store.upsert(["a", "d"], [[0, 2], [1, 1]])
+    assert store.ids == ["a", "b", "c", "d"]
+    np.testing.assert_allclose(store.vectors[0], [0, 1])
+
+    store.delete(["b", "missing"])
+    assert "b" not in store
+    assert len(store) == 3
+    assert store.tombstones == 1
+    assert store.ids == ["a", "c", "d"]
+    assert [item_id for item_id, _ in store.search([1, 0], k=5)[0]] == ["d", "c", "a"]
+
+    store.compact()
+    assert store.tombstones == 0
+    assert store.ids == ["a", "c", "d"]
+
+    with pytest.raises(ValueError, match="dimensions"):
+        store.upsert(["e"], [[1, 2, 3]])
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float16])
+def test_embedding_store_search(dtype, monkeypatch) -> None:
+    monkeypatch.setattr(EmbeddingStore, "ROW_BATCH_SIZE", 37)
+    monkeypatch.setattr(EmbeddingStore, "QUERY_BATCH_SIZE", 3)
+    rng = np.random.default_rng(0)
+    ids = [f"item{idx}" for idx in range(500)]
+    vectors = rng.standard_normal((500, 16))
+    queries = rng.standard_normal((7, 16))
+    store = EmbeddingStore(dtype=dtype)
+    for start in range(0, 500, 50):
+        store.upsert(ids[start : start + 50], vectors[start : start + 50])
+
+    results = store.search(queries, k=5)
+    assert len(results) == len(queries)
+    for query, result in zip(queries, results):
+        scores = [score for _, score in result]
+        assert scores == sorted(scores, reverse=True)
+        if dtype == np.float32:
+            assert [item_id for item_id, _ in result] == brute_force_top_k(ids, vectors, query, 5)
+    assert len(store.search(queries[0], k=1000)[0]) == 500
+
+
+def test_embedding_store_save_load(tmp_path) -> None:
+    store = EmbeddingStore()
+    store.metadata["commit_hash"] = "abc"
+    store.upsert(["a", "b", "c"], [[1, 0], [0, 1], [1, 1]])
+    store.delete(["b"])
+    store.save(tmp_path / "index")
+
+    loaded = EmbeddingStore.load(tmp_path / "index")
+    assert loaded.metadata == {"commit_hash": "abc"}
+    assert loaded.ids == ["a", "c"]
+    assert loaded.tombstones == 0
+    np.testing.assert_allclose(loaded.vectors, store.vectors)
+
+    # Changes to a memory mapped store are not written back until it is saved
+    loaded.upsert(["a", "d"], [[0, 1], [1, 0]])
+    assert loaded.search([1, 0], k=1)[0][0][0] == "d"
+    reloaded = EmbeddingStore.load(tmp_path / "index", mmap=False)
+    assert reloaded.ids == ["a", "c"]
+    np.testing.assert_allclose(reloaded.vectors[0], [1, 0])
+
+
+def test_embedding_store_save_over_mapped_file(tmp_path) -> None:
+    store = EmbeddingStore()
+    store.upsert(["a", "b"], [[1, 0], [0, 1]])
+    store.save(tmp_path / "index")
+
+    # The vectors are still mapped from the file being replaced
+    loaded = EmbeddingStore.load(tmp_path / "index")
+    loaded.upsert(["a"], [[1, 1]])
+    loaded.save(tmp_path / "index")
+    loaded.save(tmp_path / "index")
+
+    reloaded = EmbeddingStore.load(tmp_path / "index")
+    assert reloaded.ids == ["a", "b"]
+    np.testing.assert_allclose(reloaded.vectors, [[2**-0.5, 2**-0.5], [0, 1]], rtol=1e-6)
+    assert sorted(path.name for path in (tmp_path / "index").iterdir()) == ["ids.json", "metadata.json", "vectors.npy"]
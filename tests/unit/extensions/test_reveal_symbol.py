@@ -0,0 +1,40 @@
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.extensions.tools.reveal_symbol import get_extended_context
+
+
+def test_reveal_symbol_extended_context(tmpdir) -> None:
+    # language=python
+    content = """
+def helper():
+    pass
+
+def other():
+    helper()
+
+def target():
+    helper()
+
+def caller():
+    target()
+    util()
+
+def util():
+    pass
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        target = codebase.get_file("test.py").get_function("target")
+
+        dependencies, usages, _ = get_extended_context(target, 1)
+        assert [info.name for info in dependencies] == ["helper"]
+        assert [info.name for info in usages] == ["caller"]
+        # The second degree includes the usages of the dependencies and the dependencies of the usages
+        dependencies, usages, total_tokens = get_extended_context(target, 2)
+        assert [info.name for info in dependencies] == ["helper", "util"]
+        assert [info.name for info in usages] == ["other", "caller"]
+        assert get_extended_context(target, 2) == (dependencies, usages, total_tokens)
+
+        codebase.get_file("test.py").get_function("util").insert_after("\n\ndef last():\n    target()\n")
+        codebase.commit()
+        target = codebase.get_file("test.py").get_function("target")
+        _, usages, _ = get_extended_context(target, 2)
+        assert [info.name for info in usages] == ["other", "last", "caller"]
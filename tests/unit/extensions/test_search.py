@@ -0,0 +1,98 @@
+import random
+import re
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.codebase.search_index import TrigramIndex, compile_query
+from graph_sitter.extensions.tools.search import search
+
+
+@pytest.mark.parametrize(
+    "query, use_regex, case_sensitive",
+    [
+        ("foo_bar", False, True),
+        ("FOO", False, False),
+        ("a.b", False, True),
+        ("ab", False, True),
+        (r"def \w+\(x\)", True, True),
+        (r"(?i)RETURN\s+\d+", True, True),
+        (r"foo|bar", True, True),
+        (r"(abc)+d?ef", True, True),
+        (r"caf[eé]", True, True),
+        ("CAFÉ", False, False),
+    ],
+)
+def test_trigram_index_candidates(query: str, use_regex: bool, case_sensitive: bool) -> None:
+    rng = random.Random(0)
+    words = ["foo_bar", "FOO", "a.b", "def f(x)", "return 42", "RETURN 7", "abcabcef", "abcdef", "café", "CAFÉ", "bar", "ab"]
+    index = TrigramIndex()
+    index.MIN_COMPACT_SIZE = 8
+    contents = {}
+    for idx in range(60):
+        path = Path(f"/repo/file{idx}.py")
+        contents[path] = " ".join(rng.sample(words, 3)).encode()
+        index.add(path, contents[path])
+    # Re-index and remove some files after the last compaction
+    for idx in range(0, 60, 7):
+        path = Path(f"/repo/file{idx}.py")
+        contents[path] = b"nothing to see"
+        index.add(path, contents[path])
+    for idx in range(3, 60, 11):
+        index.remove(Path(f"/repo/file{idx}.py"))
+        del contents[Path(f"/repo/file{idx}.py")]
+
+    pattern, trigrams = compile_query(query, use_regex=use_regex, case_sensitive=case_sensitive)
+    candidates = index.candidates(trigrams)
+    expected = sorted(path for path, content in contents.items() if pattern.search(content))
+    assert set(expected) <= set(candidates)
+    assert candidates == sorted(candidates)
+    index.compact()
+    assert index.candidates(trigrams) == candidates
+
+
+def test_compile_query_prunes() -> None:
+    assert len(compile_query("ab")[1]) == 0
+    assert len(compile_query("foo|bar", use_regex=True)[1]) == 0
+    _, trigrams = compile_query(r"foo\w+bar", use_regex=True)
+    assert len(trigrams) == 2
+    with pytest.raises(re.error):
+        compile_query("foo(", use_regex=True)
+    assert np.array_equal(compile_query("Foo", case_sensitive=False)[1], compile_query("foo")[1])
+
+
+def test_search_tool(tmpdir) -> None:
+    files = {
+        "src/a.py": "def helper(x):\n    return x + 1\n\n\ndef other():\n    return helper(2)\n",
+        "src/b.py": "from src.a import helper\n\nVALUE = helper(3)\n",
+        "tests/test_a.py": "def test_it():\n    assert helper\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        result = search(codebase, "helper(")
+        assert result["total_files"] == 2
+        # tests/test_a.py is pruned by the index without being read
+        assert result["files_searched"] == 2
+        assert [file["filepath"] for file in result["results"]] == ["src/a.py", "src/b.py"]
+        matches = result["results"][0]["matches"]
+        assert [(match["line_number"], match["line"]) for match in matches] == [(1, "def helper(x):"), (6, "    return helper(2)")]
+        assert matches[1]["symbol"] == "other"
+
+        assert search(codebase, "HELPER", case_sensitive=False)["total_files"] == 3
+        assert search(codebase, "helper", target_directories=["tests"])["total_files"] == 1
+        assert search(codebase, "helper", file_extensions=[".ts"])["total_files"] == 0
+        assert search(codebase, r"def \w+\(\)", use_regex=True)["total_files"] == 2
+        assert search(codebase, "(", use_regex=True)["status"] == "error"
+
+        paged = search(codebase, "helper", files_per_page=2, page=2)
+        assert paged["total_pages"] == 2
+        assert [file["filepath"] for file in paged["results"]] == ["tests/test_a.py"]
+
+        # The index follows graph syncs
+        codebase.get_file("src/b.py").edit("VALUE = 3\n")
+        codebase.commit()
+        assert search(codebase, "helper(")["total_files"] == 1
+        codebase.create_file("src/c.py", "print(helper(4))\n")
+        codebase.commit()
+        assert [file["filepath"] for file in search(codebase, "helper(")["results"]] == ["src/a.py", "src/c.py"]
@@ -1,8 +1,10 @@
+import gc
 from threading import Event
+from types import SimpleNamespace
 
 import pytest
 
-from graph_sitter.compiled.utils import lru_cache, uncache_all
+from graph_sitter.compiled.utils import CacheRegistry, cache_slots, cached_property, copy_state, lru_cache, uncache_all
 
 
 def test_lru_cache_with_uncache_all():
@@ -41,3 +43,75 @@ def test_lru_cache_args_with_uncache_all():
     for idx in range(2):
         with pytest.raises(AssertionError):
             cached_function(idx)
+
+
+class _Cached:
+    def __init__(self, ctx, file_node_id):
+        self.ctx = ctx
+        self.file_node_id = file_node_id
+        self.computed = 0
+
+    @cached_property
+    def value(self):
+        self.computed += 1
+        return self.computed
+
+
+def test_cache_registry_scopes():
+    ctx = SimpleNamespace(cache_registry=CacheRegistry())
+    registry = ctx.cache_registry
+    a, b, unscoped = _Cached(ctx, 1), _Cached(ctx, 2), _Cached(ctx, None)
+    for _ in range(3):
+        assert a.value == b.value == unscoped.value == 1
+    assert len(registry) == 3
+    assert registry.stats()["misses"] == 3
+
+    # Only the given scopes and the unscoped values are dropped
+    assert registry.invalidate([1]) == 2
+    assert (a.value, b.value, unscoped.value) == (2, 1, 2)
+    assert len(registry) == 3
+    assert registry.invalidations == 2
+
+    # Collected instances are dropped from the registry
+    del b
+    gc.collect()
+    assert len(registry) == 2
+
+    uncache_all()
+    assert len(registry) == 0
+    assert (a.value, unscoped.value) == (3, 3)
+    assert registry.generation == 2
+
+
+class _SlottedCached:
+    __slots__ = ("computed", "ctx", "file_node_id", "__weakref__", *cache_slots("value"))
+
+    def __init__(self, ctx, file_node_id):
+        self.ctx = ctx
+        self.file_node_id = file_node_id
+        self.computed = 0
+
+    @cached_property
+    def value(self):
+        self.computed += 1
+        return self.computed
+
+
+def test_cached_property_slots():
+    ctx = SimpleNamespace(cache_registry=CacheRegistry())
+    registry = ctx.cache_registry
+    slotted, unslotted = _SlottedCached(ctx, 1), _Cached(ctx, 1)
+    for _ in range(3):
+        assert slotted.value == unslotted.value == 1
+    assert not hasattr(slotted, "__dict__")
+    assert len(registry) == 2
+
+    assert registry.invalidate([1]) == 2
+    assert slotted.value == unslotted.value == 2
+
+    # The slots are copied along with the __dict__
+    other = _SlottedCached(ctx, 2)
+    copy_state(other, slotted)
+    assert (other.file_node_id, other.value, other.computed) == (1, 2, 2)
+    copy_state(other, _SlottedCached(ctx, 3))
+    assert (other.file_node_id, other.value) == (3, 1)
@@ -0,0 +1,90 @@
+import difflib
+import io
+
+import pytest
+from unidiff import PatchSet
+
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.runner.diff.get_raw_diff import get_raw_diff, get_raw_diff_from_transactions
+from graph_sitter.runner.diff.unified_diff import iter_file_diff
+
+ORIGINAL = "".join(f"line {i}\n" for i in range(1, 31))
+
+
+@pytest.mark.parametrize(
+    "new",
+    [
+        ORIGINAL.replace("line 10\n", "line ten\n"),
+        ORIGINAL.replace("line 2\n", "").replace("line 25\n", "line 25\nnew line\n"),
+        "line 0\n" + ORIGINAL,
+        "",
+    ],
+)
+def test_iter_file_diff_matches_difflib(new: str) -> None:
+    diff = "".join(iter_file_diff("file.py", ORIGINAL.encode(), new.encode()))
+    expected = "".join(difflib.unified_diff(ORIGINAL.splitlines(True), new.splitlines(True), "a/file.py", "b/file.py"))
+    assert diff == "diff --git a/file.py b/file.py\n" + expected
+
+
+def test_iter_file_diff_added_and_removed_files() -> None:
+    assert "".join(iter_file_diff("new.py", None, b"a = 1")) == "diff --git a/new.py b/new.py\nnew file mode 100644\n--- /dev/null\n+++ b/new.py\n@@ -0,0 +1 @@\n+a = 1\n\\ No newline at end of file\n"
+    assert "".join(iter_file_diff("old.py", b"a = 1\n", None)) == "diff --git a/old.py b/old.py\ndeleted file mode 100644\n--- a/old.py\n+++ /dev/null\n@@ -1 +0,0 @@\n-a = 1\n"
+    assert "".join(iter_file_diff("empty.py", None, b"")) == "diff --git a/empty.py b/empty.py\nnew file mode 100644\n"
+    assert "".join(iter_file_diff("image.png", b"\x89PNG\xff", b"\x89PNG\xfe")) == "diff --git a/image.png b/image.png\nBinary files a/image.png and b/image.png differ\n"
+
+
+def test_iter_file_diff_merges_flags_into_hunks() -> None:
+    # Removes line 11 and adds two lines after line 20, so the lines after them are shifted by one
+    new = ORIGINAL.replace("line 11\n", "").replace("line 20\n", "line 20\nnew 1\nnew 2\n")
+    chunks = list(iter_file_diff("file.py", ORIGINAL.encode(), new.encode(), flag_rows=[28, 2, 9, 11, 2]))
+    assert chunks == [
+        "diff --git a/file.py b/file.py\n--- a/file.py\n+++ b/file.py\n@@ -2 +2 @@\n line 2\n",
+        "@@ -8,7 +8,6 @@\n line 8\n line 9\n line 10\n-line 11\n line 12\n line 13\n line 14\n",
+        "@@ -18,6 +17,8 @@\n line 18\n line 19\n line 20\n+new 1\n+new 2\n line 21\n line 22\n line 23\n",
+        "@@ -27 +28 @@\n line 27\n",
+    ]
+
+
+def test_iter_file_diff_flags_only() -> None:
+    assert list(iter_file_diff("file.py", ORIGINAL.encode(), ORIGINAL.encode(), flag_rows=[5, 100])) == ["diff --git a/file.py b/file.py\n--- a/file.py\n+++ b/file.py\n@@ -5 +5 @@\n line 5\n"]
+
+
+def test_raw_diff_from_transactions(tmpdir) -> None:
+    # language=python
+    content1 = """
+def foo():
+    return 1
+"""
+    # language=python
+    content2 = """
+def bar():
+    return 2
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file1.py": content1, "file2.py": content2, "file3.py": "x = 1\n"}) as codebase:
+        codebase.get_function("foo").rename("foo2")
+        codebase.get_file("file2.py").remove()
+        codebase.commit()
+        codebase.get_function("foo2").edit("def foo3():\n    return 3")
+        codebase.create_file("file4.py", "y = 2\n")
+        codebase.commit()
+        codebase.set_find_mode(True)
+        codebase.get_file("file3.py").flag()
+
+        diff = get_raw_diff_from_transactions(codebase)
+        assert diff == (
+            "diff --git a/file1.py b/file1.py\n--- a/file1.py\n+++ b/file1.py\n@@ -1,3 +1,3 @@\n \n-def foo():\n-    return 1\n+def foo3():\n+    return 3\n"
+            "diff --git a/file2.py b/file2.py\ndeleted file mode 100644\n--- a/file2.py\n+++ /dev/null\n@@ -1,3 +0,0 @@\n-\n-def bar():\n-    return 2\n"
+            "diff --git a/file4.py b/file4.py\nnew file mode 100644\n--- /dev/null\n+++ b/file4.py\n@@ -0,0 +1 @@\n+y = 2\n"
+            "diff --git a/file3.py b/file3.py\n--- a/file3.py\n+++ b/file3.py\n@@ -1 +1 @@\n x = 1\n"
+        )
+        assert get_raw_diff_from_transactions(codebase, max_lines=5) == diff[: diff.index("diff --git a/file2.py")]
+
+        # Same as git once the new file is staged
+        codebase.ctx.flags._flags.clear()
+        codebase.get_diff(stage_files=True)
+
+        # get_raw_diff separates the files with blank lines, which unidiff adds to the last hunk of each file
+        def summarize(raw_diff: str) -> list[tuple[str, bool, bool, list[str]]]:
+            return [(file.path, file.is_added_file, file.is_removed_file, [str(hunk).rstrip("\n") for hunk in file]) for file in PatchSet(io.StringIO(raw_diff))]
+
+        assert summarize(get_raw_diff_from_transactions(codebase)) == summarize(get_raw_diff(codebase))
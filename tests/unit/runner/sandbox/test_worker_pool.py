@@ -0,0 +1,87 @@
+import asyncio
+import gc
+import warnings
+from pathlib import Path
+
+import pytest
+
+from graph_sitter.codebase.io.file_io import FileIO
+from graph_sitter.codebase.io.overlay_io import OverlayIO
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.runner.models.apis import GetDiffRequest
+from graph_sitter.runner.models.codemod import Codemod
+from graph_sitter.runner.sandbox.worker_pool import SandboxWorkerPool
+
+
+def test_overlay_io_keeps_saved_files_in_memory(tmp_path: Path) -> None:
+    existing = tmp_path / "existing.py"
+    existing.write_text("a = 1\n")
+    removed = tmp_path / "removed.py"
+    removed.write_text("b = 2\n")
+    created = tmp_path / "created.py"
+    io = OverlayIO(FileIO())
+
+    io.write_text(existing, "a = 2\n")
+    assert io.read_text(existing) == "a = 2\n"
+    io.write_text(created, "c = 3")
+    io.delete_file(removed)
+    io.save_files()
+
+    assert not io.files
+    assert io.read_text(existing) == "a = 2\n"
+    assert io.file_exists(created)
+    assert not io.file_exists(removed)
+    with pytest.raises(FileNotFoundError):
+        io.read_bytes(removed)
+    assert existing.read_text() == "a = 1\n"
+    assert removed.exists()
+    assert not created.exists()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_diffs_without_touching_the_working_tree(codebase: Codebase) -> None:
+    pool = SandboxWorkerPool(codebase, size=2, timeout=60)
+    pool.start()
+    # Objects are only frozen in the template and the workers, the parent keeps collecting its garbage
+    assert gc.get_freeze_count() == 0
+    try:
+        # Requests run on threads, the workers they use must not be forked by this process
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            requests = [GetDiffRequest(codemod=Codemod(user_code=f'codebase.get_file("test.py").edit("a = {i}")')) for i in (2, 3)]
+            responses = await asyncio.gather(*(pool.get_diff(request) for request in requests))
+            for i, response in zip((2, 3), responses):
+                assert response.result.is_complete
+                assert response.result.error is None
+                assert "-a = 1" in response.result.observation
+                assert f"+a = {i}" in response.result.observation
+
+            failed = await pool.get_diff(GetDiffRequest(codemod=Codemod(user_code='raise ValueError("boom")')))
+            assert not failed.result.is_complete
+            assert "ValueError: boom" in failed.result.error
+        assert not [warning for warning in caught if "multi-threaded" in str(warning.message)]
+    finally:
+        pool.close()
+
+    assert (codebase.repo_path / "test.py").read_text() == "a = 1"
+    assert codebase.get_file("test.py").content == "a = 1"
+    assert not pool._idle
+    assert not pool._template.is_alive()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_follows_the_synced_codebase(codebase: Codebase) -> None:
+    pool = SandboxWorkerPool(codebase, size=1, timeout=60)
+    pool.start()
+    try:
+        codebase.get_file("test.py").edit("a = 4")
+        codebase.create_file("other.py", "b = 1")
+        codebase.commit()
+
+        # The workers see the symbols of the synced graph, and their diffs include the changes of the parent
+        response = await pool.get_diff(GetDiffRequest(codemod=Codemod(user_code='codebase.get_symbol("b").rename("c")')))
+        assert response.result.is_complete, response.result.error
+        assert "+a = 4" in response.result.observation
+        assert "+c = 1" in response.result.observation
+    finally:
+        pool.close()
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.codebase.transactions import EditTransaction
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+
+
+def generate_file(num_functions: int) -> str:
+    return "".join(f"def func{i}(x):\n    return x + {i}\n\n\n" for i in range(num_functions))
+
+
+@pytest.mark.benchmark(group="sdk-benchmark-commit-edits", min_time=0.1, max_time=5, disable_gc=True)
+@pytest.mark.parametrize("num_edits", [100, 1000])
+def test_commit_edits(num_edits: int, tmp_path: Path, benchmark) -> None:
+    with get_codebase_session(files={"test.py": generate_file(num_edits)}, programming_language=ProgrammingLanguage.PYTHON, tmpdir=tmp_path, sync_graph=False) as codebase:
+        file = codebase.get_file("test.py")
+        original = file.content_bytes
+        transaction_manager = codebase.ctx.transaction_manager
+        # The byte range of each literal in the `return` statements
+        literals = [function.code_block.statements[0].value.right for function in file.functions]
+
+        def setup():
+            file.write(original)
+            for literal in literals:
+                transaction_manager.add_transaction(EditTransaction(literal.start_byte, literal.end_byte, file, str(int(literal.source) * 2)))
+
+        benchmark.pedantic(transaction_manager.commit, args=({file.path},), setup=setup, rounds=5)
+        assert file.content == "".join(f"def func{i}(x):\n    return x + {i * 2}\n\n\n" for i in range(num_edits))
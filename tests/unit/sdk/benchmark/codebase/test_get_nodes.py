@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pytest
+
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.enums import NodeType
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+
+NUM_FILES = 200
+
+
+def generate_files(num_files: int) -> dict[str, str]:
+    files = {}
+    for i in range(num_files):
+        # language=python
+        files[f"module{i}.py"] = f"""
+import os
+from module{(i + 1) % num_files} import func{(i + 1) % num_files}
+
+CONSTANT{i} = {i}
+
+class Class{i}:
+    def method(self, x):
+        return func{(i + 1) % num_files}(x) + CONSTANT{i}
+
+def func{i}(x):
+    return os.path.join(str(x), str(CONSTANT{i}))
+"""
+    return files
+
+
+@pytest.fixture(scope="module")
+def codebase(tmp_path_factory) -> Codebase:
+    with get_codebase_session(files=generate_files(NUM_FILES), programming_language=ProgrammingLanguage.PYTHON, tmpdir=Path(tmp_path_factory.mktemp("get_nodes"))) as codebase:
+        yield codebase
+
+
+def get_nodes_filtered(codebase: Codebase, node_type: NodeType) -> list:
+    """The previous implementation, kept as a baseline"""
+    return [codebase.ctx.get_node(node_id) for node_id in codebase.ctx._graph.filter_nodes(lambda node: node.node_type == node_type)]
+
+
+@pytest.mark.benchmark(group="sdk-benchmark-get-nodes", min_time=0.1, max_time=5, disable_gc=True)
+@pytest.mark.parametrize("node_type", [NodeType.FILE, NodeType.IMPORT, NodeType.EXTERNAL], ids=lambda node_type: node_type.name.lower())
+@pytest.mark.parametrize("indexed", [True, False], ids=["indexed", "filtered"])
+def test_get_nodes(codebase: Codebase, node_type: NodeType, indexed: bool, benchmark) -> None:
+    if indexed:
+        nodes = benchmark(codebase.ctx.get_nodes, node_type)
+    else:
+        nodes = benchmark(get_nodes_filtered, codebase, node_type)
+    assert nodes == get_nodes_filtered(codebase, node_type)
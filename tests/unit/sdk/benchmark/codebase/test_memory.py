@@ -0,0 +1,96 @@
+import gc
+import sys
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.core.dataclasses.usage import Usage
+from graph_sitter.core.interfaces.editable import Editable
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+
+NUM_MODULES = 40
+
+
+def generate_files(num_modules: int) -> dict[str, str]:
+    files = {"pkg/__init__.py": ""}
+    for m in range(num_modules):
+        other = (m + 1) % num_modules
+        # language=python
+        files[f"pkg/module{m}.py"] = f"""
+import os
+from pkg.module{other} import func{other}, Class{other}
+
+CONSTANT{m} = 10
+
+
+class Class{m}(Class{other}):
+    attr: int = 1
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def method(self, x: int) -> int:
+        if x > CONSTANT{m}:
+            return func{other}(x) + self.value
+        for i in range(x):
+            x += i * 2
+        return len(os.path.join(str(x), "a"))
+
+
+def func{m}(x: int) -> int:
+    y = [i for i in range(x)]
+    return len(y) + Class{m}(x).method(x)
+"""
+    return files
+
+
+def get_nodes() -> list[Editable | Usage]:
+    """Returns the live nodes and usages. Checks the MRO rather than isinstance, which would fill the ABC caches."""
+    return [obj for obj in gc.get_objects() if Editable in type(obj).__mro__ or type(obj) is Usage]
+
+
+def layout_size(obj: object) -> int:
+    """The size of an object and of its instance __dict__, if it has one."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure_memory(files: dict[str, str], tmp_path: Path) -> tuple[int, dict[str, tuple[int, int]]]:
+    """Builds a codebase while tracing allocations.
+
+    Returns:
+        The bytes allocated by the build that are still alive, and the number of nodes and the bytes of their layouts
+        (see `layout_size`) by node type.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with get_codebase_session(files=files, programming_language=ProgrammingLanguage.PYTHON, tmpdir=tmp_path):
+            gc.collect()
+            traced, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            by_type = defaultdict(lambda: [0, 0])
+            for node in get_nodes():
+                stats = by_type[type(node).__name__]
+                stats[0] += 1
+                stats[1] += layout_size(node)
+    finally:
+        tracemalloc.stop()
+    return traced, {name: (count, size) for name, (count, size) in by_type.items()}
+
+
+@pytest.mark.benchmark(group="sdk-benchmark-memory")
+def test_memory(tmp_path, benchmark) -> None:
+    files = generate_files(NUM_MODULES)
+    # Allocations are traced, so the build is slower than usual. Only the reported sizes are meaningful
+    traced, by_type = benchmark.pedantic(measure_memory, args=(files, tmp_path), rounds=1, iterations=1)
+    num_nodes = sum(count for count, _ in by_type.values())
+    assert num_nodes > 0
+    benchmark.extra_info["nodes"] = num_nodes
+    benchmark.extra_info["bytes_per_node"] = traced / num_nodes
+    benchmark.extra_info["layout_bytes_per_node_type"] = {name: size / count for name, (count, size) in sorted(by_type.items(), key=lambda item: -item[1][1])}
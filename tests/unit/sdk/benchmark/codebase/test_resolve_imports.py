@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.enums import NodeType
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+
+NUM_PACKAGES = 20
+NUM_MODULES = 20
+
+
+def generate_files(num_packages: int, num_modules: int) -> dict[str, str]:
+    files = {"tsconfig.json": '{"compilerOptions": {"baseUrl": ".", "paths": {"@pkg/*": ["packages/*"]}}}'}
+    for p in range(num_packages):
+        files[f"packages/pkg{p}/index.ts"] = "".join(f"export * from './module{m}';\n" for m in range(num_modules))
+        files[f"packages/pkg{p}/types.d.ts"] = f"export type Id{p} = string;\n"
+        for m in range(num_modules):
+            # language=typescript
+            files[f"packages/pkg{p}/module{m}.ts"] = f"""
+import React from 'react';
+import {{ Id{p} }} from './types';
+import {{ func{(m + 1) % num_modules} }} from './module{(m + 1) % num_modules}';
+import {{ func{m} as other }} from '@pkg/pkg{(p + 1) % num_packages}';
+import {{ helper }} from '../../shared/helper.js';
+import * as missing from './missing';
+
+export function func{m}(id: Id{p}): string {{
+    return helper(id) + other(id);
+}}
+"""
+    files["shared/helper.ts"] = "export function helper(x: string): string { return x; }\n"
+    return files
+
+
+@pytest.fixture(scope="module")
+def codebase(tmp_path_factory) -> Codebase:
+    files = generate_files(NUM_PACKAGES, NUM_MODULES)
+    with get_codebase_session(files=files, programming_language=ProgrammingLanguage.TYPESCRIPT, tmpdir=Path(tmp_path_factory.mktemp("resolve_imports"))) as codebase:
+        yield codebase
+
+
+def resolve_all(imports: list) -> list:
+    return [imp.resolve_import() for imp in imports]
+
+
+@pytest.mark.benchmark(group="sdk-benchmark-resolve-imports", min_time=0.1, max_time=5, disable_gc=True)
+def test_resolve_imports(codebase: Codebase, benchmark) -> None:
+    imports = codebase.ctx.get_nodes(NodeType.IMPORT)
+    assert len(imports) == NUM_PACKAGES * NUM_MODULES * 7
+    resolutions = benchmark(resolve_all, imports)
+    resolved = {imp.module.source.strip("'"): resolution and resolution.from_file.filepath for imp, resolution in zip(imports, resolutions) if imp.filepath == "packages/pkg0/module0.ts"}
+    assert resolved == {
+        "react": None,
+        "./types": "packages/pkg0/types.d.ts",
+        "./module1": "packages/pkg0/module1.ts",
+        "@pkg/pkg1": "packages/pkg1/index.ts",
+        "../../shared/helper.js": "shared/helper.ts",
+        "./missing": None,
+    }
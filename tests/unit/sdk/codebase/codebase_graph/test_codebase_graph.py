@@ -2,9 +2,14 @@
 
 import itertools
 
+import pytest
+
 from graph_sitter.codebase.codebase_context import CodebaseContext
+from graph_sitter.codebase.config import TestFlags
 from graph_sitter.codebase.factory.get_session import get_codebase_session
-from graph_sitter.enums import EdgeType
+from graph_sitter.codebase.io.file_io import FileIO
+from graph_sitter.enums import EdgeType, NodeType
+from graph_sitter.git.repo_operator.repo_operator import RepoOperator
 
 
 def test_codebase_with_wrapper(tmpdir) -> None:
@@ -95,3 +100,131 @@ class MySubClass(MyClass):
         assert len(import_resolution_edges) == 4
         assert len(file_contains_node_edges) == 14
         assert len(symbol_usage_edges) == 6
+
+
+def test_codebase_parse_workers(tmp_path) -> None:
+    # language=python
+    content = """
+from file0 import foo
+
+def foo():
+    return 42
+
+class MyClass:
+    def bar(self):
+        return foo()
+"""
+    files = {f"file{i}.py": content for i in range(20)}
+    with get_codebase_session(tmpdir=tmp_path / "serial", files=files) as codebase:
+        serial_nodes = [(type(node).__name__, node.name, node.filepath) for node in codebase.ctx.nodes]
+        serial_edges = sorted((u, v, edge.type) for u, v, edge in codebase.ctx.edges)
+
+    config = TestFlags.model_copy(update=dict(parse_workers=4))
+    with get_codebase_session(tmpdir=tmp_path / "parallel", files=files, config=config) as codebase:
+        assert len(codebase.files) == 20
+        assert [(type(node).__name__, node.name, node.filepath) for node in codebase.ctx.nodes] == serial_nodes
+        assert sorted((u, v, edge.type) for u, v, edge in codebase.ctx.edges) == serial_edges
+
+
+def test_codebase_reads_files_once(tmpdir, mocker) -> None:
+    files = {f"file{i}.py": f"def foo{i}():\n    return {i}\n" for i in range(5)}
+    get_file = mocker.spy(RepoOperator, "get_file")
+    read_bytes = mocker.spy(FileIO, "read_bytes")
+    with get_codebase_session(tmpdir=tmpdir, files=files, verify_input=False, verify_output=False) as codebase:
+        assert len(codebase.files) == 5
+        get_file.assert_not_called()
+        assert sorted(call.args[1].name for call in read_bytes.call_args_list) == sorted(files)
+
+
+def test_codebase_symbol_index(tmpdir) -> None:
+    # language=python
+    content1 = """
+def foo():
+    pass
+
+class Bar:
+    def foo(self):
+        pass
+
+baz = 1
+"""
+    # language=python
+    content2 = """
+def qux():
+    pass
+
+class baz:
+    pass
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file1.py": content1, "file2.py": content2}) as codebase:
+        file1 = codebase.get_file("file1.py")
+        assert codebase.get_function("foo") == file1.get_function("foo")
+        assert codebase.get_class("Bar") == file1.get_class("Bar")
+        assert codebase.get_class("foo", optional=True) is None
+        assert {s.filepath for s in codebase.get_symbols("baz")} == {"file1.py", "file2.py"}
+        assert codebase.has_symbol("qux")
+        assert codebase.functions == [file1.get_function("foo"), codebase.get_file("file2.py").get_function("qux")]
+
+        codebase.get_function("qux").rename("quux")
+        file1.get_class("Bar").remove()
+        codebase.commit()
+        assert not codebase.has_symbol("qux")
+        assert codebase.get_function("quux").filepath == "file2.py"
+        assert codebase.get_class("Bar", optional=True) is None
+        assert codebase.get_function("foo") == codebase.get_file("file1.py").get_function("foo")
+
+        codebase.create_file("file3.py", "def foo():\n    pass\n")
+        codebase.commit()
+        assert len(codebase.get_symbols("foo")) == 2
+        with pytest.raises(ValueError, match="ambiguous"):
+            codebase.get_function("foo")
+
+
+def test_codebase_get_nodes(tmpdir) -> None:
+    # language=python
+    content = """
+import os
+from file2 import bar
+
+def foo():
+    return bar(os.path)
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file1.py": content, "file2.py": "def bar(x):\n    return x\n"}) as codebase:
+
+        def check() -> None:
+            ctx = codebase.ctx
+            for node_type in NodeType:
+                expected = [ctx.get_node(node_id) for node_id in ctx._graph.filter_nodes(lambda node: node.node_type == node_type)]
+                assert ctx.get_nodes(node_type) == expected
+                assert ctx.get_nodes(exclude_type=node_type) == [node for node in ctx.nodes if node.node_type != node_type]
+
+        check()
+        assert len(codebase.ctx.get_nodes(NodeType.FILE)) == 2
+        codebase.get_file("file1.py").get_function("foo").remove()
+        codebase.create_file("file3.py", "import sys\n")
+        codebase.commit()
+        check()
+        assert {file.filepath for file in codebase.files} == {"file1.py", "file2.py", "file3.py"}
+        assert {module.name for module in codebase.external_modules} == {"sys", "os"}
+
+
+def test_codebase_sync_invalidates_affected_caches(tmpdir) -> None:
+    files = {
+        "a.py": "def foo():\n    pass\n",
+        "b.py": "from a import foo\n\ndef bar():\n    foo()\n",
+        "c.py": "def baz():\n    pass\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        bar = codebase.get_function("bar")
+        baz = codebase.get_function("baz")
+        assert [definition.name for call in bar.function_calls for definition in call.function_definitions] == ["foo"]
+        assert not baz.is_private
+        assert "function_definitions" in bar.function_calls[0].__dict__
+        assert "is_private" in baz.__dict__
+
+        codebase.get_file("a.py").get_function("foo").code_block.edit("return 1")
+        codebase.commit()
+        # b.py depends on a.py, c.py does not
+        assert "function_definitions" not in bar.function_calls[0].__dict__
+        assert "is_private" in baz.__dict__
+        assert codebase.ctx.cache_registry.stats()["invalidations"] > 0
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from watchfiles import Change
+
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.codebase.watcher import CodebaseWatcher
+
+SYNC_TIMEOUT = 10
+
+
+def test_codebase_watch(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": "def foo():\n    pass\n", "b.py": "def bar():\n    pass\n"}) as codebase:
+        with codebase.watch(step=100, debounce=1000) as watcher:
+            root = Path(codebase.repo_path)
+            # A burst of changes is synced as one batch
+            (root / "a.py").write_text("def foo2():\n    pass\n")
+            (root / "b.py").unlink()
+            (root / "c.py").write_text("def baz():\n    pass\n")
+            (root / "notes.txt").write_text("ignored")
+            assert watcher.wait_for_generation(1, timeout=SYNC_TIMEOUT)
+            with watcher.read():
+                assert codebase.get_file("a.py").get_function("foo2") is not None
+                assert codebase.get_file("b.py", optional=True) is None
+                assert codebase.get_file("c.py").get_function("baz") is not None
+
+            # The codebase's own writes match the graph and are not synced again
+            with watcher.read():
+                codebase.get_file("c.py").get_function("baz").rename("qux")
+                codebase.commit()
+            assert watcher._to_diffs({(Change.modified, str(root / "c.py"))}) == []
+            assert codebase.get_file("c.py").get_function("qux") is not None
+        assert not watcher.running
+
+
+def test_codebase_watch_filter(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": ""}) as codebase:
+        with codebase.watch() as watcher:
+            root = Path(codebase.repo_path)
+            assert watcher.should_watch(None, str(root / "src" / "a.py"))
+            assert not watcher.should_watch(None, str(root / "a.txt"))
+            assert not watcher.should_watch(None, str(root / ".git" / "a.py"))
+            assert not watcher.should_watch(None, str(root / "node_modules" / "a.py"))
+            assert not watcher.should_watch(None, str(root.parent / "a.py"))
+
+
+def test_codebase_watch_gitignore(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={".gitignore": "dist/\n", "a.py": ""}) as codebase:
+        watcher = CodebaseWatcher(codebase.ctx)
+        root = Path(codebase.repo_path)
+        (root / "dist").mkdir()
+        (root / "dist" / "b.py").write_text("def bar():\n    pass\n")
+        (root / "c.py").write_text("def baz():\n    pass\n")
+        diffs = watcher._to_diffs({(Change.added, str(root / "dist" / "b.py")), (Change.added, str(root / "c.py"))})
+        assert [diff.path for diff in diffs] == [root / "c.py"]
+
+
+def test_codebase_watch_failed_sync(tmpdir, monkeypatch) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": ""}) as codebase:
+        watcher = CodebaseWatcher(codebase.ctx)
+        root = Path(codebase.repo_path)
+        (root / "a.py").write_text("def foo():\n    pass\n")
+
+        def apply_diffs(diffs) -> None:
+            raise RuntimeError
+
+        monkeypatch.setattr(codebase.ctx, "apply_diffs", apply_diffs)
+        # Readers waiting for a batch are woken up even if it failed to sync
+        watcher.sync({(Change.modified, str(root / "a.py"))})
+        assert watcher.wait_for_generation(1, timeout=0)
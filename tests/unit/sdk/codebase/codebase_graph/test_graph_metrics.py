@@ -0,0 +1,85 @@
+import json
+
+from graph_sitter.codebase.config import TestFlags
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.codebase.progress.stub_task import StubTask
+from graph_sitter.codebase.progress.task import Task
+
+
+def test_build_and_sync_reports(tmp_path) -> None:
+    # language=python
+    content1 = """
+from file2 import Bar
+
+def foo():
+    return Bar()
+"""
+    # language=python
+    content2 = """
+class Bar:
+    pass
+"""
+    metrics_path = tmp_path / "metrics.jsonl"
+    config = TestFlags.model_copy(update=dict(metrics_path=str(metrics_path)))
+    with get_codebase_session(tmpdir=tmp_path / "repo", files={"file1.py": content1, "file2.py": content2}, config=config) as codebase:
+        build = codebase.ctx.metrics.last
+        assert build.kind == "build"
+        assert {"enumerate", "read", "tree_sitter", "parse", "directory_tree", "import_resolution", "dependencies"} <= build.phases.keys()
+        assert build.duration >= sum(build.phases[name] for name in ("enumerate", "parse", "directory_tree", "import_resolution", "dependencies"))
+        assert build.counts["files_added"] == 2
+        assert build.counts["files"] == 2
+        assert build.counts["nodes"] == len(codebase.ctx.nodes)
+        assert build.counts["edges"] == len(codebase.ctx.edges)
+        assert build.edges_by_type["IMPORT_SYMBOL_RESOLUTION"] == 1
+        assert build.memory["peak_rss_gb"] >= build.memory["rss_gb"] > 0
+        assert build.cache["generation"] == codebase.ctx.cache_registry.generation
+
+        codebase.get_file("file2.py").edit("class Bar:\n    x = 1\n")
+        codebase.commit()
+        sync = codebase.ctx.metrics.last
+        assert sync.kind == "sync"
+        assert sync.counts["files_reparsed"] == 1
+        assert "files_added" not in sync.counts
+        assert "enumerate" not in sync.phases
+
+    reports = [json.loads(line) for line in metrics_path.read_text().splitlines()]
+    assert [report["kind"] for report in reports] == ["build", "sync"]
+    assert reports[0] == build.to_dict()
+
+
+def test_metrics_not_recorded_outside_of_reports(tmp_path) -> None:
+    with get_codebase_session(tmpdir=tmp_path, files={"file.py": "x = 1"}) as codebase:
+        metrics = codebase.ctx.metrics
+        reports = len(metrics.reports)
+        with metrics.phase("parse"):
+            metrics.count("files_added")
+        assert len(metrics.reports) == reports
+        assert metrics.current is None
+
+        with metrics.record("sync") as report:
+            with metrics.record("build") as nested:
+                assert nested is report
+                metrics.count("files_added", 2)
+        assert metrics.last is report
+        assert report.kind == "sync"
+        assert report.counts["files_added"] == 2
+        assert report.edges_by_type is None
+
+
+def test_task_should_update_is_rate_limited(mocker) -> None:
+    class RecordingTask(Task):
+        def update(self, message: str, count: int | None = None) -> None:
+            pass
+
+        def end(self) -> None:
+            pass
+
+    now = mocker.patch("graph_sitter.codebase.progress.task.time.monotonic", return_value=100.0)
+    task = RecordingTask()
+    assert task.should_update()
+    assert not task.should_update()
+    now.return_value = 100.05
+    assert not task.should_update()
+    now.return_value = 100.2
+    assert task.should_update()
+    assert not StubTask().should_update()
@@ -0,0 +1,92 @@
+from graph_sitter.codebase import codebase_context
+from graph_sitter.codebase.config import TestFlags
+from graph_sitter.codebase.diff_lite import ChangeType
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.core.codebase import Codebase
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+
+
+def get_graph(codebase: Codebase) -> tuple[set, set]:
+    def key(node):
+        return type(node).__name__, node.filepath, node.start_byte, node.end_byte
+
+    nodes = {key(node) for node in codebase.ctx.nodes}
+    edges = set()
+    for u, v, edge in codebase.ctx.edges:
+        usage = None
+        if edge.usage is not None:
+            usage = (key(edge.usage.match), key(edge.usage.usage_symbol), edge.usage.usage_type, edge.usage.kind)
+        edges.add((key(codebase.ctx.get_node(u)), key(codebase.ctx.get_node(v)), edge.type, usage))
+    return nodes, edges
+
+
+def test_snapshot_restore(tmp_path, mocker) -> None:
+    # language=python
+    content1 = """
+import os
+from file2 import Bar
+
+def foo():
+    return Bar().baz(os.path)
+"""
+    # language=python
+    content2 = """
+class Bar:
+    def baz(self, x):
+        return helper(x)
+
+def helper(x):
+    return x
+"""
+    config = TestFlags.model_copy(update=dict(snapshot_dir=str(tmp_path / "snapshots")))
+    with get_codebase_session(tmpdir=tmp_path / "repo", files={"file1.py": content1, "file2.py": content2}, config=config) as codebase:
+        expected = get_graph(codebase)
+        projects = codebase.ctx.projects
+    assert len(list((tmp_path / "snapshots").rglob("*.pkl"))) == 1
+
+    compute = mocker.patch.object(codebase_context.CodebaseContext, "_compute_dependencies")
+    restored = Codebase(projects=projects, config=config)
+    compute.assert_not_called()
+    mocker.stopall()
+    assert get_graph(restored) == expected
+    assert restored.get_function("helper").usages[0].usage_symbol == restored.get_class("Bar").get_method("baz")
+    assert {imp.name for imp in restored.get_file("file1.py").imports} == {"os", "Bar"}
+    assert restored.get_file("file1.py").get_import("os").resolved_symbol == restored.external_modules[0]
+
+
+def test_snapshot_restore_syncs_working_tree(tmp_path, mocker) -> None:
+    # language=typescript
+    content1 = """
+import { bar } from "./file2";
+
+export function foo() {
+    return bar();
+}
+"""
+    # language=typescript
+    content2 = """
+export function bar() {
+    return 1;
+}
+"""
+    config = TestFlags.model_copy(update=dict(snapshot_dir=str(tmp_path / "snapshots")))
+    files = {"file1.ts": content1, "file2.ts": content2}
+    with get_codebase_session(tmpdir=tmp_path / "repo", files=files, programming_language=ProgrammingLanguage.TYPESCRIPT, config=config) as codebase:
+        projects = codebase.ctx.projects
+
+    (tmp_path / "repo" / "file2.ts").write_text("export function bar() {\n    return 2;\n}\n\nexport function baz() {\n    return bar();\n}\n")
+    (tmp_path / "repo" / "file3.ts").write_text('import { baz } from "./file2";\n\nexport const x = baz();\n')
+    get_diffs = mocker.spy(codebase_context, "get_snapshot_diffs")
+    restored = Codebase(projects=projects, config=config)
+    assert {(diff.change_type, diff.path.name) for diff in get_diffs.spy_return} == {(ChangeType.Modified, "file2.ts"), (ChangeType.Added, "file3.ts")}
+    bar = restored.get_function("bar")
+    assert "return 2" in bar.source
+    assert {usage.usage_symbol.name for usage in bar.usages} == {"foo", "baz", "bar"}
+    assert restored.get_function("baz").usages[0].usage_symbol.name == "baz"
+
+    with get_codebase_session(
+        tmpdir=tmp_path / "fresh",
+        files={**files, "file2.ts": (tmp_path / "repo" / "file2.ts").read_text(), "file3.ts": (tmp_path / "repo" / "file3.ts").read_text()},
+        programming_language=ProgrammingLanguage.TYPESCRIPT,
+    ) as fresh:
+        assert len(get_graph(fresh)[1]) == len(get_graph(restored)[1])
@@ -2,6 +2,7 @@ import os
 import sys
 
 import pytest
+from tree_sitter import Range
 
 from graph_sitter.codebase.factory.get_session import get_codebase_session
 from graph_sitter.core.file import File, SourceFile
@@ -230,3 +231,40 @@ def test_minified_file(tmpdir) -> None:
         # This should match the maximum line length threshold
         file2 = codebase.ctx.get_file("file2.js")
         assert file2 is None
+
+
+def test_file_find_by_byte_range(tmpdir) -> None:
+    # language=python
+    content = """
+class Foo:
+    def bar(self, x: int) -> int:
+        y = x + 1
+        return y * 2
+
+def baz():
+    return Foo().bar(3)
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file.py": content}) as codebase:
+        file = codebase.get_file("file.py")
+        # Force every node in the file to be created
+        for function in [*file.functions, *file.classes[0].methods]:
+            function.function_calls
+            function.code_block.statements
+        nodes = file._range_index.nodes
+        assert nodes
+
+        for offset in range(len(content) + 1):
+            containing = [node.range for node in nodes if node.range.start_byte <= offset <= node.range.end_byte]
+            expected = min(containing, key=lambda range: range.end_byte - range.start_byte, default=None)
+            actual = file._range_index.get_smallest_containing(offset)
+            assert (actual.range if actual else None) == expected
+
+        bar = file.classes[0].get_method("bar")
+        assert file._range_index.get_smallest_containing(bar.start_byte, bar.end_byte).range == bar.range
+        start_byte = content.index("y = x")
+        end_byte = content.index("def baz")
+        overlapping = file.find_by_byte_range(Range((0, 0), (0, 0), start_byte, end_byte))
+        assert set(overlapping) == {node for node in nodes if node.range.start_byte < end_byte and node.range.end_byte > start_byte}
+        assert bar in overlapping
+        assert file.functions[0] not in overlapping
+        assert [node.start_byte for node in overlapping] == sorted(node.start_byte for node in overlapping)
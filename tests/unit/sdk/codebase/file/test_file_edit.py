@@ -1,6 +1,9 @@
 import pytest
 
+from graph_sitter import tree_sitter_parser
+from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
 from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.core import file as file_module
 from graph_sitter.core.file import SourceFile
 
 
@@ -117,3 +120,35 @@ def test_transaction_ordering_non_source_files(tmpdir) -> None:
 
         # Verify final content
         assert file.content == "# New Header\nNew Content\nNew Footer"
+
+
+def test_reparse_incremental(tmpdir, mocker) -> None:
+    """Test that committed edits reuse the previous tree and produce the same tree as a full parse"""
+    content = "def foo():\n    return 1\n\n\ndef bar():\n    return foo()\n"
+    with get_codebase_session(tmpdir=tmpdir, files={"file.py": content}) as codebase:
+        file = codebase.get_file("file.py")
+        parse_tree = mocker.spy(file_module, "parse_tree")
+        from_tree = mocker.spy(tree_sitter_parser.TreeEdit, "from_tree")
+        file.get_function("foo").rename("baz")
+        file.get_function("bar").insert_before("def qux():\n    pass\n\n\n", newline=False)
+        codebase.commit()
+        assert parse_tree.call_args.kwargs["old_tree"] is not None
+        from_tree.assert_not_called()
+        assert file.content == "def baz():\n    return 1\n\n\ndef qux():\n    pass\n\n\ndef bar():\n    return baz()\n"
+        assert str(file.ts_node) == str(tree_sitter_parser.parse_file(file.filepath, file.content))
+        assert [f.name for f in file.functions] == ["baz", "qux", "bar"]
+        assert file.get_function("baz").usages[0].usage_symbol == file.get_function("bar")
+
+
+def test_reparse_incremental_external_write(tmpdir) -> None:
+    """Test that content changed outside of transactions is still reparsed correctly"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file.py": "def foo():\n    return 1\n"}) as codebase:
+        file = codebase.get_file("file.py")
+        file.get_function("foo").rename("bar")
+        # Written after the transactions were recorded, the recorded edits no longer apply
+        codebase.ctx.transaction_manager.queued_transactions.clear()
+        file.write("x = 1\n\n\ndef foo():\n    return x\n")
+        codebase.ctx.apply_diffs([DiffLite(ChangeType.Modified, file.path)])
+        assert str(file.ts_node) == str(tree_sitter_parser.parse_file(file.filepath, file.content))
+        assert file.get_function("foo").source == "def foo():\n    return x"
+        assert file.get_global_var("x").usages[0].usage_symbol == file.get_function("foo")
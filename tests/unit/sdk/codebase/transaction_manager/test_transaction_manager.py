@@ -6,7 +6,8 @@ from graph_sitter.codebase.transaction_manager import (
     TransactionError,
     TransactionManager,
 )
-from graph_sitter.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction
+from graph_sitter.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction, Transaction
+from graph_sitter.tree_sitter_parser import TreeEdit
 
 
 class MockFile:
@@ -658,10 +659,39 @@ def content():
         file.get_function("content").remove()
         file.edit(file.content + "Something")
         queue = file.transaction_manager.queued_transactions[tmpdir / FILENAME]
+        # The queue is kept in commit order
         assert len(queue) == 5
         assert isinstance(queue[0], InsertTransaction)
         assert isinstance(queue[1], InsertTransaction)
-        assert isinstance(queue[2], InsertTransaction)
-        assert queue[2].new_content == "Ok"
-        assert isinstance(queue[3], RemoveTransaction)
+        assert isinstance(queue[2], RemoveTransaction)
+        assert isinstance(queue[3], InsertTransaction)
         assert isinstance(queue[4], InsertTransaction)
+        assert queue[4].new_content == "Ok"
+
+
+def test_commit_splices_in_one_pass(tmpdir) -> None:
+    FILENAME = Path("filename")
+    file = MockFile(FILENAME)
+    file.content_bytes = b"0123456789\nabcdefghij\nABCDEFGHIJ\n"
+    transactions = [
+        EditTransaction(start_byte=2, end_byte=4, file=file, new_content="xx\n"),
+        InsertTransaction(insert_byte=2, file=file, new_content="<"),
+        InsertTransaction(insert_byte=2, file=file, new_content=">", priority=1),
+        RemoveTransaction(start_byte=12, end_byte=20, file=file),
+        InsertTransaction(insert_byte=20, file=file, new_content="!"),
+        EditTransaction(start_byte=25, end_byte=33, file=file, new_content=""),
+        InsertTransaction(insert_byte=33, file=file, new_content="end"),
+    ]
+    transactions.sort(key=Transaction._to_sort_key)
+
+    # Reference: execute the transactions one after the other
+    content = file.content_bytes
+    expected_edits = []
+    for transaction in transactions:
+        new_bytes = transaction.get_new_bytes()
+        expected_edits.append(TreeEdit.from_replacement(content, transaction.start_byte, transaction.end_byte, new_bytes))
+        content = content[: transaction.start_byte] + new_bytes + content[transaction.end_byte :]
+
+    new_content, tree_edits = TransactionManager()._splice(file.content_bytes, transactions)
+    assert new_content == content
+    assert tree_edits == expected_edits
@@ -0,0 +1,65 @@
+import random
+from os import PathLike
+from pathlib import Path
+
+import pytest
+
+from graph_sitter.codebase.transaction_queue import TransactionQueue
+from graph_sitter.codebase.transactions import EditTransaction, InsertTransaction, RemoveTransaction, Transaction
+
+
+class MockFile:
+    def __init__(self, path: PathLike) -> None:
+        self.content = "x" * 1000
+        self.content_bytes = bytes(self.content, "utf-8")
+        self.path = Path(path)
+
+
+def test_transaction_queue_matches_brute_force() -> None:
+    rng = random.Random(0)
+    file = MockFile("filename")
+    queue = TransactionQueue()
+    queued: list[Transaction] = []
+    for _ in range(300):
+        start = rng.randrange(1000)
+        end = min(start + rng.randrange(50), 1000)
+        transaction = rng.choice([EditTransaction(start, end, file, "y"), RemoveTransaction(start, end, file), InsertTransaction(start, file, "z")])
+        queue.add(transaction)
+        queued.append(transaction)
+        if rng.random() < 0.2:
+            removed = queued.pop(rng.randrange(len(queued)))
+            queue.remove(removed)
+
+    queued.sort(key=Transaction._to_sort_key)
+    assert list(queue) == queued
+    assert [queue[idx] for idx in range(len(queue))] == queued
+    assert queue[-1] is queued[-1]
+    for _ in range(200):
+        start = rng.randrange(1000)
+        end = start + rng.randrange(30)
+        assert queue.overlapping(start, end) == [t for t in queued if t.start_byte < end and t.end_byte > start]
+        assert queue.containing(start, end) == [t for t in queued if t.start_byte <= start and t.end_byte >= end]
+        assert queue.starting_at(start) == [t for t in queued if t.start_byte == start]
+
+
+def test_transaction_queue_membership() -> None:
+    file = MockFile("filename")
+    queue = TransactionQueue()
+    t1 = EditTransaction(0, 5, file, "a")
+    t2 = EditTransaction(0, 5, file, "a")
+    queue.add(t1)
+    assert t2 in queue
+    # Removal is by identity, an equal transaction is not removed
+    assert not queue.discard(t2)
+    assert len(queue) == 1
+    queue.add(t2)
+    queue.remove(t1)
+    assert t1 in queue
+    assert list(queue) == [t2]
+    queue.remove(t2)
+    assert t1 not in queue
+    assert not queue
+    with pytest.raises(ValueError):
+        queue.remove(t1)
+    with pytest.raises(IndexError):
+        queue[0]
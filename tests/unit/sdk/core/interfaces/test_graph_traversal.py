@@ -0,0 +1,97 @@
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+
+
+def test_symbol_usages_max_depth(tmpdir) -> None:
+    # language=python
+    content = """
+def a():
+    pass
+
+def b():
+    a()
+
+def c():
+    b()
+
+def d():
+    c()
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        file = codebase.get_file("test.py")
+        a, b, c, d = (file.get_function(name) for name in "abcd")
+
+        assert a.symbol_usages == [b]
+        assert a.symbol_usages(max_depth=1) == [b]
+        assert a.symbol_usages(max_depth=2) == [b, c]
+        assert a.symbol_usages(max_depth=3) == [b, c, d]
+        assert codebase.ctx.traversal.usages(a, max_depth=None) == [b, c, d]
+        assert codebase.ctx.traversal.walk(a.node_id, reverse=True, max_depth=None) == {b.node_id: 1, c.node_id: 2, d.node_id: 3}
+
+
+def test_walk_includes_start_in_cycle(tmpdir) -> None:
+    # language=python
+    content = """
+def a():
+    b()
+
+def b():
+    a()
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        file = codebase.get_file("test.py")
+        a, b = file.get_function("a"), file.get_function("b")
+
+        assert a.dependencies(max_depth=1) == [b]
+        assert a.dependencies(max_depth=2) == [a, b]
+        assert codebase.ctx.traversal.walk(a.node_id, max_depth=5) == {b.node_id: 1, a.node_id: 2}
+
+
+def test_dependencies_hop_imports(tmpdir) -> None:
+    # language=python
+    base = """
+def helper():
+    pass
+"""
+    # language=python
+    reexport = """
+from base import helper
+"""
+    # language=python
+    main = """
+from reexport import helper
+
+def run():
+    helper()
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"base.py": base, "reexport.py": reexport, "main.py": main}) as codebase:
+        helper = codebase.get_file("base.py").get_function("helper")
+        run = codebase.get_file("main.py").get_function("run")
+        main_import = codebase.get_file("main.py").get_import("helper")
+
+        assert codebase.ctx.traversal.dependencies(run) == [main_import]
+        assert codebase.ctx.traversal.dependencies(run, hop_imports=True) == [helper]
+
+
+def test_traversal_cache_invalidated_on_commit(tmpdir) -> None:
+    # language=python
+    content = """
+def a():
+    pass
+
+def b():
+    a()
+
+def c():
+    b()
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        file = codebase.get_file("test.py")
+        c = file.get_function("c")
+        assert [dep.name for dep in c.dependencies(max_depth=3)] == ["a", "b"]
+        assert codebase.ctx.traversal._walks
+
+        file.get_function("b").code_block.statements[0].edit("pass")
+        codebase.commit()
+        c = codebase.get_file("test.py").get_function("c")
+        assert [dep.name for dep in c.dependencies(max_depth=3)] == ["b"]
+        assert [usage.name for usage in codebase.get_file("test.py").get_function("a").symbol_usages(max_depth=3)] == []
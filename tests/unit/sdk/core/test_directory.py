@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from graph_sitter.codebase.factory.get_session import get_codebase_session
 from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
 
@@ -208,3 +210,35 @@ def test_unicode_in_filename(tmpdir) -> None:
         file = codebase.get_file("test/我很喜欢冰激淋/test-file 12'3_🍦.py")
         assert file is not None
         assert file.content == "print('Hello, world!')"
+
+
+def test_directory_tree_updated_incrementally(tmpdir, monkeypatch) -> None:
+    files = {".gitignore": "dist/\n", "mock_dir/b.py": "", "mock_dir/a-b.py": "", "mock_dir/a.py": "", "mock_dir/README.md": "", "mock_dir/subdir/empty.py": "", "other/c.py": ""}
+    with get_codebase_session(tmpdir=tmpdir, files=files, programming_language=ProgrammingLanguage.PYTHON) as codebase:
+
+        def tree() -> dict[str, list[str]]:
+            return {directory.dirpath: directory.item_names for directory in codebase.directories}
+
+        monkeypatch.setattr(codebase.op, "iter_files", lambda *args, **kwargs: pytest.fail("The directory tree should not be rebuilt"))
+        mock_dir = codebase.get_directory("mock_dir")
+        assert [file.filepath for file in mock_dir.files] == ["mock_dir/a.py", "mock_dir/a-b.py", "mock_dir/b.py"]
+        assert [file.name for file in mock_dir.files(extensions="*", recursive=True)] == ["README", "a", "a-b", "b", "empty"]
+
+        codebase.create_file("mock_dir/subdir/nested/new.py", "")
+        codebase.create_file("mock_dir/NOTES.txt", "")
+        codebase.create_file("dist/build.py", "")
+        codebase.get_file("other/c.py").update_filepath("mock_dir/c.py")
+        codebase.get_file("mock_dir/subdir/empty.py").remove()
+        codebase.commit()
+        assert codebase.get_directory("mock_dir") is mock_dir
+        assert codebase.get_directory("other", optional=True) is None
+        assert codebase.get_directory("dist", optional=True) is None
+        assert [file.filepath for file in mock_dir.files] == ["mock_dir/a.py", "mock_dir/a-b.py", "mock_dir/b.py", "mock_dir/c.py"]
+        assert mock_dir.get_file("notes.TXT", ignore_case=True).filepath == "mock_dir/NOTES.txt"
+        assert codebase.get_directory("MOCK_DIR/Subdir/NESTED", ignore_case=True).dirpath == "mock_dir/subdir/nested"
+        assert codebase.get_file("MOCK_DIR/SUBDIR/NESTED/NEW.PY", ignore_case=True).filepath == "mock_dir/subdir/nested/new.py"
+
+        updated_tree = tree()
+        monkeypatch.undo()
+        codebase.ctx.build_directory_tree()
+        assert updated_tree == tree()
@@ -0,0 +1,42 @@
+from rustworkx import PyDiGraph
+
+from graph_sitter.topological_sort import condense, pseudo_topological_sort
+
+
+def make_graph(num_nodes: int, edges: list[tuple[int, int]]) -> PyDiGraph:
+    graph = PyDiGraph()
+    graph.add_nodes_from(range(num_nodes))
+    graph.add_edges_from_no_data(edges)
+    return graph
+
+
+def test_pseudo_topological_sort_acyclic() -> None:
+    graph = make_graph(4, [(3, 1), (1, 0), (3, 2)])
+    order = pseudo_topological_sort(graph)
+    for u, v in graph.edge_list():
+        assert order.index(u) < order.index(v)
+    assert pseudo_topological_sort(graph, stable=True) == [3, 1, 0, 2]
+    assert pseudo_topological_sort(graph, flatten=False, stable=True) == [[3], [1], [0], [2]]
+
+
+def test_pseudo_topological_sort_cycles() -> None:
+    # 0 -> (1 <-> 2 <-> 3) -> 4 <-> 5, 6 is disconnected
+    graph = make_graph(7, [(0, 1), (1, 2), (2, 3), (3, 1), (2, 4), (4, 5), (5, 4)])
+    condensation = condense(graph)
+    assert sorted(condensation.components) == [[0], [1, 2, 3], [4, 5], [6]]
+    assert condensation.membership[1] == condensation.membership[3] != condensation.membership[4]
+    assert condensation.dag.num_edges() == 2
+
+    components = pseudo_topological_sort(graph, flatten=False, stable=True)
+    assert components == [[0], [1, 2, 3], [4, 5], [6]]
+    order = pseudo_topological_sort(graph)
+    assert sorted(order) == list(range(7))
+    assert order.index(0) < order.index(2) < order.index(5)
+    assert pseudo_topological_sort(graph, stable=True) == [0, 1, 2, 3, 4, 5, 6]
+
+
+def test_pseudo_topological_sort_large_cycle() -> None:
+    num_nodes = 20_000
+    edges = [(i, (i + 1) % num_nodes) for i in range(num_nodes)] + [(i, i // 2) for i in range(1, num_nodes)]
+    graph = make_graph(num_nodes + 1, [*edges, (num_nodes, 0)])
+    assert pseudo_topological_sort(graph, flatten=False) == [[num_nodes], list(range(num_nodes))]
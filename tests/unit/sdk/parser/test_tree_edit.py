@@ -0,0 +1,67 @@
+import pytest
+
+from graph_sitter.tree_sitter_parser import TreeEdit, copy_tree, is_parsed_from, parse_tree
+
+# language=python
+OLD_CONTENT = """
+def foo(a: int) -> int:
+    return a + 1
+
+
+def bar():
+    # ünïcödé
+    return foo(1)
+"""
+
+
+NEW_CONTENTS = [
+    OLD_CONTENT.replace("a + 1", "a + 2"),
+    OLD_CONTENT.replace("def bar", "class Baz:\n    pass\n\n\ndef bar"),
+    OLD_CONTENT.replace("    # ünïcödé\n", ""),
+    OLD_CONTENT.replace("ünïcödé", "ascii"),
+    OLD_CONTENT + "x = 1\n",
+    "x = 1\n" + OLD_CONTENT,
+    "\t\n" + OLD_CONTENT,
+    OLD_CONTENT,
+    "",
+]
+
+
+@pytest.mark.parametrize("new_content", NEW_CONTENTS)
+def test_tree_edit_from_diff(new_content: str) -> None:
+    old_bytes = bytes(OLD_CONTENT, "utf-8")
+    new_bytes = bytes(new_content, "utf-8")
+    old_tree = parse_tree("file.py", old_bytes)
+    edit = TreeEdit.from_diff(old_bytes, new_bytes)
+    assert old_bytes[: edit.start_byte] + new_bytes[edit.start_byte : edit.new_end_byte] + old_bytes[edit.old_end_byte :] == new_bytes
+    old_tree.edit(*edit)
+    tree = parse_tree("file.py", new_bytes, old_tree=old_tree)
+    expected = parse_tree("file.py", new_bytes)
+    assert str(tree.root_node) == str(expected.root_node)
+    assert tree.root_node.end_point == expected.root_node.end_point
+
+
+@pytest.mark.parametrize("new_content", NEW_CONTENTS)
+def test_tree_edit_from_tree(new_content: str) -> None:
+    # The old content starts with a newline, which the tree does not keep
+    old_tree = parse_tree("file.py", bytes(OLD_CONTENT, "utf-8"))
+    new_bytes = bytes(new_content, "utf-8")
+    tree = copy_tree("file.py", old_tree)
+    tree.edit(*TreeEdit.from_tree(old_tree, new_bytes))
+    tree = parse_tree("file.py", new_bytes, old_tree=tree)
+    expected = parse_tree("file.py", new_bytes)
+    assert str(tree.root_node) == str(expected.root_node)
+    assert (tree.root_node.start_point, tree.root_node.end_point) == (expected.root_node.start_point, expected.root_node.end_point)
+    assert is_parsed_from(tree, new_bytes)
+    assert is_parsed_from(old_tree, new_bytes) == (new_content == OLD_CONTENT)
+
+
+def test_tree_edit_from_replacement() -> None:
+    content = bytes(OLD_CONTENT, "utf-8")
+    comment = bytes("ünïcödé", "utf-8")
+    start = content.index(comment)
+    edit = TreeEdit.from_replacement(content, start, start + len(comment), b"one\n    # two")
+    assert edit.start_point == (6, 6)
+    assert edit.old_end_point == (6, 6 + len(comment))
+    assert edit.new_end_point == (7, 9)
+    assert edit.new_end_byte == start + len(b"one\n    # two")
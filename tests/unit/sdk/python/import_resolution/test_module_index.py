@@ -0,0 +1,70 @@
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+
+
+def test_module_index_follows_added_and_removed_files(tmpdir) -> None:
+    # language=python
+    content = """
+from pkg.sub import mod
+from pkg.sub.mod import func
+import os
+"""
+    files = {"consumer.py": content, "pkg/sub/mod.py": "def func():\n    pass\n", "pkg/README.md": "# pkg"}
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        module_index = codebase.ctx.py_module_index
+        # pkg and pkg/sub are namespace packages
+        assert module_index.exists("pkg")
+        assert module_index.exists("pkg/sub")
+        assert module_index.exists("pkg/sub/mod")
+        assert not module_index.exists("os")
+        assert module_index.get_module("pkg/sub/mod").filepath == "pkg/sub/mod.py"
+        assert module_index.get_package("pkg/sub") is None
+
+        consumer = codebase.get_file("consumer.py")
+        mod_import, func_import, os_import = consumer.imports
+        assert mod_import.resolve_import().from_file.filepath == "pkg/sub/mod.py"
+        assert func_import.resolve_import().symbol == codebase.get_function("func")
+        assert os_import.resolve_import() is None
+
+        codebase.create_file("pkg/sub/__init__.py", "from .mod import *\n")
+        codebase.create_file("os.py", "")
+        codebase.commit()
+        assert module_index.get_package("pkg/sub").filepath == "pkg/sub/__init__.py"
+        assert os_import.resolve_import().from_file.filepath == "os.py"
+
+        codebase.get_file("pkg/sub/mod.py").remove()
+        codebase.commit()
+        assert not module_index.exists("pkg/sub/mod")
+        assert module_index.exists("pkg/sub")
+        assert codebase.get_file("consumer.py").imports[0].resolve_import().from_file.filepath == "pkg/sub/__init__.py"
+
+
+def test_wildcard_import_cycle(tmpdir) -> None:
+    files = {
+        "a.py": "from b import *\n\nA = 1\n",
+        "b.py": "from a import *\n\nB = 2\n",
+        "consumer.py": "from a import B, C\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        a = codebase.get_file("a.py")
+        assert a.get_node_from_wildcard_chain("B") == codebase.get_file("b.py").get_global_var("B")
+        assert a.get_node_from_wildcard_chain("C") is None
+        b_import, c_import = codebase.get_file("consumer.py").imports
+        assert b_import.resolve_import().imports_file
+        assert c_import.resolve_import().symbol is None
+
+
+def test_wildcard_import_cycle_does_not_depend_on_query_order(tmpdir) -> None:
+    files = {
+        "a.py": "from c import *\nfrom b import *\n",
+        "b.py": "from a import *\n",
+        "c.py": "foo = 1\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        foo = codebase.get_file("c.py").get_global_var("foo")
+        a, b = codebase.get_file("a.py"), codebase.get_file("b.py")
+        for order in ((a, b), (b, a)):
+            codebase.ctx.py_module_index._wildcard_chains.clear()
+            for file in order:
+                assert file.get_node_from_wildcard_chain("foo") == foo
+            assert a.get_node_from_wildcard_chain("missing") is None
+            assert b.get_node_from_wildcard_chain("missing") is None
@@ -1,7 +1,9 @@
 from typing import TYPE_CHECKING
 
+from graph_sitter.codebase.diff_lite import ChangeType, DiffLite
 from graph_sitter.codebase.factory.get_session import get_codebase_session
 from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+from graph_sitter.typescript.ts_config import ImportAliasTrie
 
 if TYPE_CHECKING:
     from graph_sitter.typescript.file import TSFile
@@ -69,3 +71,55 @@ def test_file_get_config(tmpdir) -> None:
         assert parent_file.get_config().config_file.name == codebase.get_file(root_config_name).name
         assert child_file.get_config().config_file.name == codebase.get_file(config_name).name
         assert sibling_file.get_config().config_file.name == codebase.get_file(root_config_name).name
+
+
+def test_file_get_config_incremental(tmpdir) -> None:
+    files = {
+        "tsconfig.json": '{"extends": "./tsconfig.base.json"}',
+        "tsconfig.base.json": '{"compilerOptions": {"baseUrl": ".", "paths": {"@lib/*": ["./lib/*"]}}}',
+        "lib/util.ts": "export const util = 1;",
+        "packages/app/src/main.ts": "import { util } from '@lib/util';",
+        "packages/other/tsconfig.json": "{}",
+        "packages/other/other.ts": "export const other = 1;",
+    }
+    with get_codebase_session(tmpdir=tmpdir, programming_language=ProgrammingLanguage.TYPESCRIPT, files=files) as codebase:
+        main: TSFile = codebase.get_file("packages/app/src/main.ts")
+        other: TSFile = codebase.get_file("packages/other/other.ts")
+        other_config = other.get_config()
+        assert main.get_config().config_file.filepath == "tsconfig.json"
+        assert main.get_config().translate_import_path("@lib/util") == "lib/util"
+        assert other_config.config_file.filepath == "packages/other/tsconfig.json"
+
+        # Changing a base config parses the configs extending it again
+        (codebase.repo_path / "tsconfig.base.json").write_text('{"compilerOptions": {"baseUrl": ".", "paths": {"@shared/*": ["./lib/*"]}}}')
+        codebase.ctx.apply_diffs([DiffLite(ChangeType.Modified, codebase.repo_path / "tsconfig.base.json")])
+        assert main.get_config().translate_import_path("@shared/util") == "lib/util"
+        assert "@lib/*" not in main.get_config().paths
+        assert other.get_config() is other_config
+
+        # New config files apply to the files under them
+        codebase.create_file("packages/app/tsconfig.json", '{"compilerOptions": {"paths": {"@app/*": ["./src/*"]}}}')
+        assert main.get_config().config_file.filepath == "packages/app/tsconfig.json"
+        assert main.get_config().translate_import_path("@app/main") == "packages/app/src/main"
+        assert other.get_config() is other_config
+
+        # Removed config files no longer do
+        codebase.get_file("packages/other/tsconfig.json").remove()
+        codebase.create_file("packages/other/new.ts", "export const other = 2;")
+        codebase.commit()
+        assert other.get_config().config_file.filepath == "tsconfig.json"
+        assert codebase.get_file("packages/other/new.ts").get_config().config_file.filepath == "tsconfig.json"
+
+
+def test_import_alias_trie() -> None:
+    trie = ImportAliasTrie(["@app", "@app/utils/", "~", "/abs", "lib/a"])
+    assert trie.find("@app") == "@app"
+    assert trie.find("@app/components/button") == "@app"
+    assert trie.find("@app/utils") == "@app/utils/"
+    assert trie.find("@app/utils/strings") == "@app/utils/"
+    assert trie.find("@application") is None
+    assert trie.find("~/x") == "~"
+    assert trie.find("/abs/x") == "/abs"
+    assert trie.find("lib/b") is None
+    assert trie.find("") is None
+    assert trie.find("/") is None
@@ -0,0 +1,54 @@
+from graph_sitter.codebase.factory.get_session import get_codebase_session
+from graph_sitter.shared.enums.programming_language import ProgrammingLanguage
+
+
+def test_module_index_precedence(tmpdir) -> None:
+    files = {
+        "a/b.ts": "export const b = 1;",
+        "a/b.d.ts": "export declare const b: number;",
+        "a/c.d.ts": "export declare const c: number;",
+        "a/c.js": "export const c = 1;",
+        "a/dir.ts": "export const dir = 1;",
+        "a/dir/index.tsx": "export const dir = 2;",
+        "a/dir/index.js": "export const dir = 3;",
+        "a/file.test.ts": "export const test = 1;",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files, programming_language=ProgrammingLanguage.TYPESCRIPT) as codebase:
+        module_index = codebase.ctx.config_parser.module_index
+
+        def resolve(module_path: str) -> str | None:
+            file = module_index.resolve(module_path)
+            return file and file.filepath
+
+        assert resolve("a/b") == "a/b.ts"
+        assert resolve("a/b.d") == "a/b.d.ts"
+        assert resolve("a/b.js") == "a/b.ts"
+        assert resolve("a/c") == "a/c.d.ts"
+        assert resolve("a/c.js") == "a/c.js"
+        # Directories take precedence over files with the same name
+        assert resolve("a/dir") == "a/dir/index.js"
+        assert resolve("a/file.test") == "a/file.test.ts"
+        assert resolve(str(codebase.repo_path / "a/b")) == "a/b.ts"
+        assert resolve("a/missing") is None
+        assert resolve("../outside/b") is None
+
+
+def test_module_index_follows_added_and_removed_files(tmpdir) -> None:
+    # language=typescript
+    content = """
+import { foo } from './foo';
+
+export const bar = foo;
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"bar.ts": content, "foo.d.ts": "export declare const foo: number;"}, programming_language=ProgrammingLanguage.TYPESCRIPT) as codebase:
+        imp = codebase.get_file("bar.ts").get_import("foo")
+        assert imp.resolve_import().from_file.filepath == "foo.d.ts"
+
+        codebase.create_file("foo.ts", "export const foo = 1;")
+        codebase.commit()
+        assert imp.resolve_import().from_file.filepath == "foo.ts"
+
+        codebase.get_file("foo.ts").remove()
+        codebase.get_file("foo.d.ts").remove()
+        codebase.commit()
+        assert codebase.get_file("bar.ts").get_import("foo").resolve_import() is None